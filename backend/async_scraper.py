@@ -0,0 +1,608 @@
+"""
+Baltimore Restaurant Health Inspection Scraper - ASYNC BACKEND
+==============================================================
+Same run() semantics as BaltimoreZipScraper, built on playwright.async_api.
+Many portal requests stay in flight on one event loop; concurrency is bounded
+by a fixed pool of pages, so no OS thread is needed per page.
+
+RUN:
+python3 async_scraper.py --test
+python3 async_scraper.py --concurrency 8                # asks for the mode and confirmation first
+python3 async_scraper.py --zip-sweep --concurrency 8   # every establishment in every Baltimore ZIP
+python3 async_scraper.py --concurrency 8 --rate 4      # at most 4 portal requests per second
+                                                       # (default: 2 per page; --rate 0 = no cap)
+python3 async_scraper.py --retry-budget 50             # retry up to 50 transient failures this session
+python3 async_scraper.py --concurrency 8 --metrics-port 9108   # live Prometheus metrics on localhost
+                                                              # (--metrics-host 0.0.0.0 for every interface)
+
+--history, --two-phase, --direct-pdf and --resume are only supported by scraper.py.
+"""
+
+import asyncio
+import os
+import re
+import sys
+import time
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+import metrics
+from scraper import (
+    BALTIMORE_ZIP_CODES,
+    BASE_URL,
+    DEFAULT_PARSE_WORKERS,
+    DEFAULT_PDF_BACKEND,
+    DEFAULT_RETRY_BUDGET,
+    INSPECTION_UNCHANGED,
+    PAGER_LINK_SELECTOR,
+    PORTAL_RATE_PER_WORKER,
+    BaltimoreZipScraper,
+    PortalGovernor,
+    PortalWaiter,
+    classify_failure,
+    get_cli_option,
+    is_newer_inspection,
+    parse_inspection_pdf,
+    prompt_restaurants,
+)
+
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+SYNC_ONLY_FLAGS = ('--history', '--two-phase', '--direct-pdf', '--resume')  # rejected by the async CLI
+
+
+class AsyncPortalWaiter(PortalWaiter):
+    """PortalWaiter for async pages: same steps, timeouts, timing records and governor"""
+
+    @asynccontextmanager
+    async def _request(self, step):
+        async with self.governor.request_async():
+            started = time.monotonic()
+            try:
+                yield
+            except PlaywrightTimeoutError:
+                self._record(step, started, timed_out=True)
+                raise
+            self._record(step, started)
+
+    async def for_selector(self, page, step, selector, state='attached'):
+        started = time.monotonic()
+        try:
+            await page.wait_for_selector(selector, state=state, timeout=self.timeouts[step])
+        except PlaywrightTimeoutError:
+            self._record(step, started, timed_out=True)
+            return False
+        self._record(step, started)
+        return True
+
+    async def for_navigation(self, page, step, action):
+        try:
+            async with self._request(step):
+                async with page.expect_navigation(wait_until='domcontentloaded', timeout=self.timeouts[step]):
+                    await action()
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    async def for_goto(self, page, step, url):
+        try:
+            async with self._request(step):
+                await page.goto(url, wait_until='domcontentloaded', timeout=self.timeouts[step])
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+    async def for_download(self, page, action):
+        async with self._request('download'):
+            async with page.expect_download(timeout=self.timeouts['download']) as download_info:
+                await action()
+            return await download_info.value
+
+    async def go_back(self, page):
+        try:
+            async with self._request('back'):
+                await page.go_back(wait_until='domcontentloaded', timeout=self.timeouts['back'])
+        except PlaywrightTimeoutError:
+            return False
+        return True
+
+
+class AsyncBaltimoreZipScraper(BaltimoreZipScraper):
+    """
+    Async variant of BaltimoreZipScraper.
+
+    Browser-facing methods take the page they should drive, because several
+    restaurants are scraped at once; they are named <sync method>_on(page, ...)
+    so they never shadow the sync methods they mirror. Parsing, rating, storage
+    and analytics are inherited unchanged from the sync scraper.
+
+    History mode, two-phase crawls, direct PDF fetches and --resume are sync-only.
+    """
+
+    def __init__(self, output_file=None, concurrency=DEFAULT_CONCURRENCY, refresh=False,
+                 parse_workers=DEFAULT_PARSE_WORKERS, pdf_backend=DEFAULT_PDF_BACKEND,
+                 analytics_storage='json', store='json', portal_rate=None,
+                 retry_budget=DEFAULT_RETRY_BUDGET, base_url=BASE_URL, headless=False):
+        super().__init__(output_file=output_file, refresh=refresh, parse_workers=parse_workers,
+                         pdf_backend=pdf_backend, analytics_storage=analytics_storage, store=store,
+                         retry_budget=retry_budget, base_url=base_url, headless=headless)
+        self.concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY))
+        self.context = None
+        self.idle_pages = None
+        if portal_rate is None:
+            portal_rate = PORTAL_RATE_PER_WORKER * self.concurrency
+        self.waiter = AsyncPortalWaiter(self.session_tracker,
+                                        governor=PortalGovernor(portal_rate, max_concurrency=self.concurrency))
+
+    async def start(self):
+        print("Starting browser...")
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            downloads_path=str(self.download_dir)
+        )
+        self.context = await self.browser.new_context(accept_downloads=True)
+        self.context.set_default_timeout(30000)
+
+        # A page is checked out per restaurant, which bounds concurrency
+        self.idle_pages = asyncio.Queue()
+        for _ in range(self.concurrency):
+            self.idle_pages.put_nowait(await self.context.new_page())
+        print(f"✓ Browser ready! ({self.concurrency} pages)\n")
+
+    async def close(self):
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+
+    def run(self, restaurants=None, zip_codes=None, mode='1'):
+        """
+        Run scraper by restaurant names OR zip codes.
+        Priority: restaurants > zip_codes
+        mode: '1' for full scraper, '2' for selective re-scraping
+        """
+        restaurants, zip_codes = self.begin_session(restaurants, zip_codes, mode)
+        self.retry_scheduler.open(restaurants)
+        try:
+            asyncio.run(self._run(restaurants, zip_codes))
+        except KeyboardInterrupt:
+            print("\n⏸️ Interrupted")
+            self.save_to_json()
+            # Still save session and analytics on interrupt
+            self.session_tracker.save_session_report()
+            self.analytics_tracker.save_analytics()
+        self.finish_session()
+
+    async def _run(self, restaurants, zip_codes):
+        try:
+            await self.start()
+            if restaurants:
+                print(f"📋 Searching {len(restaurants)} restaurants by name ({self.concurrency} in flight)...\n")
+                await asyncio.gather(*(self.scrape_restaurant(name) for name in restaurants))
+            elif zip_codes:
+                print(f"📍 Searching {len(zip_codes)} ZIP codes ({self.concurrency} in flight)...\n")
+                await asyncio.gather(*(self.scrape_zipcode(zipcode) for zipcode in zip_codes))
+
+            await self.run_retries()
+            self.save_results()
+        except Exception as e:
+            print(f"\n❌ Fatal error: {e}")
+            self.finish_parsing()
+            # Save session and analytics even on error
+            self.session_tracker.save_session_report()
+            self.analytics_tracker.save_analytics()
+        finally:
+            # Also on cancellation (Ctrl+C): don't drop queued parses or leak pool processes
+            self.finish_parsing()
+            await self.close()
+
+    async def scrape_restaurant(self, restaurant_name):
+        """Scrape a single restaurant by name on the next idle page"""
+        stored = self.get_restaurant_from_db(restaurant_name)
+        if stored and not self.refresh:
+            print(f"🍽️  Restaurant: {restaurant_name}")
+            print("  ⏭️  Already in database, skipping...\n")
+            self.session_tracker.add_result(restaurant_name, "already_exists", {"reason": "Already in database with data"})
+            # Still record the search attempt
+            self.analytics_tracker.record_search(restaurant_name)
+            return
+
+        known_inspection = stored.get('last_inspection') if stored else None
+        await self.search_on_idle_page(restaurant_name, known_inspection)
+
+    async def retry_restaurant(self, restaurant_name):
+        """Retry-scheduler task: search a restaurant again without counting another search"""
+        stored = self.get_restaurant_from_db(restaurant_name)
+        if stored and not self.refresh:
+            return  # Another result row got it after all
+        known_inspection = stored.get('last_inspection') if stored else None
+        await self.search_on_idle_page(restaurant_name, known_inspection, count_search=False)
+
+    async def search_on_idle_page(self, restaurant_name, known_inspection=None, count_search=True):
+        page = await self.idle_pages.get()
+        try:
+            with self.session_tracker.span('restaurant', restaurant_name):
+                await self.search_by_restaurant_name_on(page, restaurant_name, known_inspection, count_search)
+        finally:
+            self.idle_pages.put_nowait(page)
+
+    async def run_retries(self):
+        """Re-run the restaurants the retry scheduler queued, as they come due, until none are left"""
+        while True:
+            # next_round sleeps until the first retry is due; keep that off the event loop
+            restaurant_names = await asyncio.to_thread(self.retry_scheduler.next_round)
+            if not restaurant_names:
+                break
+            print(f"\n🔁 Retrying {len(restaurant_names)} restaurants after transient failures...\n")
+            await asyncio.gather(*(self.retry_restaurant(name) for name in restaurant_names))
+        for restaurant_name, failure_class, reason in self.retry_scheduler.close():
+            self._record_failure(restaurant_name, reason, failure_class)
+
+    async def scrape_zipcode(self, zipcode):
+        """Sweep a ZIP code's result pages on the next idle page"""
+        page = await self.idle_pages.get()
+        try:
+            await self.search_by_zipcode_on(page, zipcode)
+        finally:
+            self.idle_pages.put_nowait(page)
+
+    async def search_by_restaurant_name_on(self, page, restaurant_name, known_inspection=None, count_search=True):
+        print(f"🍽️  Searching restaurant: {restaurant_name}")
+
+        # Record search attempt in analytics (using display name); retries don't count again
+        if count_search:
+            self.analytics_tracker.record_search(restaurant_name)
+
+        # Get the portal name for searching
+        portal_name = self.get_portal_name(restaurant_name)
+
+        if portal_name != restaurant_name:
+            print(f"  🔄 Using portal alias: '{portal_name}'")
+
+        try:
+            if not await self.waiter.for_goto(page, 'portal_load', self.base_url):
+                raise self.waiter.timeout_error('portal_load')
+            if not await self.waiter.for_selector(page, 'search_form', 'input[type="text"]'):
+                raise self.waiter.timeout_error('search_form')
+
+            name_input = await page.query_selector('input[name="ctl00$FeaturedContent$txtEstablishment"]')
+            if not name_input:
+                name_input = await page.query_selector('input[type="text"][name*="Establishment"]')
+            if not name_input:
+                name_input = await page.query_selector('input[type="text"][name*="name"]')
+            if not name_input:
+                print("  ❌ Cannot find restaurant name input")
+                self._record_failure(restaurant_name, "Cannot find restaurant name input field", 'missing_input')
+                return
+
+            # Use portal name for the search
+            await name_input.fill(portal_name)
+            search_button = await page.query_selector('input[name="ctl00$FeaturedContent$Button1"]')
+
+            print(f"  ⏳ Waiting for results ({restaurant_name})...")
+            submit = search_button.click if search_button else lambda: name_input.press('Enter')
+            if not await self.waiter.for_navigation(page, 'results', submit):
+                raise self.waiter.timeout_error('results')
+            # Parse using the DISPLAY name (this is what goes in JSON)
+            await self.parse_restaurant_list_by_name_on(page, restaurant_name, known_inspection)
+        except Exception as e:
+            print(f"  ❌ ERROR ({restaurant_name}): {e}")
+            self._record_failure(restaurant_name, str(e), classify_failure(e))
+
+    async def search_by_zipcode_on(self, page, zipcode):
+        """ZIP sweep: walk every establishment listed for a ZIP code, page by page"""
+        print(f"📍 Searching zip code: {zipcode}")
+        try:
+            if not await self.open_zipcode_results_on(page, zipcode):
+                return
+            page_number = 1
+            listings = []
+            while True:
+                # Read the pager before walking the rows, which navigates away and back
+                more_pages = await self.has_results_page_on(page, page_number + 1)
+                listings += await self.parse_restaurant_list_on(page, zipcode, page_number)
+                if not more_pages:
+                    self.journal.append("zipcode", zipcode=zipcode, listings=listings)
+                    break
+                page_number += 1
+                # Usually still on the results page; otherwise search again and page forward
+                if not (await self.go_to_results_page_on(page, page_number)
+                        or await self.open_zipcode_results_on(page, zipcode, page_number)):
+                    break
+            print(f"  ✓ Walked {len(listings)} listings on {page_number} page(s) in {zipcode}\n")
+        except Exception as e:
+            print(f"  ❌ ERROR ({zipcode}): {e}")
+
+    async def submit_zipcode_search_on(self, page, zipcode):
+        if not await self.waiter.for_goto(page, 'portal_load', self.base_url):
+            raise self.waiter.timeout_error('portal_load')
+        if not await self.waiter.for_selector(page, 'search_form', 'input[type="text"]'):
+            raise self.waiter.timeout_error('search_form')
+
+        zip_input = await page.query_selector('input[name="ctl00$FeaturedContent$txtcode"]')
+        if not zip_input:
+            zip_input = await page.query_selector('input[type="text"][name*="zip"]')
+        if not zip_input:
+            print("  ❌ Cannot find zip code input")
+            return False
+
+        await zip_input.fill(zipcode)
+        search_button = await page.query_selector('input[name="ctl00$FeaturedContent$Button1"]')
+
+        print(f"  ⏳ Waiting for results ({zipcode})...")
+        submit = search_button.click if search_button else lambda: zip_input.press('Enter')
+        if not await self.waiter.for_navigation(page, 'results', submit):
+            raise self.waiter.timeout_error('results')
+        return True
+
+    async def open_zipcode_results_on(self, page, zipcode, page_number=1):
+        if not await self.submit_zipcode_search_on(page, zipcode):
+            return False
+        return page_number == 1 or await self.go_to_results_page_on(page, page_number)
+
+    async def pager_links_on(self, page):
+        return [((await link.inner_text()).strip(), link)
+                for link in await page.query_selector_all(PAGER_LINK_SELECTOR)]
+
+    async def has_results_page_on(self, page, page_number):
+        links = await self.pager_links_on(page)
+        numbers = [int(text) for text, _ in links if text.isdigit()]
+        return str(page_number) in (text for text, _ in links) or bool(
+            any(text == '...' for text, _ in links) and numbers and page_number > max(numbers)
+        )
+
+    async def go_to_results_page_on(self, page, page_number):
+        for _ in range(page_number):
+            links = await self.pager_links_on(page)
+            target = next((link for text, link in links if text == str(page_number)), None)
+            if target:
+                return await self.waiter.for_navigation(page, 'results', target.click)
+            # Pagers show a window of page numbers; the last '...' opens the next window
+            numbers = [int(text) for text, _ in links if text.isdigit()]
+            more = [link for text, link in links if text == '...']
+            if not more or not numbers or page_number < max(numbers):
+                return False
+            if not await self.waiter.for_navigation(page, 'results', more[-1].click):
+                return False
+        return False
+
+    async def result_rows_on(self, page):
+        rows = []
+        for row in await page.query_selector_all('table tr'):
+            cells = await row.query_selector_all('td')
+            if len(cells) < 2 or await row.query_selector(PAGER_LINK_SELECTOR) or not await row.query_selector('a'):
+                continue
+            rows.append((row, cells))
+        return rows
+
+    async def parse_restaurant_list_by_name_on(self, page, restaurant_name, known_inspection=None):
+        try:
+            rows = await page.query_selector_all('table tr')
+            if len(rows) <= 1:
+                print(f"  ℹ️ No restaurant found ({restaurant_name})")
+                self._record_failure(restaurant_name, "No restaurant found in portal", 'empty_results')
+                return
+
+            # For name search, usually get exact match, so process first result
+            for i, row in enumerate(rows[1:]):
+                try:
+                    cells = await row.query_selector_all('td')
+                    if len(cells) < 2:
+                        continue
+                    name = (await cells[0].inner_text()).strip()
+                    address = (await cells[1].inner_text()).strip() if len(cells) > 1 else ''
+
+                    # Try to extract zipcode from address field
+                    zipcode_match = re.search(r'\b(\d{5})\b', address)
+                    zipcode = zipcode_match.group(1) if zipcode_match else None
+
+                    # If not in address, check if there's a separate zipcode column
+                    if not zipcode and len(cells) > 2:
+                        for cell in cells[2:]:
+                            cell_text = (await cell.inner_text()).strip()
+                            zipcode_match = re.search(r'\b(\d{5})\b', cell_text)
+                            if zipcode_match:
+                                zipcode = zipcode_match.group(1)
+                                break
+
+                    inspection_link = await cells[-1].query_selector('a') if len(cells) > 2 else None
+                    if not inspection_link:
+                        inspection_link = await row.query_selector('a')
+
+                    if inspection_link:
+                        print(f"    ✓ Found: {name}")
+                        if not await self.waiter.for_navigation(page, 'inspection_page', inspection_link.click):
+                            raise self.waiter.timeout_error('inspection_page')
+                        inspection_data = await self.get_latest_inspection_on(page, name, known_inspection)
+                        if inspection_data == INSPECTION_UNCHANGED:
+                            self.record_unchanged(restaurant_name, known_inspection)
+                            await self.waiter.go_back(page)
+                            break
+
+                        # Try to get ZIP code from inspection data (PDF/detail page)
+                        if not zipcode and inspection_data:
+                            zipcode = inspection_data.get('zipcode')
+
+                        # Last resort: try current page text
+                        if not zipcode:
+                            page_text = await page.inner_text('body')
+                            zipcode_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', page_text)
+                            if zipcode_match:
+                                zipcode = zipcode_match.group(1)
+
+                        self.record_inspection(restaurant_name, name, address, zipcode, inspection_data)
+
+                        await self.waiter.go_back(page)
+                        break  # Only process first match for name search
+                except Exception as e:
+                    print(f"    ⚠️ Error on row {i}: {e}")
+                    self._record_failure(restaurant_name, f"Row processing error: {str(e)}", classify_failure(e))
+                    continue
+        except Exception as e:
+            print(f"  ❌ ERROR parsing list: {e}")
+            self._record_failure(restaurant_name, f"Parse list error: {str(e)}", classify_failure(e))
+
+    async def parse_restaurant_list_on(self, page, zipcode, page_number=1):
+        try:
+            listings = [((await cells[0].inner_text()).strip(), (await cells[1].inner_text()).strip())
+                        for row, cells in await self.result_rows_on(page)]
+            if not listings:
+                print(f"  ℹ️ No restaurants found in {zipcode}")
+                return []
+
+            for i, (name, address) in enumerate(listings):
+                if not self.claim_listing(name, address):
+                    print(f"    ⏭️  {name} (already listed under another ZIP or stored before resuming)")
+                    continue
+                try:
+                    # Detail pages don't always navigate back cleanly; reload the results if needed
+                    rows = await self.result_rows_on(page)
+                    if len(rows) != len(listings) or (await rows[0][1][0].inner_text()).strip() != listings[0][0]:
+                        if not await self.open_zipcode_results_on(page, zipcode, page_number):
+                            print(f"  ⚠️ Could not return to the results page ({zipcode})")
+                            break
+                        rows = await self.result_rows_on(page)
+
+                    row, cells = rows[i]
+                    inspection_link = await cells[-1].query_selector('a') if len(cells) > 2 else None
+                    if not inspection_link:
+                        inspection_link = await row.query_selector('a')
+                    print(f"    [{zipcode} {page_number}.{i + 1}] {name}")
+                    if not await self.waiter.for_navigation(page, 'inspection_page', inspection_link.click):
+                        raise self.waiter.timeout_error('inspection_page')
+                    # Returns to the results page itself once the inspection is read
+                    inspection_data = await self.get_latest_inspection_on(page, name)
+                    self.record_listing(name, address, zipcode, inspection_data)
+                except Exception as e:
+                    print(f"    ⚠️ Error on row {i}: {e}")
+                    continue
+            return listings
+        except Exception as e:
+            print(f"  ❌ ERROR parsing list: {e}")
+            return []
+
+    async def get_latest_inspection_on(self, page, establishment=None, known_inspection=None):
+        try:
+            # The establishment page has loaded; no date links there means no inspections
+            found = await self.waiter.for_selector(page, 'inspection_dates', 'table tr a')
+            date_links = await page.query_selector_all('table tr a') if found else []
+            if not date_links:
+                print("        ⚠️ No inspection dates found")
+                return None
+
+            inspection_date = (await date_links[0].inner_text()).strip()
+            if known_inspection and not is_newer_inspection(inspection_date, known_inspection):
+                await self.waiter.go_back(page)
+                return INSPECTION_UNCHANGED
+
+            # Unchanged inspection: reuse the cached PDF text instead of downloading
+            cached_text = self.pdf_cache.get_text(establishment, inspection_date)
+            if cached_text:
+                print(f"        ♻️  Using cached inspection PDF ({inspection_date})")
+                inspection_data = self.extract_from_text(cached_text)
+                await self.waiter.go_back(page)
+                return inspection_data
+
+            download = await self.waiter.for_download(page, date_links[0].click)
+            try:
+                pdf_path = await download.path()
+                # PDF parsing is CPU-bound; keep it off the event loop
+                loop = asyncio.get_running_loop()
+                if self.parse_pipeline:
+                    # Parse in the process pool so parsing uses every core
+                    metrics.PDF_BYTES.observe(os.path.getsize(pdf_path))
+                    text, inspection_data = await loop.run_in_executor(
+                        self.parse_pipeline.executor, parse_inspection_pdf,
+                        pdf_path, self.parse_pipeline.pdf_backend
+                    )
+                    self.pdf_cache.put(establishment, inspection_date, pdf_path, text)
+                    os.remove(pdf_path)  # Clean up
+                else:
+                    # to_thread copies the context, so the pdf_text/parse_violations spans stay on this restaurant
+                    inspection_data = await asyncio.to_thread(
+                        self.process_downloaded_pdf, pdf_path, establishment, inspection_date
+                    )
+            except Exception as e:
+                print(f"        ⚠️ PDF error: {e}")
+                inspection_data = await self.extract_inspection_data_on(page)
+            await self.waiter.go_back(page)
+            return inspection_data
+        except PlaywrightTimeoutError:
+            raise  # The caller records a 'timeout' failure (retried) rather than missing data
+        except Exception as e:
+            print(f"        ⚠️ Error: {e}")
+            return None
+
+    async def extract_inspection_data_on(self, page):
+        data = {
+            'star_rating': None,
+            'last_inspection': None,
+            'violations': [],
+            'zipcode': None
+        }
+        try:
+            page_text = await page.inner_text('body')
+            date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', page_text)
+            if date_match:
+                data['last_inspection'] = date_match.group(1)
+
+            zipcode_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', page_text)
+            if zipcode_match:
+                data['zipcode'] = zipcode_match.group(1)
+
+            data['violations'] = self.parse_violations(page_text)
+            data['star_rating'] = self.calculate_star_rating(data['violations'])
+        except Exception as e:
+            print(f"        ⚠️ Error: {e}")
+        return data
+
+
+if __name__ == "__main__":
+    if '--help' in sys.argv or '-h' in sys.argv:
+        print(__doc__)
+        sys.exit(0)
+    concurrency = int(get_cli_option('--concurrency', DEFAULT_CONCURRENCY))
+    refresh = '--refresh' in sys.argv
+    parse_workers = int(get_cli_option('--parse-workers', DEFAULT_PARSE_WORKERS))
+    pdf_backend = get_cli_option('--pdf-backend', DEFAULT_PDF_BACKEND)
+    store = 'sqlite' if '--sqlite' in sys.argv else 'json'
+    portal_rate = float(get_cli_option('--rate')) if get_cli_option('--rate') else None
+    retry_budget = int(get_cli_option('--retry-budget', DEFAULT_RETRY_BUDGET))
+    if get_cli_option('--metrics-port'):
+        metrics.serve_metrics(int(get_cli_option('--metrics-port')),
+                              host=get_cli_option('--metrics-host', metrics.DEFAULT_HOST))
+    if get_cli_option('--metrics-file'):
+        metrics.start_textfile_writer(get_cli_option('--metrics-file'))
+    analytics_storage = 'sqlite' if store == 'sqlite' else 'events' if '--analytics-events' in sys.argv else 'json'
+    unsupported = [flag for flag in SYNC_ONLY_FLAGS if flag in sys.argv]
+    if unsupported:
+        print(f"❌ {', '.join(unsupported)} not supported by the async backend; use scraper.py")
+        sys.exit(1)
+    if len(sys.argv) > 1 and sys.argv[1] == '--test':
+        print("🧪 Quick async test with a few restaurants...\n")
+        scraper = AsyncBaltimoreZipScraper(
+            output_file="../data/test_baltimore_restaurants.json",
+            concurrency=concurrency,
+            refresh=refresh,
+            parse_workers=parse_workers,
+            pdf_backend=pdf_backend,
+            analytics_storage=analytics_storage,
+            store=store,
+            portal_rate=portal_rate,
+            retry_budget=retry_budget
+        )
+        scraper.run(restaurants=["Faidley's Seafood", "The Food Market", "Ekiben",
+                                 "Golden West Cafe", "The Corner Pantry"])
+    else:
+        scraper = AsyncBaltimoreZipScraper(concurrency=concurrency, refresh=refresh,
+                                           parse_workers=parse_workers, pdf_backend=pdf_backend,
+                                           analytics_storage=analytics_storage, store=store,
+                                           portal_rate=portal_rate, retry_budget=retry_budget)
+        if '--zip-sweep' in sys.argv:
+            zip_codes = get_cli_option('--zip-sweep')
+            zip_codes = zip_codes.split(',') if zip_codes and not zip_codes.startswith('--') else BALTIMORE_ZIP_CODES
+            scraper.run(zip_codes=zip_codes)
+        else:
+            restaurants_to_scrape, mode = prompt_restaurants(scraper)
+            scraper.run(restaurants=restaurants_to_scrape, mode=mode)
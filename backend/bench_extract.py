@@ -0,0 +1,85 @@
+"""
+PDF Text Extraction Benchmark
+=============================
+Times each PDF text backend on a directory of inspection PDFs and checks
+that what the scraper pulls out of the text (date, ZIP, violations, star
+rating) matches the reference 'pypdf2' backend.
+
+By default it runs over the PDFs kept in the PDF cache.
+
+RUN:
+python3 bench_extract.py
+python3 bench_extract.py --pdfs ../logs/pdf_cache --repeat 5
+"""
+
+import os
+import sys
+import time
+
+from scraper import (
+    DEFAULT_PDF_BACKEND,
+    PDF_CACHE_DIR,
+    PDF_TEXT_BACKENDS,
+    InspectionParser,
+    get_cli_option,
+    get_pdf_backend,
+    percentile,
+)
+
+
+def find_pdfs(pdf_dir):
+    if not os.path.isdir(pdf_dir):
+        return []
+    return [os.path.join(pdf_dir, filename) for filename in sorted(os.listdir(pdf_dir))
+            if filename.lower().endswith('.pdf')]
+
+
+def time_backend(backend, pdf_paths, repeat):
+    """Best-of-repeat extraction time (seconds) for each PDF, plus the extracted texts"""
+    timings, texts = [], []
+    for pdf_path in pdf_paths:
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text = backend.extract_text(pdf_path)
+            best = min(best, time.perf_counter() - started)
+        timings.append(best)
+        texts.append(text)
+    return timings, texts
+
+
+def main():
+    pdf_dir = get_cli_option('--pdfs', PDF_CACHE_DIR)
+    repeat = int(get_cli_option('--repeat', 3))
+
+    pdf_paths = find_pdfs(pdf_dir)
+    if not pdf_paths:
+        print(f"⚠️ No PDFs found in {pdf_dir}")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"🧪 PDF extraction benchmark: {len(pdf_paths)} PDFs, best of {repeat}")
+    print("=" * 60)
+
+    parser = InspectionParser()
+    reference = None
+    for name in [DEFAULT_PDF_BACKEND] + [n for n in PDF_TEXT_BACKENDS if n != DEFAULT_PDF_BACKEND]:
+        timings, texts = time_backend(get_pdf_backend(name), pdf_paths, repeat)
+        extracted = [parser.extract_from_text(text) for text in texts]
+        if reference is None:
+            reference = extracted
+        mismatches = [pdf_paths[i] for i, data in enumerate(extracted) if data != reference[i]]
+
+        total = sum(timings)
+        print(f"  {name:>10}: mean {total / len(timings) * 1000:7.2f} ms  "
+              f"p50 {percentile(sorted(timings), 0.5) * 1000:7.2f} ms  "
+              f"max {max(timings) * 1000:7.2f} ms  "
+              f"{len(timings) / total:7.1f} PDFs/s  "
+              f"agreement {len(pdf_paths) - len(mismatches)}/{len(pdf_paths)}")
+        for path in mismatches[:5]:
+            print(f"      ✗ {os.path.basename(path)}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Violation Parser Benchmark
+==========================
+Measures parse_violations throughput on a corpus of inspection report texts.
+
+The corpus is rebuilt from the violations already stored in the restaurant
+JSON files, plus any extracted-text files found in the PDF cache (or a
+directory passed with --corpus).
+
+test_bench_parser.py runs the same corpus as a pytest-benchmark suite, and
+checks parse_violations against the original (pre-rewrite) parser's output,
+pinned in test_data/parse_violations_legacy.json.
+
+RUN:
+python3 bench_parser.py
+python3 bench_parser.py --corpus ../logs/pdf_cache --repeat 20
+python3 -m pytest test_bench_parser.py --benchmark-only
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import textwrap
+
+from scraper import (
+    OUTPUT_FILE_JSON,
+    PDF_CACHE_DIR,
+    InspectionParser,
+    get_cli_option,
+)
+
+SAMPLE_FILES = [
+    OUTPUT_FILE_JSON,
+    "../data/test_baltimore_restaurants.json",
+]
+
+
+def build_report_text(restaurant):
+    """Rebuild an inspection report's text from a stored restaurant record"""
+    lines = [
+        "BALTIMORE CITY HEALTH DEPARTMENT - FOOD SERVICE FACILITY INSPECTION REPORT",
+        restaurant.get('name', ''),
+        restaurant.get('address', ''),
+        f"Baltimore, MD {restaurant.get('zipcode', '')}",
+        f"Inspection Date: {restaurant.get('last_inspection') or '01/01/2025'}",
+        "OBSERVATIONS AND CORRECTIVE ACTIONS",
+        "Item",
+        "Number Violations cited in this report must be corrected within the specified time frame.Repeat",
+    ]
+    violations = restaurant.get('violations', [])
+    for violation in violations:
+        # Grouped violations are stored as "(1) ... (2) ..."; split them back apart
+        parts = re.split(r'\(\d+\)\s*', violation['description'])
+        for part in [p for p in parts if p.strip()]:
+            wrapped = textwrap.wrap(part, 90) or [part]
+            lines.append(f"{violation['code']} {wrapped[0]}")
+            lines.extend(wrapped[1:])
+            marker = 'X' if violation.get('corrected_on_site') else ' '
+            lines.append(f"Corrected On Site: [{marker}]")
+    if not violations:
+        lines.append("46 No violations observed at the time of this inspection.")
+    lines.append("Person-in-charge (Signature)")
+    lines.append("Inspector (Print)")
+    return "\n".join(lines)
+
+
+def load_corpus(corpus_dir):
+    texts = []
+    for path in SAMPLE_FILES:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                texts.extend(build_report_text(r) for r in json.load(f))
+    if corpus_dir and os.path.isdir(corpus_dir):
+        for filename in sorted(os.listdir(corpus_dir)):
+            if filename.endswith('.txt'):
+                with open(os.path.join(corpus_dir, filename), 'r', encoding='utf-8') as f:
+                    texts.append(f.read())
+    return texts
+
+
+def time_parser(parser, texts, repeat):
+    """Best-of-repeat wall time (seconds) to parse the whole corpus once"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            parser.parse_violations(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    corpus_dir = get_cli_option('--corpus', PDF_CACHE_DIR)
+    repeat = int(get_cli_option('--repeat', 10))
+
+    texts = load_corpus(corpus_dir)
+    if not texts:
+        print("⚠️ No inspection texts found")
+        sys.exit(1)
+    total_mb = sum(len(t.encode('utf-8')) for t in texts) / (1024 * 1024)
+
+    print("=" * 60)
+    print(f"🧪 Violation parser benchmark: {len(texts)} texts, {total_mb:.2f} MB, best of {repeat}")
+    print("=" * 60)
+
+    seconds = time_parser(InspectionParser(), texts, repeat)
+    print(f"  {seconds * 1000:8.2f} ms  {len(texts) / seconds:10.0f} texts/s  {total_mb / seconds:7.2f} MB/s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
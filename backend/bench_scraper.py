@@ -0,0 +1,126 @@
+"""
+End-to-End Scraper Benchmark
+============================
+Runs the scraper's run() against the offline replay portal (replay_portal.py)
+and reports restaurants per minute for each configuration:
+
+  sequential   BaltimoreZipScraper, one page
+  concurrent   BaltimoreZipScraper, --workers pages attached to one Chromium
+  async        AsyncBaltimoreZipScraper, --workers pages on one event loop
+
+Every configuration starts from an empty scratch directory (no stored
+restaurants, no PDF cache), so each one downloads and parses every report.
+Nothing is written to the real data, logs or analytics files.
+
+RUN:
+python3 bench_scraper.py
+python3 bench_scraper.py --workers 4 --latency 0.3 --jitter 0.1
+python3 bench_scraper.py --configs sequential,async --restaurants 10
+python3 bench_scraper.py --zip-sweep 21201,21202 --synthetic 200
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from scraper import RESTAURANT_NAME_MAP, BaltimoreZipScraper, get_cli_option
+from replay_portal import ReplayPortal, load_fixture
+
+CONFIGS = ('sequential', 'concurrent', 'async')
+BENCH_PORTAL_RATE = 0  # no rate cap: measure the scraper, not the politeness limit (override with --rate)
+
+
+def bench_restaurants(establishments, limit):
+    """Display names to search: mapped names the replay portal knows, then establishment names"""
+    names, covered = [], set()
+    for display_name, portal_name in RESTAURANT_NAME_MAP.items():
+        matches = [e['id'] for e in establishments if portal_name.lower() in e['name'].lower()]
+        if matches:
+            names.append(display_name)
+            covered.update(matches)
+    names += [e['name'] for e in establishments if e['id'] not in covered]
+    return names[:limit]
+
+
+def make_scraper(config, base_url, workers, portal_rate):
+    if config == 'async':
+        from async_scraper import AsyncBaltimoreZipScraper
+        return AsyncBaltimoreZipScraper(concurrency=workers, portal_rate=portal_rate,
+                                        base_url=base_url, headless=True)
+    return BaltimoreZipScraper(workers=1 if config == 'sequential' else workers, portal_rate=portal_rate,
+                               base_url=base_url, headless=True)
+
+
+def run_config(config, base_url, workers, portal_rate, restaurants=None, zip_codes=None):
+    """Run one configuration in a scratch directory; returns (restaurants scraped, seconds)"""
+    original_cwd = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix=f"bench_{config}_")
+    # The scraper's data paths are relative ("../data/...", "../logs/..."), so run one level down
+    workdir = os.path.join(scratch, "backend")
+    os.makedirs(workdir)
+    os.chdir(workdir)
+    try:
+        scraper = make_scraper(config, base_url, workers, portal_rate)
+        started = time.monotonic()
+        scraper.run(restaurants=restaurants, zip_codes=zip_codes)
+        return len(scraper.restaurants), time.monotonic() - started
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    workers = int(get_cli_option('--workers', 4))
+    configs = get_cli_option('--configs', ','.join(CONFIGS)).split(',')
+    limit = int(get_cli_option('--restaurants', 20))
+    latency = float(get_cli_option('--latency', 0.1))
+    jitter = float(get_cli_option('--jitter', 0))
+    synthetic = int(get_cli_option('--synthetic', 0))
+    portal_rate = float(get_cli_option('--rate', BENCH_PORTAL_RATE))
+
+    establishments = load_fixture(synthetic=synthetic)
+    if not establishments:
+        establishments = load_fixture(synthetic=max(limit, 20))
+
+    restaurants, zip_codes = None, None
+    if '--zip-sweep' in sys.argv:
+        zip_codes = get_cli_option('--zip-sweep')
+        if not zip_codes or zip_codes.startswith('--'):
+            zip_codes = sorted({e['zipcode'] for e in establishments})
+        else:
+            zip_codes = zip_codes.split(',')
+    else:
+        restaurants = bench_restaurants(establishments, limit)
+
+    portal = ReplayPortal(establishments, latency=latency, jitter=jitter)
+    base_url = portal.start()
+
+    target = f"{len(zip_codes)} ZIP codes" if zip_codes else f"{len(restaurants)} restaurants"
+    print("=" * 60)
+    print(f"🏁 Scraper benchmark: {target}, {len(establishments)} establishments replayed")
+    print(f"   portal latency {latency}s + up to {jitter}s, {workers} workers/pages")
+    print("=" * 60)
+
+    results = []
+    try:
+        for config in configs:
+            requests_before = portal.requests
+            scraped, seconds = run_config(config, base_url, workers, portal_rate, restaurants, zip_codes)
+            results.append((config, scraped, seconds, portal.requests - requests_before))
+    finally:
+        portal.stop()
+
+    print("\n" + "=" * 60)
+    print("🏁 RESULTS")
+    print("=" * 60)
+    for config, scraped, seconds, requests in results:
+        print(f"  {config:>10}: {scraped:4d} restaurants in {seconds:7.1f}s  "
+              f"{scraped / seconds * 60 if seconds else 0:7.1f} restaurants/min  "
+              f"({requests} portal requests)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
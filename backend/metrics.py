@@ -0,0 +1,209 @@
+"""
+Scraper Metrics
+===============
+Live counters and histograms for long scraper runs, in the Prometheus text
+exposition format (standard library only, no prometheus_client needed).
+
+The trackers in scraper.py feed these as they record results, portal waits,
+stage spans and analytics events. Expose them either over HTTP or as a file
+for node_exporter's textfile collector:
+
+python3 scraper.py --workers 4 --metrics-port 9108      # scrape http://localhost:9108/metrics
+python3 scraper.py --metrics-port 9108 --metrics-host 0.0.0.0   # also reachable from other hosts
+python3 scraper.py --workers 4 --metrics-file /var/lib/node_exporter/scraper.prom
+"""
+
+import atexit
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_HOST = "127.0.0.1"  # local only unless another address is asked for
+
+# Histogram buckets: seconds for latencies, bytes for PDF sizes
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+PDF_SIZE_BUCKETS = (16e3, 32e3, 64e3, 128e3, 256e3, 512e3, 1e6, 2e6, 4e6)
+
+TEXTFILE_INTERVAL = 5  # seconds between textfile refreshes
+
+
+def format_labels(label_names, label_values, extra=()):
+    pairs = list(zip(label_names, label_values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic count, one series per combination of label values"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [f"{self.name}{format_labels(self.label_names, key)} {format_value(value)}"
+                    for key, value in sorted(self.values.items())]
+
+
+class Histogram:
+    """Distribution of observed values over fixed cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            series = self.series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self):
+        lines = []
+        with self._lock:
+            for key, series in sorted(self.series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = format_labels(self.label_names, key, [("le", format_value(bound))])
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                lines.append(f"{self.name}_bucket{format_labels(self.label_names, key, [('le', '+Inf')])} "
+                             f"{series[-1]}")
+                lines.append(f"{self.name}_sum{format_labels(self.label_names, key)} {format_value(series[-2])}")
+                lines.append(f"{self.name}_count{format_labels(self.label_names, key)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """The set of metrics rendered together on /metrics or into the textfile"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help_text, label_names=()):
+        metric = Counter(name, help_text, label_names)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help_text, label_names, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+RESTAURANTS = REGISTRY.counter(
+    "scraper_restaurants_total", "Restaurants processed, by outcome", ("status",))
+ANALYTICS_EVENTS = REGISTRY.counter(
+    "scraper_analytics_events_total", "Analytics events recorded, by type", ("event",))
+RETRIES = REGISTRY.counter(
+    "scraper_retries_total", "Retries queued after transient failures, by failure class", ("failure_class",))
+PORTAL_TIMEOUTS = REGISTRY.counter(
+    "scraper_portal_timeouts_total", "Portal waits that hit their timeout, by step", ("step",))
+PORTAL_WAIT_SECONDS = REGISTRY.histogram(
+    "scraper_portal_wait_seconds", "Portal latency per wait step", ("step",))
+STAGE_SECONDS = REGISTRY.histogram(
+    "scraper_stage_seconds", "Time spent per scraper stage (waits, PDF text, violation parsing, restaurant)",
+    ("stage",))
+PDF_BYTES = REGISTRY.histogram(
+    "scraper_pdf_bytes", "Size of inspection PDFs fetched from the portal", buckets=PDF_SIZE_BUCKETS)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the scraper's console output
+
+
+def serve_metrics(port, host=DEFAULT_HOST, registry=REGISTRY):
+    """Serve /metrics on a background thread (on localhost by default); returns the server"""
+    handler = type("BoundMetricsHandler", (MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📈 Metrics at http://{host or '0.0.0.0'}:{server.server_port}/metrics")
+    return server
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Atomically replace path with the current metrics (the textfile collector may read it any time)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(registry.render())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def start_textfile_writer(path, interval=TEXTFILE_INTERVAL, registry=REGISTRY):
+    """Rewrite the metrics file every interval seconds, and once more at exit"""
+    stopped = threading.Event()
+
+    def refresh():
+        while not stopped.wait(interval):
+            try:
+                write_textfile(path, registry)
+            except OSError as e:
+                print(f"⚠️  Warning: Could not write metrics file: {e}")
+
+    def final_write():
+        stopped.set()
+        write_textfile(path, registry)
+
+    threading.Thread(target=refresh, daemon=True).start()
+    atexit.register(final_write)
+    print(f"📈 Writing metrics to {path} every {interval}s")
@@ -0,0 +1,370 @@
+"""
+Offline Portal Replay
+=====================
+A local stand-in for the inspection portal, so scraper performance can be
+measured without touching baltimoreportal.jadian.com. It serves the same
+search form, result tables (paged like the portal's GridView, with
+__doPostBack pager links), establishment pages and inspection PDF downloads
+the scraper drives, with optional injected latency.
+
+Establishments are replayed from what earlier sessions captured: the
+restaurants JSON, plus the inspection PDFs kept in the PDF cache. Inspections
+with no cached PDF get a generated report carrying the stored violations.
+--synthetic N adds N made-up establishments spread over the Baltimore ZIPs.
+
+RUN:
+python3 replay_portal.py                                   # http://localhost:8765/
+python3 replay_portal.py --latency 0.3 --jitter 0.1        # slow portal
+python3 replay_portal.py --synthetic 300 --port 9000       # bigger ZIP sweeps
+"""
+
+import html
+import json
+import os
+import random
+import re
+import textwrap
+import threading
+import time
+import unicodedata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from scraper import BALTIMORE_ZIP_CODES, OUTPUT_FILE_JSON, PDF_CACHE_DIR, get_cli_option, slugify
+
+DEFAULT_PORT = 8765
+PAGE_SIZE = 10        # result rows per page, like the portal's GridView
+PAGER_WINDOW = 10     # page numbers shown at once; '...' links open the next window
+
+NAME_FIELD = "ctl00$FeaturedContent$txtEstablishment"
+ZIP_FIELD = "ctl00$FeaturedContent$txtcode"
+SEARCH_BUTTON = "ctl00$FeaturedContent$Button1"
+GRID_ID = "ctl00$FeaturedContent$gvResults"
+
+# Violation texts for generated reports of synthetic establishments
+SAMPLE_VIOLATIONS = [
+    (6, "The person-in-charge shall ensure that potentially hazardous cold food is held at 41 F or below."),
+    (16, "Food shall be stored covered and protected from splash and other contamination."),
+    (21, "Food contact surfaces and utensils shall be clean to sight and touch."),
+    (29, "Hand washing sinks shall be accessible and supplied with soap and paper towels."),
+    (34, "Floors, walls and ceilings shall be kept clean and in good repair."),
+    (37, "The premises shall be maintained free of insects, rodents and other pests."),
+]
+
+
+def ascii_text(text):
+    """Fold a string to printable ASCII for the generated PDFs' standard font"""
+    folded = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'\s+', ' ', folded).strip()
+
+
+def build_report_pdf(lines, lines_per_page=60):
+    """A minimal PDF (Helvetica, one text line per row) that PyPDF2 reads back line by line"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    bodies = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    page_ids = []
+    next_id = 4
+    for page_lines in pages:
+        escaped = (line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in page_lines)
+        stream = ("BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({line}) Tj T*" for line in escaped)
+                  + " ET").encode('latin-1')
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        bodies[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                           f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        bodies[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        page_ids.append(page_id)
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    bodies[2] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in range(1, next_id):
+        offsets[obj_id] = len(pdf)
+        pdf += b"%d 0 obj\n" % obj_id + bodies[obj_id] + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % next_id
+    for obj_id in range(1, next_id):
+        pdf += b"%010d 00000 n \n" % offsets[obj_id]
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (next_id, xref)
+    return bytes(pdf)
+
+
+def report_lines(establishment, inspection):
+    """Text of a generated inspection report, laid out the way parse_violations reads real ones"""
+    lines = [
+        "BALTIMORE CITY HEALTH DEPARTMENT",
+        "FOOD SERVICE FACILITY INSPECTION REPORT",
+        f"Establishment: {ascii_text(establishment['name'])}",
+        f"Address: {ascii_text(establishment['address'])}, Baltimore, MD {establishment['zipcode']}",
+        f"Inspection Date: {inspection['date']}   Inspection Type: Routine",
+        "OBSERVATIONS AND CORRECTIVE ACTIONS",
+    ]
+    for code, description in inspection['violations']:
+        wrapped = textwrap.wrap(f"{code} {ascii_text(description)}", 95)
+        for i, line in enumerate(wrapped):
+            if i and line[0].isdigit():
+                lines[-1] += " " + line  # A continuation starting with a digit would read as a new violation
+            else:
+                lines.append(line)
+    lines += ["Person-in-charge (Signature)", "Inspector (Print)"]
+    return lines
+
+
+def load_cached_pdfs(pdf_cache_dir):
+    """{(establishment slug, date): PDF bytes} from a PDF cache directory (read-only)"""
+    index_file = os.path.join(pdf_cache_dir, "index.json")
+    if not os.path.exists(index_file):
+        return {}
+    with open(index_file, 'r') as f:
+        entries = json.load(f)
+    pdfs = {}
+    for entry in entries.values():
+        blob = os.path.join(pdf_cache_dir, f"{entry['sha256']}.pdf")
+        if os.path.exists(blob):
+            with open(blob, 'rb') as f:
+                pdfs[(slugify(entry['establishment']), entry['inspection_date'])] = f.read()
+    return pdfs
+
+
+def load_fixture(restaurants_file=OUTPUT_FILE_JSON, pdf_cache_dir=PDF_CACHE_DIR, synthetic=0, seed=0):
+    """
+    Establishments to replay: [{id, name, address, zipcode, inspections: [{date, pdf}]}],
+    inspections newest first.
+    """
+    records = []
+    if os.path.exists(restaurants_file):
+        with open(restaurants_file, 'r') as f:
+            records = json.load(f)
+    cached_pdfs = load_cached_pdfs(pdf_cache_dir)
+
+    establishments = []
+    for record in records:
+        if not record.get('last_inspection'):
+            continue
+        establishments.append({
+            'name': record['name'],
+            'address': record.get('address', ''),
+            'zipcode': record.get('zipcode') if record.get('zipcode') != 'Unknown' else BALTIMORE_ZIP_CODES[0],
+            'inspections': [{
+                'date': record['last_inspection'],
+                'violations': [(v.get('code'), v.get('description', '')) for v in record.get('violations', [])],
+            }],
+        })
+
+    rng = random.Random(seed)
+    for i in range(synthetic):
+        inspections = []
+        for age in range(rng.randint(1, 3)):
+            month, day = rng.randint(1, 12), rng.randint(1, 28)
+            inspections.append({
+                'date': f"{month:02d}/{day:02d}/{2025 - age}",
+                'violations': rng.sample(SAMPLE_VIOLATIONS, rng.randint(0, 4)),
+            })
+        establishments.append({
+            'name': f"REPLAY KITCHEN {i + 1:04d}",
+            'address': f"{100 + i} E BALTIMORE ST",
+            'zipcode': BALTIMORE_ZIP_CODES[i % len(BALTIMORE_ZIP_CODES)],
+            'inspections': inspections,
+        })
+
+    for establishment_id, establishment in enumerate(establishments, 1):
+        establishment['id'] = establishment_id
+        for inspection in establishment['inspections']:
+            inspection['pdf'] = (cached_pdfs.get((slugify(establishment['name']), inspection['date']))
+                                 or build_report_pdf(report_lines(establishment, inspection)))
+    return establishments
+
+
+class ReplayPortal:
+    """Serves establishments the way the portal does, on a background thread"""
+
+    def __init__(self, establishments, latency=0.0, jitter=0.0, page_size=PAGE_SIZE):
+        self.establishments = establishments
+        self.by_id = {establishment['id']: establishment for establishment in establishments}
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.requests = 0
+        self.server = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.server.server_port}/"
+
+    def start(self, port=0):
+        """Start serving (port 0 picks a free port); returns the portal's base URL"""
+        handler = type("BoundReplayHandler", (ReplayHandler,), {"portal": self})
+        self.server = ThreadingHTTPServer(("", port), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def delay(self):
+        """Injected latency for one response"""
+        with self._lock:
+            self.requests += 1
+        seconds = self.latency + random.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def search(self, name='', zipcode=''):
+        name, zipcode = name.strip().lower(), zipcode.strip()
+        if name:
+            return [e for e in self.establishments if name in e['name'].lower()]
+        if zipcode:
+            return [e for e in self.establishments if e['zipcode'] == zipcode]
+        return []
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>Food Establishment Inspections (replay)</title></head>
+<body>
+{body}
+<script>
+function __doPostBack(target, argument) {{
+  var form = document.forms[0];
+  form.__EVENTTARGET.value = target;
+  form.__EVENTARGUMENT.value = argument;
+  form.submit();
+}}
+</script>
+</body></html>
+"""
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    portal = None
+
+    def log_message(self, format, *args):
+        pass  # Keep requests out of the benchmark's console output
+
+    def send_body(self, body, content_type="text/html; charset=utf-8", headers=None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_page(self, body):
+        self.send_body(PAGE_TEMPLATE.format(body=body).encode('utf-8'))
+
+    def do_GET(self):
+        self.portal.delay()
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == '/':
+            self.send_page(self.search_form())
+        elif url.path == '/results':
+            self.send_page(self.results_page(query.get('name', ''), query.get('zip', ''),
+                                             int(query.get('page', 1))))
+        elif re.fullmatch(r'/establishment/\d+', url.path):
+            self.establishment_page(int(url.path.rsplit('/', 1)[1]))
+        elif re.fullmatch(r'/report/\d+/\d+\.pdf', url.path):
+            _, _, establishment_id, filename = url.path.split('/')
+            self.report(int(establishment_id), int(filename[:-len('.pdf')]))
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        """Search form and pager postbacks: redirect to the results page (so history back is a GET)"""
+        self.portal.delay()
+        length = int(self.headers.get('Content-Length', 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+        page_match = re.fullmatch(r'Page\$(\d+)', form.get('__EVENTARGUMENT', ''))
+        query = urlencode({'name': form.get(NAME_FIELD, ''), 'zip': form.get(ZIP_FIELD, ''),
+                           'page': page_match.group(1) if page_match else 1})
+        self.send_response(303)
+        self.send_header("Location", f"/results?{query}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def search_form(self, name='', zipcode=''):
+        return f"""<form method="post" action="/">
+<input type="hidden" name="__EVENTTARGET" value="">
+<input type="hidden" name="__EVENTARGUMENT" value="">
+<label>Establishment <input type="text" name="{NAME_FIELD}" value="{html.escape(name)}"></label>
+<label>ZIP code <input type="text" name="{ZIP_FIELD}" value="{html.escape(zipcode)}"></label>
+<input type="submit" name="{SEARCH_BUTTON}" value="Search">
+</form>"""
+
+    def results_page(self, name, zipcode, page_number):
+        matches = self.portal.search(name, zipcode)
+        page_size = self.portal.page_size
+        page_count = max(1, -(-len(matches) // page_size))
+        page_number = min(max(1, page_number), page_count)
+        rows = ["<tr><th>Establishment</th><th>Address</th><th>ZIP</th><th>Inspections</th></tr>"]
+        for establishment in matches[(page_number - 1) * page_size:page_number * page_size]:
+            rows.append(f"<tr><td>{html.escape(establishment['name'])}</td>"
+                        f"<td>{html.escape(establishment['address'])}</td><td>{establishment['zipcode']}</td>"
+                        f"<td><a href=\"/establishment/{establishment['id']}\">View</a></td></tr>")
+        if page_count > 1:
+            rows.append(f"<tr><td colspan=\"4\">{self.pager(page_number, page_count)}</td></tr>")
+        return self.search_form(name, zipcode) + "\n<table>\n" + "\n".join(rows) + "\n</table>"
+
+    def pager(self, page_number, page_count):
+        """GridView-style pager: a window of page numbers with '...' links to the neighbouring windows"""
+        first = (page_number - 1) // PAGER_WINDOW * PAGER_WINDOW + 1
+        last = min(page_count, first + PAGER_WINDOW - 1)
+
+        def link(text, target):
+            return f"<td><a href=\"javascript:__doPostBack('{GRID_ID}','Page${target}')\">{text}</a></td>"
+
+        cells = [link('...', first - 1)] if first > 1 else []
+        cells += [f"<td><span>{n}</span></td>" if n == page_number else link(n, n) for n in range(first, last + 1)]
+        if last < page_count:
+            cells.append(link('...', last + 1))
+        return "<table><tr>" + "".join(cells) + "</tr></table>"
+
+    def establishment_page(self, establishment_id):
+        establishment = self.portal.by_id.get(establishment_id)
+        if not establishment:
+            self.send_error(404)
+            return
+        rows = ["<tr><th>Inspection Date</th><th>Type</th></tr>"]
+        for n, inspection in enumerate(establishment['inspections']):
+            rows.append(f"<tr><td><a href=\"/report/{establishment_id}/{n}.pdf\">{inspection['date']}</a></td>"
+                        f"<td>Routine</td></tr>")
+        self.send_page(f"<h2>{html.escape(establishment['name'])}</h2>\n"
+                       f"<p>{html.escape(establishment['address'])}, Baltimore, MD {establishment['zipcode']}</p>\n"
+                       "<table>\n" + "\n".join(rows) + "\n</table>")
+
+    def report(self, establishment_id, n):
+        establishment = self.portal.by_id.get(establishment_id)
+        if not establishment or n >= len(establishment['inspections']):
+            self.send_error(404)
+            return
+        self.send_body(establishment['inspections'][n]['pdf'], "application/pdf",
+                       {"Content-Disposition": f"attachment; filename=inspection_{establishment_id}_{n}.pdf"})
+
+
+def main():
+    port = int(get_cli_option('--port', DEFAULT_PORT))
+    latency = float(get_cli_option('--latency', 0))
+    jitter = float(get_cli_option('--jitter', 0))
+    synthetic = int(get_cli_option('--synthetic', 0))
+
+    establishments = load_fixture(synthetic=synthetic)
+    portal = ReplayPortal(establishments, latency=latency, jitter=jitter)
+    print(f"🎭 Replaying {len(establishments)} establishments at http://localhost:{port}/ "
+          f"(latency {latency}s + up to {jitter}s)")
+    portal.start(port)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        portal.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,27 +10,128 @@ playwright install chromium
 
 RUN:
 python3 scraper.py --test
+python3 scraper.py --workers 4    # scrape with 4 concurrent browser pages
+python3 scraper.py --resume 20260101_120000   # continue an interrupted session
+python3 scraper.py --refresh      # re-check stored restaurants, fetch only newer inspections
+python3 scraper.py --parse-workers 4   # parse PDFs in 4 processes while the browser moves on
+python3 scraper.py --reparse [DIR]     # re-rate from archived PDFs/text, no browser
+python3 scraper.py --pdf-backend anchored   # stop reading PDF pages at the signature line
+python3 scraper.py --pdf-backend streaming  # stop once date, ZIP and observations are captured
+python3 scraper.py --analytics-events  # append analytics events to a log, compact at session end
+python3 scraper.py --compact-analytics # fold the analytics event log into analytics.json
+python3 scraper.py --sqlite            # store restaurants, inspections and analytics in SQLite
+python3 scraper.py --export-json       # write the frontend JSON files from the SQLite store
+python3 scraper.py --history           # also keep every listed inspection (older dates fetched once)
+python3 scraper.py --zip-sweep --workers 4      # every establishment in every Baltimore ZIP
+python3 scraper.py --zip-sweep 21201,21202      # only these ZIPs
+python3 scraper.py --zip-sweep --two-phase --workers 4   # collect inspection links first, then fetch in bulk
+python3 scraper.py --direct-pdf        # fetch inspection PDFs over HTTP instead of browser downloads
+python3 scraper.py --retry-budget 50   # retry up to 50 transient failures this session (0 = never retry)
+python3 scraper.py --workers 4 --rate 3   # at most 3 portal requests per second across all workers
+                                          # (default: 2 per worker, so --workers N scales; --rate 0 = no cap)
+python3 scraper.py --workers 4 --metrics-port 9108   # live Prometheus metrics at localhost:9108/metrics
+python3 scraper.py --metrics-port 9108 --metrics-host 0.0.0.0   # serve them on every interface instead
+python3 scraper.py --metrics-file scraper.prom       # same metrics for node_exporter's textfile collector
 """
 
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import time
+import asyncio
 import json
+import io
 import re
 import os
 import sys
+import queue
+import uuid
+import random
+import hashlib
+import math
+import socket
+import sqlite3
+import tempfile
+import threading
+import contextvars
+import multiprocessing
+from abc import ABC, abstractmethod
 from pathlib import Path
+from urllib.parse import urljoin
 from datetime import datetime
+from functools import partial
+from contextlib import contextmanager, asynccontextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
 try:
     import PyPDF2
 except ImportError:
     print("Installing PyPDF2...")
     os.system("pip3 install PyPDF2")
     import PyPDF2
+try:
+    import fcntl  # cross-process lock for the analytics event log (POSIX only)
+except ImportError:
+    fcntl = None
 
 BASE_URL = "https://baltimoreportal.jadian.com/"
 OUTPUT_FILE_JSON = "../frontend/public/data/baltimore_restaurants.json"
 ANALYTICS_FILE = "../frontend/public/data/analytics.json"
+ANALYTICS_EVENTS_FILE = "../logs/analytics_events.jsonl"  # append-only log for --analytics-events
 SESSION_RESULTS_DIR = "../logs/session_results/"
+PDF_CACHE_DIR = "../logs/pdf_cache/"
+PDF_CACHE_MAX_BYTES = 200 * 1024 * 1024  # PDFs + extracted text, LRU-evicted beyond this
+INSPECTION_HISTORY_FILE = "../data/inspection_history.json"  # every listed inspection (--history)
+DATABASE_FILE = "../data/inspections.db"  # SQLite store (--sqlite); JSON files are exported from it
+
+# Worker-pool mode: each worker drives its own browser context/page inside a
+# single Chromium instance, reached over the Chrome DevTools Protocol on a
+# free local port picked when the browser starts.
+DEFAULT_WORKERS = 1
+MAX_WORKERS = 6
+
+# Links in the results table's pager (ASP.NET GridView __doPostBack('...','Page$N'))
+PAGER_LINK_SELECTOR = 'a[href*="Page$"]'
+
+# PDF parsing processes (0 = parse inline on the browser thread)
+DEFAULT_PARSE_WORKERS = 0
+
+# PDF text-extraction backend (see PDF_TEXT_BACKENDS)
+DEFAULT_PDF_BACKEND = 'pypdf2'
+
+# Restaurant the current thread/task is working on (span timings are charged to it)
+CURRENT_RESTAURANT = contextvars.ContextVar('current_restaurant', default=None)
+
+# Portal politeness: requests per second (token bucket), bursts allowed, and the
+# response time above which concurrency is halved. Without --rate the cap is
+# PORTAL_RATE_PER_WORKER times the number of workers, so adding workers still
+# scales (a restaurant takes about 5 requests); --rate sets one shared cap.
+PORTAL_RATE_PER_WORKER = 2.0
+PORTAL_BURST = 4
+PORTAL_SLOW_SECONDS = 8.0
+
+# Retry scheduler: transient failures are re-queued with exponential backoff
+# and jitter, at most RETRY_LIMITS[class] times each, within a per-session budget
+DEFAULT_RETRY_BUDGET = 20  # retries per session (0 = never retry)
+RETRY_BASE_DELAY = 5.0     # seconds before a first retry; doubles with each attempt
+RETRY_MAX_DELAY = 120.0
+RETRY_LIMITS = {
+    'timeout': 3,        # portal too slow to answer, or the connection dropped
+    'missing_input': 2,  # search form rendered without the name field
+    'empty_results': 1,  # empty results table for a name we expect to find
+    'pdf_error': 2,      # inspection PDF failed to download or parse
+}
+
+# Upper bounds (ms) for each event-driven wait on the portal. Waits return as
+# soon as the page is ready; these only cap how long a slow step may take.
+WAIT_TIMEOUTS = {
+    'portal_load': 60000,       # the portal's search page (BASE_URL)
+    'search_form': 15000,       # name/zip input after loading BASE_URL
+    'results': 30000,           # results page after submitting a search
+    'inspection_page': 15000,   # establishment page after clicking a result row
+    'inspection_dates': 15000,  # inspection date links on the establishment page
+    'download': 30000,          # inspection PDF download after clicking a date
+    'back': 15000,              # history navigation back to the previous page
+}
 
 BALTIMORE_ZIP_CODES = [
     '21201', '21202', '21205', '21206', '21209', '21210', '21211', '21212',
@@ -145,12 +246,515 @@ RESTAURANT_NAME_MAP = {
 }
 
 
-class AnalyticsTracker:
-    """Tracks restaurant search analytics across sessions"""
+def normalize_name(name):
+    """Normalize a restaurant name for case-insensitive matching"""
+    return name.strip().lower()
+
+
+def build_display_name_index(name_map):
+    """Reverse a display → portal name map, keyed by lowercased portal name (first entry wins)"""
+    index = {}
+    for display_name, portal_name in name_map.items():
+        index.setdefault(portal_name.lower(), display_name)
+    return index
+
+
+# Portal name → display name, for get_display_name
+DISPLAY_NAME_BY_PORTAL_NAME = build_display_name_index(RESTAURANT_NAME_MAP)
+
+
+def slugify(name):
+    """URL slug for a restaurant name (same rules as frontend/utils/slugify.js)"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def write_json_atomic(path, data):
+    """Write JSON through a temp file + rename so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class RestaurantStore:
+    """
+    In-memory view of baltimore_restaurants.json.
+
+    The file is read once; lookups go through hash indexes on the normalized
+    portal name (the 'name' stored in the JSON), the display name used in
+    RESTAURANT_NAME_MAP, and the frontend slug. Restaurants scraped during the
+    session are upserted as they come in, keyed by normalized name + address,
+    so the indexes never go stale and save() merges instead of overwriting.
+    """
+
+    def __init__(self, path=OUTPUT_FILE_JSON, name_map=RESTAURANT_NAME_MAP):
+        self.path = path
+        self.name_map = name_map
+        self.restaurants = []
+        self._by_key = {}
+        self._by_name = {}
+        self._by_display = {}
+        self._by_slug = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+        self.load()
+
+    @staticmethod
+    def record_key(restaurant):
+        """Identity of a restaurant record: normalized name + address"""
+        return (normalize_name(restaurant.get('name', '')),
+                normalize_name(restaurant.get('address', '')))
+
+    def load(self):
+        """Load restaurants from disk and rebuild the indexes"""
+        restaurants = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    restaurants = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"⚠️  Warning: Could not load restaurants: {e}")
+
+        # Map normalized portal names back to their display names
+        display_names = {}
+        for display_name, portal_name in self.name_map.items():
+            display_names.setdefault(normalize_name(portal_name), []).append(display_name)
+
+        with self._lock:
+            self.restaurants = []
+            self._by_key = {}
+            self._by_name = {}
+            self._by_display = {}
+            self._by_slug = {}
+            self._next_id = 1
+            for restaurant in restaurants:
+                names = display_names.get(normalize_name(restaurant.get('name', '')), [])
+                self._add(restaurant, names)
+
+    def _add(self, restaurant, display_names):
+        if not isinstance(restaurant.get('id'), int):
+            restaurant['id'] = self._next_id
+        self._next_id = max(self._next_id, restaurant['id'] + 1)
+        self.restaurants.append(restaurant)
+        self._by_key.setdefault(self.record_key(restaurant), restaurant)
+        self._index_names(restaurant, display_names)
+
+    def _index_names(self, restaurant, display_names):
+        name = restaurant.get('name', '')
+        self._by_name.setdefault(normalize_name(name), restaurant)
+        self._by_slug.setdefault(slugify(name), restaurant)
+        for display_name in display_names:
+            self._by_display.setdefault(normalize_name(display_name), restaurant)
+
+    def upsert(self, restaurant, display_name=None):
+        """
+        Insert a scraped restaurant or update the matching record in place.
+        Existing records keep their id (and any fields the scraper doesn't
+        produce); new records get the next free id.
+        Returns (stored_record, created).
+        """
+        display_names = [display_name] if display_name else []
+        fields = {k: v for k, v in restaurant.items() if k != 'id'}
+        with self._lock:
+            existing = self._by_key.get(self.record_key(fields))
+            if existing is not None:
+                existing.update(fields)
+                self._index_names(existing, display_names)
+                return existing, False
+            record = {'id': self._next_id, **fields}
+            self._add(record, display_names)
+            return record, True
+
+    def save(self):
+        """Atomically write all restaurants back to disk"""
+        with self._lock:
+            write_json_atomic(self.path, self.restaurants)
+
+    def get(self, restaurant_name):
+        """Find a restaurant by display name or portal name"""
+        norm_name = normalize_name(restaurant_name)
+        portal_name = normalize_name(self.name_map.get(restaurant_name, restaurant_name))
+        return (self._by_display.get(norm_name)
+                or self._by_name.get(norm_name)
+                or self._by_name.get(portal_name))
+
+    def get_by_slug(self, slug):
+        """Find a restaurant by its frontend URL slug"""
+        return self._by_slug.get(slug)
+
+    def exists(self, restaurant_name):
+        """Check whether a restaurant is present (display or portal name)"""
+        return self.get(restaurant_name) is not None
+
+
+DATABASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS restaurants (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    address TEXT,
+    zipcode TEXT,
+    city TEXT,
+    state TEXT,
+    star_rating INTEGER,
+    last_inspection TEXT,
+    name_key TEXT NOT NULL,
+    address_key TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    extra TEXT,
+    UNIQUE (name_key, address_key)
+);
+CREATE INDEX IF NOT EXISTS idx_restaurants_name ON restaurants(name_key);
+CREATE INDEX IF NOT EXISTS idx_restaurants_slug ON restaurants(slug);
+CREATE INDEX IF NOT EXISTS idx_restaurants_zipcode ON restaurants(zipcode);
+CREATE INDEX IF NOT EXISTS idx_restaurants_star_rating ON restaurants(star_rating);
+
+CREATE TABLE IF NOT EXISTS display_names (
+    display_key TEXT PRIMARY KEY,
+    restaurant_id INTEGER NOT NULL REFERENCES restaurants(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS inspections (
+    id INTEGER PRIMARY KEY,
+    restaurant_id INTEGER NOT NULL REFERENCES restaurants(id) ON DELETE CASCADE,
+    inspection_date TEXT NOT NULL,
+    inspected_on TEXT,
+    star_rating INTEGER,
+    scraped_at TEXT NOT NULL,
+    UNIQUE (restaurant_id, inspection_date)
+);
+CREATE INDEX IF NOT EXISTS idx_inspections_inspected_on ON inspections(inspected_on);
+
+CREATE TABLE IF NOT EXISTS violations (
+    id INTEGER PRIMARY KEY,
+    inspection_id INTEGER NOT NULL REFERENCES inspections(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    code INTEGER,
+    severity TEXT,
+    description TEXT,
+    corrected_on_site INTEGER NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_violations_inspection ON violations(inspection_id);
+CREATE INDEX IF NOT EXISTS idx_violations_code ON violations(code);
+
+CREATE TABLE IF NOT EXISTS search_events (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT,
+    timestamp TEXT NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_search_events_name ON search_events(name);
+"""
+
+
+def database_file_for(output_file):
+    """SQLite database behind a restaurants JSON file: the production one, or a scratch one next to other outputs"""
+    if os.path.abspath(output_file) == os.path.abspath(OUTPUT_FILE_JSON):
+        return DATABASE_FILE
+    return os.path.splitext(output_file)[0] + ".db"
+
+
+def connect_database(db_path=DATABASE_FILE):
+    """Open (and if needed create) the SQLite database; safe to share across threads behind a lock"""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA foreign_keys=ON")
+    connection.executescript(DATABASE_SCHEMA)
+    return connection
+
+
+class SqliteRestaurantStore:
+    """
+    RestaurantStore backed by SQLite instead of one JSON array.
+
+    Restaurants, their inspections (every inspection date ever stored, not
+    just the latest), violations and display-name aliases are normalized
+    tables, and each upsert is a single row-level transaction. save() exports
+    baltimore_restaurants.json for the frontend. Records read back look
+    exactly like the JSON ones.
+
+    On first use the database is seeded from the existing JSON file. Each
+    JSON file has its own database (see database_file_for), so test runs
+    never write into data/inspections.db.
+    """
+
+    RESTAURANT_COLUMNS = ('name', 'address', 'zipcode', 'city', 'state', 'star_rating', 'last_inspection')
+    VIOLATION_COLUMNS = ('code', 'description', 'severity', 'corrected_on_site')
+
+    def __init__(self, path=OUTPUT_FILE_JSON, name_map=RESTAURANT_NAME_MAP, db_path=None):
+        self.path = path
+        self.name_map = name_map
+        self.db_path = db_path = db_path or database_file_for(path)
+        self._lock = threading.RLock()
+        # History mode: older inspections of establishments not stored yet, by name key
+        self._pending_inspections = {}
+        self.db = connect_database(db_path)
+        if self.db.execute("SELECT COUNT(*) FROM restaurants").fetchone()[0] == 0:
+            self.import_json(path)
+
+    record_key = staticmethod(RestaurantStore.record_key)
+
+    def import_json(self, path):
+        """Seed the database from a restaurants JSON file (keeps ids)"""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r') as f:
+                restaurants = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"⚠️  Warning: Could not load restaurants: {e}")
+            return
+
+        display_names = {}
+        for display_name, portal_name in self.name_map.items():
+            display_names.setdefault(normalize_name(portal_name), []).append(display_name)
+
+        with self._lock, self.db:
+            for restaurant in restaurants:
+                names = display_names.get(normalize_name(restaurant.get('name', '')), [])
+                self._upsert(restaurant, names)
+        print(f"🗄️  Imported {len(restaurants)} restaurants from {path} into {self.db_path}")
 
-    def __init__(self, analytics_file=ANALYTICS_FILE):
+    def upsert(self, restaurant, display_name=None):
+        """
+        Insert a scraped restaurant or update the matching record (one transaction).
+        Existing records keep their id (and any fields the scraper doesn't
+        produce); new records get the next free id.
+        Returns (stored_record, created).
+        """
+        with self._lock, self.db:
+            return self._upsert(restaurant, [display_name] if display_name else [])
+
+    def _upsert(self, restaurant, display_names):
+        fields = {k: v for k, v in restaurant.items() if k != 'id'}
+        name_key, address_key = self.record_key(fields)
+        row = self.db.execute("SELECT id FROM restaurants WHERE name_key = ? AND address_key = ?",
+                              (name_key, address_key)).fetchone()
+        if row is not None:
+            record = {**self._load_record(row['id']), **fields}
+            created = False
+        else:
+            # Imported records keep their id; scraped ones get the next free one
+            record_id = restaurant.get('id') if isinstance(restaurant.get('id'), int) else None
+            if record_id is not None and self.db.execute(
+                    "SELECT 1 FROM restaurants WHERE id = ?", (record_id,)).fetchone():
+                record_id = None
+            record = {'id': record_id, **fields}
+            created = True
+
+        self._write_record(record, name_key, address_key, created)
+        for display_name in display_names:
+            self.db.execute("INSERT OR IGNORE INTO display_names (display_key, restaurant_id) VALUES (?, ?)",
+                            (normalize_name(display_name), record['id']))
+        for inspection_date, inspection_data in self._pending_inspections.pop(name_key, []):
+            self._write_older_inspection(record['id'], inspection_date, inspection_data)
+        return record, created
+
+    def _write_record(self, record, name_key, address_key, created):
+        values = [record.get(column) for column in self.RESTAURANT_COLUMNS]
+        extra = {k: v for k, v in record.items()
+                 if k not in self.RESTAURANT_COLUMNS and k not in ('id', 'violations')}
+        values += [name_key, address_key, slugify(record.get('name', '')), json.dumps(extra) if extra else None]
+        if created:
+            cursor = self.db.execute(
+                "INSERT INTO restaurants (id, name, address, zipcode, city, state, star_rating, last_inspection, "
+                "name_key, address_key, slug, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [record['id']] + values)
+            record['id'] = cursor.lastrowid
+        else:
+            self.db.execute(
+                "UPDATE restaurants SET name = ?, address = ?, zipcode = ?, city = ?, state = ?, star_rating = ?, "
+                "last_inspection = ?, name_key = ?, address_key = ?, slug = ?, extra = ? WHERE id = ?",
+                values + [record['id']])
+        if 'violations' in record:
+            self._write_inspection(record)
+
+    def _write_inspection(self, record):
+        """Store the record's current inspection (history rows for other dates are kept)"""
+        inspection_date = record.get('last_inspection') or ''
+        inspected_on = parse_inspection_date(inspection_date)
+        self.db.execute(
+            "INSERT INTO inspections (restaurant_id, inspection_date, inspected_on, star_rating, scraped_at) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT (restaurant_id, inspection_date) "
+            "DO UPDATE SET star_rating = excluded.star_rating, scraped_at = excluded.scraped_at",
+            (record['id'], inspection_date, inspected_on.date().isoformat() if inspected_on else None,
+             record.get('star_rating'), datetime.now().isoformat()))
+        inspection_id = self.db.execute(
+            "SELECT id FROM inspections WHERE restaurant_id = ? AND inspection_date = ?",
+            (record['id'], inspection_date)).fetchone()['id']
+
+        self.db.execute("DELETE FROM violations WHERE inspection_id = ?", (inspection_id,))
+        for position, violation in enumerate(record.get('violations') or []):
+            extra = {k: v for k, v in violation.items() if k not in self.VIOLATION_COLUMNS}
+            self.db.execute(
+                "INSERT INTO violations (inspection_id, position, code, severity, description, "
+                "corrected_on_site, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (inspection_id, position, violation.get('code'), violation.get('severity'),
+                 violation.get('description'), int(bool(violation.get('corrected_on_site'))),
+                 json.dumps(extra) if extra else None))
+
+    def _write_older_inspection(self, restaurant_id, inspection_date, inspection_data):
+        self._write_inspection({'id': restaurant_id, 'last_inspection': inspection_date,
+                                'star_rating': inspection_data.get('star_rating'),
+                                'violations': inspection_data.get('violations', [])})
+
+    def _ids_named(self, name_key):
+        return [row['id'] for row in
+                self.db.execute("SELECT id FROM restaurants WHERE name_key = ?", (name_key,)).fetchall()]
+
+    def inspection_dates(self, establishment):
+        """Inspection dates stored (or waiting to be stored) for an establishment, by portal name"""
+        name_key = normalize_name(establishment)
+        with self._lock:
+            ids = self._ids_named(name_key)
+            rows = self.db.execute(
+                f"SELECT inspection_date FROM inspections WHERE restaurant_id IN ({', '.join('?' * len(ids))})",
+                ids).fetchall() if ids else []
+            pending = self._pending_inspections.get(name_key, [])
+            return {row['inspection_date'] for row in rows} | {inspection_date for inspection_date, _ in pending}
+
+    def add_inspection(self, establishment, inspection_date, inspection_data):
+        """
+        History mode: store another inspection of an establishment (one transaction).
+        Until exactly one stored restaurant has that name, the inspection is held
+        and written when the establishment itself is upserted with its address.
+        """
+        name_key = normalize_name(establishment)
+        with self._lock:
+            ids = self._ids_named(name_key)
+            if len(ids) != 1:
+                self._pending_inspections.setdefault(name_key, []).append((inspection_date, inspection_data))
+                return
+            with self.db:
+                self._write_older_inspection(ids[0], inspection_date, inspection_data)
+
+    def _load_violations(self, restaurant_id, inspection_date):
+        rows = self.db.execute(
+            "SELECT v.* FROM violations v JOIN inspections i ON i.id = v.inspection_id "
+            "WHERE i.restaurant_id = ? AND i.inspection_date = ? ORDER BY v.position",
+            (restaurant_id, inspection_date or '')).fetchall()
+        violations = []
+        for row in rows:
+            violation = {'code': row['code'], 'description': row['description']}
+            if row['severity'] is not None:
+                violation['severity'] = row['severity']
+            violation['corrected_on_site'] = bool(row['corrected_on_site'])
+            violation.update(json.loads(row['extra']) if row['extra'] else {})
+            violations.append(violation)
+        return violations
+
+    def _record_from_row(self, row):
+        record = {'id': row['id']}
+        for column in self.RESTAURANT_COLUMNS:
+            record[column] = row[column]
+        record['violations'] = self._load_violations(row['id'], row['last_inspection'])
+        record.update(json.loads(row['extra']) if row['extra'] else {})
+        return record
+
+    def _load_record(self, restaurant_id):
+        row = self.db.execute("SELECT * FROM restaurants WHERE id = ?", (restaurant_id,)).fetchone()
+        return self._record_from_row(row) if row else None
+
+    def _find_one(self, where, value):
+        row = self.db.execute(f"SELECT * FROM restaurants WHERE {where} = ? ORDER BY id LIMIT 1",
+                              (value,)).fetchone()
+        return self._record_from_row(row) if row else None
+
+    @property
+    def restaurants(self):
+        """Every stored restaurant, as JSON-style records ordered by id"""
+        with self._lock:
+            rows = self.db.execute("SELECT * FROM restaurants ORDER BY id").fetchall()
+            return [self._record_from_row(row) for row in rows]
+
+    def save(self):
+        """Export all restaurants to the JSON file the frontend reads (atomic write)"""
+        write_json_atomic(self.path, self.restaurants)
+
+    def get(self, restaurant_name):
+        """Find a restaurant by display name or portal name"""
+        norm_name = normalize_name(restaurant_name)
+        portal_name = normalize_name(self.name_map.get(restaurant_name, restaurant_name))
+        with self._lock:
+            row = self.db.execute("SELECT restaurant_id FROM display_names WHERE display_key = ?",
+                                  (norm_name,)).fetchone()
+            if row:
+                return self._load_record(row['restaurant_id'])
+            return self._find_one('name_key', norm_name) or self._find_one('name_key', portal_name)
+
+    def get_by_slug(self, slug):
+        """Find a restaurant by its frontend URL slug"""
+        with self._lock:
+            return self._find_one('slug', slug)
+
+    def exists(self, restaurant_name):
+        """Check whether a restaurant is present (display or portal name)"""
+        return self.get(restaurant_name) is not None
+
+    def inspection_history(self, restaurant_name):
+        """All stored inspections of a restaurant, newest first: [{inspection_date, star_rating, violations}]"""
+        restaurant = self.get(restaurant_name)
+        if restaurant is None:
+            return []
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT inspection_date, star_rating FROM inspections WHERE restaurant_id = ? "
+                "ORDER BY inspected_on DESC", (restaurant['id'],)).fetchall()
+            return [{'inspection_date': row['inspection_date'], 'star_rating': row['star_rating'],
+                     'violations': self._load_violations(restaurant['id'], row['inspection_date'])}
+                    for row in rows]
+
+
+class AnalyticsTracker:
+    """
+    Tracks restaurant search analytics across sessions.
+
+    storage='json' (default) keeps everything in analytics.json and rewrites
+    it on save. storage='events' appends one compact event per record_* call
+    to a JSONL log instead; compact() replays the log onto analytics.json
+    (the snapshot the dashboard reads) and truncates it. Appends take a shared
+    file lock and compaction an exclusive one, so several scrapers can log to
+    the same file.
+
+    storage='sqlite' writes the same events to the search_events table of the
+    SQLite database and keeps them; analytics.json records the id of the last
+    event folded in (metadata.last_event_id), so compaction only replays
+    newer ones.
+    """
+
+    STORAGE_MODES = ('json', 'events', 'sqlite')
+
+    def __init__(self, analytics_file=ANALYTICS_FILE, storage='json', events_file=ANALYTICS_EVENTS_FILE,
+                 db_path=DATABASE_FILE):
+        if storage not in self.STORAGE_MODES:
+            raise ValueError(f"Unknown analytics storage '{storage}' (choose from {', '.join(self.STORAGE_MODES)})")
         self.analytics_file = analytics_file
+        self.storage = storage
+        self.events_file = events_file
+        self.db = connect_database(db_path) if storage == 'sqlite' else None
         self.analytics = self.load_analytics()
+        # Normalized restaurant name -> key in restaurant_searches
+        self._name_index = {}
+        self._rebuild_name_index()
+        # Scraper workers record into the same tracker from several threads
+        self._lock = threading.RLock()
+        if storage == 'events':
+            with self._events_file_lock(exclusive=False):
+                self._replay_events()
+        elif storage == 'sqlite':
+            self._replay_events()
 
     def load_analytics(self):
         """Load analytics from JSON file or create new structure"""
@@ -181,27 +785,192 @@ class AnalyticsTracker:
         }
 
     def save_analytics(self):
-        """Save analytics to JSON file"""
+        """Save analytics to JSON file (compacts the event log in 'events'/'sqlite' mode)"""
+        if self.storage != 'json':
+            self.compact()
+            return
         try:
-            self.analytics["metadata"]["last_updated"] = datetime.now().isoformat()
-            with open(self.analytics_file, 'w') as f:
-                json.dump(self.analytics, f, indent=2)
+            with self._lock:
+                self.analytics["metadata"]["last_updated"] = datetime.now().isoformat()
+                with open(self.analytics_file, 'w') as f:
+                    json.dump(self.analytics, f, indent=2)
         except IOError as e:
             print(f"⚠️  Warning: Could not save analytics: {e}")
 
+    @contextmanager
+    def _events_file_lock(self, exclusive):
+        """
+        Open the event log for append and hold a cross-process lock on it for
+        the block (no lock where fcntl is unavailable). Yields the open log.
+        """
+        os.makedirs(os.path.dirname(self.events_file) or '.', exist_ok=True)
+        with open(self.events_file, 'a', encoding='utf-8') as events:
+            if fcntl:
+                fcntl.flock(events, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield events
+            finally:
+                events.flush()  # Written before another process can take the lock
+                if fcntl:
+                    fcntl.flock(events, fcntl.LOCK_UN)
+
+    def _read_events(self):
+        """Events in the log, skipping a torn last line (sqlite: events newer than the snapshot)"""
+        if self.storage == 'sqlite':
+            last_event_id = self.analytics["metadata"].get("last_event_id", 0)
+            rows = self.db.execute("SELECT * FROM search_events WHERE id > ? ORDER BY id",
+                                   (last_event_id,)).fetchall()
+            if rows:
+                self.analytics["metadata"]["last_event_id"] = rows[-1]["id"]
+            return [{"type": row["type"], "timestamp": row["timestamp"],
+                     **({"name": row["name"]} if row["name"] is not None else {}),
+                     **json.loads(row["data"] or "{}")} for row in rows]
+        events = []
+        if not os.path.exists(self.events_file):
+            return events
+        with open(self.events_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return events
+
+    def _replay_events(self):
+        for event in self._read_events():
+            self._apply_event(event)
+
+    def compact(self):
+        """
+        Materialize analytics.json from the last snapshot plus the event log,
+        then truncate the log ('events' mode; SQLite events are kept). Re-reads
+        both from disk so events logged by other scrapers are included. The log
+        is truncated in place, never replaced, so appenders waiting on its lock
+        write to the same file. Only 'events' mode touches the log file.
+        """
+        if self.storage == 'json':
+            return  # No events were logged; analytics.json is written directly
+        event_log = self._events_file_lock(exclusive=True) if self.storage == 'events' else nullcontext()
+        try:
+            with self._lock, event_log as events:
+                self.analytics = self.load_analytics()
+                self._rebuild_name_index()
+                self._replay_events()
+                self.get_demand_analysis()
+                self.analytics["metadata"]["last_updated"] = datetime.now().isoformat()
+                write_json_atomic(self.analytics_file, self.analytics)
+                if events:
+                    events.truncate(0)
+        except IOError as e:
+            print(f"⚠️  Warning: Could not compact analytics: {e}")
+
+    def _record(self, event_type, restaurant_name=None, **fields):
+        """Apply an event to the in-memory analytics (and append it to the log in 'events' mode)"""
+        event = {"type": event_type, "timestamp": datetime.now().isoformat(), **fields}
+        if restaurant_name is not None:
+            event["name"] = restaurant_name
+        metrics.ANALYTICS_EVENTS.inc(event=event_type)
+        with self._lock:
+            self._apply_event(event)
+            if self.storage == 'events':
+                self._append_event(event)
+            elif self.storage == 'sqlite':
+                self._insert_event(event)
+
+    def _insert_event(self, event):
+        data = {k: v for k, v in event.items() if k not in ('type', 'timestamp', 'name')}
+        try:
+            with self.db:
+                self.db.execute("INSERT INTO search_events (type, name, timestamp, data) VALUES (?, ?, ?, ?)",
+                                (event["type"], event.get("name"), event["timestamp"],
+                                 json.dumps(data, separators=(',', ':')) if data else None))
+        except sqlite3.Error as e:
+            print(f"⚠️  Warning: Could not log analytics event: {e}")
+
+    def _append_event(self, event):
+        line = json.dumps(event, separators=(',', ':'))
+        try:
+            with self._events_file_lock(exclusive=False) as events:
+                events.write(line + '\n')
+        except IOError as e:
+            print(f"⚠️  Warning: Could not log analytics event: {e}")
+
+    def _apply_event(self, event):
+        """Fold one event into self.analytics"""
+        event_type = event["type"]
+        now = event["timestamp"]
+
+        if event_type == "session":
+            self.analytics["metadata"]["total_sessions"] += 1
+            return
+
+        if event_type == "remove":
+            searches = self.analytics["restaurant_searches"]
+            for restaurant in event["names"]:
+                searches.pop(restaurant, None)
+            self._rebuild_name_index()
+            # Recalculate total searches based on remaining restaurants
+            self.analytics["metadata"]["total_searches"] = sum(
+                data["search_count"] for data in searches.values()
+            )
+            return
+
+        entry, key = self._get_or_create_restaurant_entry(event["name"])
+
+        if event_type == "search":
+            entry["search_count"] += 1
+            entry["last_searched"] = now
+            self.analytics["metadata"]["total_searches"] += 1
+
+        elif event_type == "success":
+            old_status = entry["status"]
+
+            if entry["first_success"] is None:
+                entry["first_success"] = now
+
+            entry["last_success"] = now
+            entry["status"] = "successfully_scraped"
+
+            # Save violation data
+            entry["violations_count"] = event["violations_count"]
+            if event.get("star_rating") is not None:
+                entry["star_rating"] = event["star_rating"]
+            if event.get("severity_breakdown"):
+                entry["severity_breakdown"] = event["severity_breakdown"]
+
+            # Check for status transition
+            if old_status in ["not_found", "scraping_failed"]:
+                entry["status"] = "previously_failed_now_success"
+                entry["notes"].append(f"Status changed from '{old_status}' to 'success' at {now}")
+
+        elif event_type in ("failure", "not_found"):
+            entry["failure_count"] += 1
+            entry["last_failure"] = now
+            entry["status"] = "scraping_failed" if event_type == "failure" else "not_found"
+
+            reason = event.get("reason", "No restaurant found in portal")
+            if reason not in entry["failure_reasons"]:
+                entry["failure_reasons"].append(reason)
+
     def _normalize_name(self, restaurant_name):
         """Normalize restaurant name for consistent matching"""
         return restaurant_name.strip().lower()
 
+    def _rebuild_name_index(self):
+        """Re-index restaurant_searches by normalized name (the first of any case variants wins)"""
+        self._name_index = {}
+        for key in self.analytics["restaurant_searches"]:
+            self._name_index.setdefault(self._normalize_name(key), key)
+
     def _get_or_create_restaurant_entry(self, restaurant_name):
         """Get existing restaurant entry or create new one"""
         norm_name = self._normalize_name(restaurant_name)
         searches = self.analytics["restaurant_searches"]
 
         # Find existing entry (case-insensitive)
-        for key in searches:
-            if self._normalize_name(key) == norm_name:
-                return searches[key], key
+        key = self._name_index.get(norm_name)
+        if key is not None:
+            return searches[key], key
 
         # Create new entry
         searches[restaurant_name] = {
@@ -215,32 +984,18 @@ class AnalyticsTracker:
             "failure_reasons": [],
             "notes": []
         }
+        self._name_index[norm_name] = restaurant_name
         return searches[restaurant_name], restaurant_name
 
     def record_search(self, restaurant_name):
         """Record a restaurant search attempt"""
-        entry, key = self._get_or_create_restaurant_entry(restaurant_name)
-        entry["search_count"] += 1
-        entry["last_searched"] = datetime.now().isoformat()
-        self.analytics["metadata"]["total_searches"] += 1
+        self._record("search", restaurant_name)
 
     def record_success(self, restaurant_name, violations_count=0, star_rating=None, violations=None):
         """Record successful scraping with violation details"""
-        entry, key = self._get_or_create_restaurant_entry(restaurant_name)
-
-        old_status = entry["status"]
-        now = datetime.now().isoformat()
-
-        if entry["first_success"] is None:
-            entry["first_success"] = now
-
-        entry["last_success"] = now
-        entry["status"] = "successfully_scraped"
-
-        # Save violation data
-        entry["violations_count"] = violations_count
+        fields = {"violations_count": violations_count}
         if star_rating is not None:
-            entry["star_rating"] = star_rating
+            fields["star_rating"] = star_rating
 
         # Calculate severity breakdown from violations
         if violations:
@@ -249,61 +1004,37 @@ class AnalyticsTracker:
                 if isinstance(v, dict) and 'severity' in v:
                     severity = v['severity']
                     severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            entry["severity_breakdown"] = severity_counts
+            fields["severity_breakdown"] = severity_counts
 
-        # Check for status transition
-        if old_status in ["not_found", "scraping_failed"]:
-            entry["status"] = "previously_failed_now_success"
-            entry["notes"].append(f"Status changed from '{old_status}' to 'success' at {now}")
+        self._record("success", restaurant_name, **fields)
 
     def record_failure(self, restaurant_name, reason):
         """Record scraping failure"""
-        entry, key = self._get_or_create_restaurant_entry(restaurant_name)
-
-        entry["failure_count"] += 1
-        entry["last_failure"] = datetime.now().isoformat()
-        entry["status"] = "scraping_failed"
-
-        if reason not in entry["failure_reasons"]:
-            entry["failure_reasons"].append(reason)
+        self._record("failure", restaurant_name, reason=reason)
 
     def record_not_found(self, restaurant_name):
         """Record restaurant not found in portal"""
-        entry, key = self._get_or_create_restaurant_entry(restaurant_name)
-
-        entry["failure_count"] += 1
-        entry["last_failure"] = datetime.now().isoformat()
-        entry["status"] = "not_found"
-
-        reason = "No restaurant found in portal"
-        if reason not in entry["failure_reasons"]:
-            entry["failure_reasons"].append(reason)
+        self._record("not_found", restaurant_name)
 
     def increment_session_count(self):
         """Increment total session count"""
-        self.analytics["metadata"]["total_sessions"] += 1
+        self._record("session")
 
     def sync_with_restaurant_map(self, restaurant_map):
         """
         Ensure analytics only contains restaurants from the current restaurant map.
         Removes any restaurants that are not in the map (from previous attempts).
         """
-        current_restaurants = set(restaurant_map.keys())
-        analytics_restaurants = set(self.analytics["restaurant_searches"].keys())
-
-        # Find restaurants to remove (in analytics but not in current map)
-        restaurants_to_remove = analytics_restaurants - current_restaurants
+        with self._lock:
+            current_restaurants = set(restaurant_map.keys())
+            analytics_restaurants = set(self.analytics["restaurant_searches"].keys())
 
-        if restaurants_to_remove:
-            print(f"🧹 Cleaning up analytics: removing {len(restaurants_to_remove)} restaurants not in current list")
-            for restaurant in restaurants_to_remove:
-                del self.analytics["restaurant_searches"][restaurant]
+            # Find restaurants to remove (in analytics but not in current map)
+            restaurants_to_remove = analytics_restaurants - current_restaurants
 
-            # Recalculate total searches based on remaining restaurants
-            self.analytics["metadata"]["total_searches"] = sum(
-                data["search_count"]
-                for data in self.analytics["restaurant_searches"].values()
-            )
+            if restaurants_to_remove:
+                print(f"🧹 Cleaning up analytics: removing {len(restaurants_to_remove)} restaurants not in current list")
+                self._record("remove", names=sorted(restaurants_to_remove))
 
     def get_demand_analysis(self):
         """Generate demand analysis for not found and top searched restaurants"""
@@ -340,11 +1071,379 @@ class AnalyticsTracker:
         }
 
 
+def parse_inspection_date(text):
+    """Parse the first MM/DD/YYYY date in text, or None"""
+    if not text:
+        return None
+    match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', text)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%m/%d/%Y")
+    except ValueError:
+        return None
+
+
+def is_newer_inspection(listed_date, stored_date):
+    """True if the portal lists an inspection newer than the stored one (or we can't tell)"""
+    listed = parse_inspection_date(listed_date)
+    stored = parse_inspection_date(stored_date)
+    if listed is None or stored is None:
+        return True
+    return listed > stored
+
+
+# Returned by get_latest_inspection when the listed inspection is not newer
+# than the one already stored (freshness mode)
+INSPECTION_UNCHANGED = "inspection_unchanged"
+
+# Returned by get_latest_inspection when the PDF was handed to the parse pool
+PARSE_QUEUED = "parse_queued"
+
+
+class PdfCache:
+    """
+    On-disk cache of inspection PDFs and their extracted text.
+
+    Entries are keyed by establishment + inspection date, so an inspection
+    that hasn't changed is served without clicking the download link. Blobs
+    are stored by SHA-256 of the PDF bytes (identical reports are kept once),
+    and the least recently used entries are evicted once the cache grows past
+    max_bytes.
+
+    Layout:
+      index.json            {key: {establishment, inspection_date, sha256, size, last_used}}
+      <sha256>.pdf / .txt   PDF bytes and extracted text
+    """
+
+    def __init__(self, cache_dir=PDF_CACHE_DIR, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entries = self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"⚠️  Warning: Could not load PDF cache index: {e}")
+        return {}
+
+    def _save_index(self):
+        write_json_atomic(self.index_file, self.entries)
+
+    @staticmethod
+    def make_key(establishment, inspection_date):
+        return f"{slugify(establishment)}|{inspection_date.strip()}"
+
+    def blob_path(self, sha256, extension):
+        return os.path.join(self.cache_dir, f"{sha256}.{extension}")
+
+    def get_text(self, establishment, inspection_date):
+        """Return cached text for an inspection, or None on a miss"""
+        if not establishment or not inspection_date:
+            return None
+        key = self.make_key(establishment, inspection_date)
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            try:
+                with open(self.blob_path(entry["sha256"], "txt"), 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except IOError:
+                # Blob went missing underneath us; drop the stale entry
+                del self.entries[key]
+                self._save_index()
+                return None
+            entry["last_used"] = time.time()
+            self._save_index()
+            return text
+
+    def put(self, establishment, inspection_date, pdf, text):
+        """Store a downloaded PDF (file path or bytes) and its extracted text"""
+        if not establishment or not inspection_date or not text:
+            return
+        if isinstance(pdf, bytes):
+            pdf_bytes = pdf
+        else:
+            with open(pdf, 'rb') as f:
+                pdf_bytes = f.read()
+        sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+
+        with self._lock:
+            pdf_blob = self.blob_path(sha256, "pdf")
+            if not os.path.exists(pdf_blob):
+                with open(pdf_blob, 'wb') as f:
+                    f.write(pdf_bytes)
+                with open(self.blob_path(sha256, "txt"), 'w', encoding='utf-8') as f:
+                    f.write(text)
+
+            self.entries[self.make_key(establishment, inspection_date)] = {
+                "establishment": establishment,
+                "inspection_date": inspection_date.strip(),
+                "sha256": sha256,
+                "size": len(pdf_bytes) + len(text.encode('utf-8')),
+                "last_used": time.time()
+            }
+            self._evict()
+            self._save_index()
+
+    def _evict(self):
+        """Drop least recently used entries until the unique blobs fit in max_bytes"""
+        blob_sizes = {e["sha256"]: e["size"] for e in self.entries.values()}
+        total = sum(blob_sizes.values())
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            del self.entries[key]
+            sha256 = entry["sha256"]
+            if any(e["sha256"] == sha256 for e in self.entries.values()):
+                continue  # Blob still referenced by another entry
+            total -= blob_sizes[sha256]
+            for extension in ("pdf", "txt"):
+                path = self.blob_path(sha256, extension)
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class InspectionHistory:
+    """
+    Every inspection seen for each establishment, not just the latest.
+
+    Violations are stored once in a shared pool keyed by a hash of code +
+    description; an inspection only lists (hash, corrected_on_site) pairs, so
+    a violation repeated across years of inspections costs one entry.
+
+    Layout:
+      violations   {hash: {code, description, severity}}
+      restaurants  {slug: {name, inspections: {date: {star_rating, violations: [[hash, corrected]]}}}}
+
+    Each added inspection is also appended (fsynced) to a journal next to the
+    file, so a crash loses nothing; loading replays it and save() folds it in.
+    """
+
+    def __init__(self, path=INSPECTION_HISTORY_FILE):
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + ".journal.jsonl"
+        self._lock = threading.Lock()
+        self.data = self._load()
+        self._replay_journal()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"⚠️  Warning: Could not load inspection history: {e}")
+        return {"violations": {}, "restaurants": {}}
+
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from a crash
+                self._add(entry["name"], entry["date"], entry["inspection"])
+
+    def save(self):
+        """Write the whole history and drop the journal it now contains"""
+        with self._lock:
+            write_json_atomic(self.path, self.data)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+    @staticmethod
+    def violation_hash(violation):
+        key = f"{violation.get('code')}|{violation.get('description', '')}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def dates(self, establishment):
+        """Inspection dates already stored for an establishment"""
+        with self._lock:
+            entry = self.data["restaurants"].get(slugify(establishment), {})
+            return set(entry.get("inspections", {}))
+
+    def add(self, establishment, inspection_date, inspection_data):
+        """Store one inspection (replaces an earlier copy of the same date) and journal it"""
+        if not establishment or not inspection_date or not inspection_data:
+            return
+        inspection = {"star_rating": inspection_data.get('star_rating'),
+                      "violations": inspection_data.get('violations', [])}
+        line = json.dumps({"name": establishment, "date": inspection_date, "inspection": inspection},
+                          separators=(',', ':'))
+        with self._lock:
+            self._add(establishment, inspection_date, inspection)
+            try:
+                os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            except IOError as e:
+                print(f"⚠️  Warning: Could not journal inspection history: {e}")
+
+    def _add(self, establishment, inspection_date, inspection_data):
+        entry = self.data["restaurants"].setdefault(
+            slugify(establishment), {"name": establishment, "inspections": {}}
+        )
+        violations = []
+        for violation in inspection_data.get('violations', []):
+            violation_hash = self.violation_hash(violation)
+            self.data["violations"].setdefault(violation_hash, {
+                k: v for k, v in violation.items() if k in ('code', 'description', 'severity')
+            })
+            violations.append([violation_hash, bool(violation.get('corrected_on_site'))])
+        entry["inspections"][inspection_date] = {
+            "star_rating": inspection_data.get('star_rating'),
+            "violations": violations
+        }
+
+    def get(self, establishment):
+        """All stored inspections for an establishment, newest first, with violations expanded"""
+        with self._lock:
+            entry = self.data["restaurants"].get(slugify(establishment))
+            if not entry:
+                return []
+            inspections = []
+            for inspection_date, inspection in entry["inspections"].items():
+                inspections.append({
+                    "inspection_date": inspection_date,
+                    "star_rating": inspection["star_rating"],
+                    "violations": [{**self.data["violations"][violation_hash], "corrected_on_site": corrected}
+                                   for violation_hash, corrected in inspection["violations"]]
+                })
+        inspections.sort(key=lambda i: parse_inspection_date(i["inspection_date"]) or datetime.min, reverse=True)
+        return inspections
+
+
+class SqliteInspectionHistory:
+    """
+    InspectionHistory for the SQLite store (--sqlite --history). Older
+    inspections go into the store's inspections table next to the latest
+    ones, so SqliteRestaurantStore.inspection_history() sees every date, and
+    each is committed as it is added.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def save(self):
+        pass  # Every inspection was committed when it was added
+
+    def dates(self, establishment):
+        """Inspection dates already stored for an establishment"""
+        return self.store.inspection_dates(establishment)
+
+    def add(self, establishment, inspection_date, inspection_data):
+        """Store one inspection (replaces an earlier copy of the same date)"""
+        if not establishment or not inspection_date or not inspection_data:
+            return
+        self.store.add_inspection(establishment, inspection_date, inspection_data)
+
+    def get(self, establishment):
+        """All stored inspections for an establishment, newest first"""
+        return self.store.inspection_history(establishment)
+
+
+class CheckpointJournal:
+    """
+    Append-only checkpoint log for a scraping session (one JSON event per line).
+
+    Events:
+      session    - the restaurant list / mode the session was started with
+      restaurant - a scraped restaurant record (keyed by display name)
+      result     - the final status of a restaurant (mirrors SessionTracker)
+      listing    - a ZIP-sweep establishment that was stored
+      zipcode    - a ZIP code whose result pages were all walked, with their listings
+
+    Every event is flushed and fsynced, so a crash or Ctrl+C loses at most the
+    restaurant that was in flight. Resuming replays the log and skips
+    restaurants that already reached a final status, stored listings, and
+    ZIP codes whose listings were all stored.
+    """
+
+    # Statuses that count as done; failed restaurants are retried on resume
+    COMPLETED_STATUSES = {"success", "already_exists", "not_found"}
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.path = f"{SESSION_RESULTS_DIR}scraper_session_{session_id}.checkpoint.jsonl"
+        self._lock = threading.Lock()
+
+    def append(self, event_type, **fields):
+        """Append one event to the journal"""
+        event = {"type": event_type, "timestamp": datetime.now().isoformat(), **fields}
+        line = json.dumps(event, separators=(',', ':'))
+        try:
+            with self._lock:
+                os.makedirs(SESSION_RESULTS_DIR, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+        except IOError as e:
+            print(f"⚠️  Warning: Could not write checkpoint: {e}")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """
+        Replay the journal.
+        Returns dict with the last session header, scraped restaurants by display
+        name and record key, the final result entry for each completed restaurant,
+        the record keys of stored listings and the ZIP codes that were completed.
+        """
+        state = {"session": None, "restaurants": {}, "results": {}, "listings": set(), "zipcodes": set()}
+        walked_zipcodes = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from a crash
+                if event["type"] == "session":
+                    state["session"] = event
+                elif event["type"] == "restaurant":
+                    # ZIP sweeps can store several establishments under one name
+                    key = (event["name"], RestaurantStore.record_key(event["restaurant"]))
+                    state["restaurants"][key] = event["restaurant"]
+                elif event["type"] == "result":
+                    if event["entry"]["status"] in self.COMPLETED_STATUSES:
+                        state["results"][event["entry"]["name"]] = event["entry"]
+                    else:
+                        state["results"].pop(event["entry"]["name"], None)
+                elif event["type"] == "listing":
+                    state["listings"].add(RestaurantStore.record_key(event))
+                elif event["type"] == "zipcode":
+                    walked_zipcodes[event["zipcode"]] = [RestaurantStore.record_key({'name': name, 'address': address})
+                                                         for name, address in event["listings"]]
+        # A ZIP code is done once every establishment it listed was stored (failed ones are retried)
+        state["zipcodes"] = {zipcode for zipcode, keys in walked_zipcodes.items()
+                             if all(key in state["listings"] for key in keys)}
+        return state
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
 class SessionTracker:
     """Tracks results for the current scraping session"""
 
-    def __init__(self, session_id):
+    def __init__(self, session_id, journal=None):
         self.session_id = session_id
+        self.journal = journal
         self.start_time = datetime.now()
         self.results = {
             "successfully_scraped": [],
@@ -352,6 +1451,12 @@ class SessionTracker:
             "not_found": [],
             "scraping_failed": []
         }
+        self.wait_timings = {}
+        self.stage_samples = {}      # stage -> every span duration (seconds)
+        self.restaurant_timings = {}  # restaurant -> {stage: seconds}
+        self.retries = {}  # failure class -> retries scheduled
+        self.worker_failures = []  # pool workers that never attached to the browser
+        self._lock = threading.Lock()
 
     def add_result(self, restaurant_name, status, details=None):
         """Add a result to the session"""
@@ -364,14 +1469,111 @@ class SessionTracker:
         if details:
             result_entry.update(details)
 
-        if status == "success":
-            self.results["successfully_scraped"].append(result_entry)
-        elif status == "already_exists":
-            self.results["already_exists"].append(result_entry)
-        elif status == "not_found":
-            self.results["not_found"].append(result_entry)
-        elif status == "failed":
-            self.results["scraping_failed"].append(result_entry)
+        if self.journal:
+            self.journal.append("result", entry=result_entry)
+        self._store_result(result_entry)
+        metrics.RESTAURANTS.inc(status=status)
+
+    def _store_result(self, result_entry):
+        status = result_entry["status"]
+        with self._lock:
+            if status == "success":
+                self.results["successfully_scraped"].append(result_entry)
+            elif status == "already_exists":
+                self.results["already_exists"].append(result_entry)
+            elif status == "not_found":
+                self.results["not_found"].append(result_entry)
+            elif status == "failed":
+                self.results["scraping_failed"].append(result_entry)
+
+    def restore_results(self, result_entries):
+        """Re-add results replayed from a checkpoint journal"""
+        for result_entry in result_entries:
+            self._store_result(result_entry)
+
+    def record_retry(self, failure_class):
+        """Count a retry the scheduler queued"""
+        metrics.RETRIES.inc(failure_class=failure_class)
+        with self._lock:
+            self.retries[failure_class] = self.retries.get(failure_class, 0) + 1
+
+    def record_worker_failure(self, worker_id, error):
+        """Record a pool worker that could not attach to the browser (its share of the queue moves on)"""
+        with self._lock:
+            self.worker_failures.append({"worker": worker_id, "error": str(error),
+                                         "timestamp": datetime.now().isoformat()})
+
+    def record_wait(self, step, seconds, timed_out=False):
+        """Record how long a portal wait actually took"""
+        with self._lock:
+            stats = self.wait_timings.setdefault(step, {
+                "count": 0,
+                "total_seconds": 0.0,
+                "max_seconds": 0.0,
+                "timeouts": 0
+            })
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            if timed_out:
+                stats["timeouts"] += 1
+        metrics.PORTAL_WAIT_SECONDS.observe(seconds, step=step)
+        if timed_out:
+            metrics.PORTAL_TIMEOUTS.inc(step=step)
+        self.record_stage(step, seconds)
+
+    def record_stage(self, stage, seconds, restaurant_name=None):
+        """Record one stage duration, charged to restaurant_name or the restaurant being worked on"""
+        restaurant_name = restaurant_name or CURRENT_RESTAURANT.get()
+        metrics.STAGE_SECONDS.observe(seconds, stage=stage)
+        with self._lock:
+            self.stage_samples.setdefault(stage, []).append(seconds)
+            if restaurant_name:
+                stages = self.restaurant_timings.setdefault(restaurant_name, {})
+                stages[stage] = round(stages.get(stage, 0.0) + seconds, 3)
+
+    @contextmanager
+    def span(self, stage, restaurant_name=None):
+        """
+        Time a block as one stage. With restaurant_name, the block's nested
+        spans and portal waits are charged to that restaurant too.
+        """
+        token = CURRENT_RESTAURANT.set(restaurant_name) if restaurant_name else None
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.monotonic() - started, restaurant_name)
+            if token:
+                CURRENT_RESTAURANT.reset(token)
+
+    def get_stage_summary(self):
+        """p50/p95/max per stage, slowest total first"""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self.stage_samples.items()}
+        summary = {}
+        for stage, values in sorted(samples.items(), key=lambda item: -sum(item[1])):
+            summary[stage] = {
+                "count": len(values),
+                "total_seconds": round(sum(values), 3),
+                "p50_seconds": round(percentile(values, 0.5), 3),
+                "p95_seconds": round(percentile(values, 0.95), 3),
+                "max_seconds": round(values[-1], 3)
+            }
+        return summary
+
+    def get_wait_summary(self):
+        """Summarize wait timings per step (average vs worst case)"""
+        summary = {}
+        for step, stats in self.wait_timings.items():
+            summary[step] = {
+                "count": stats["count"],
+                "avg_seconds": round(stats["total_seconds"] / stats["count"], 3),
+                "max_seconds": round(stats["max_seconds"], 3),
+                "timeout_seconds": WAIT_TIMEOUTS.get(step, 0) / 1000,
+                "timeouts": stats["timeouts"]
+            }
+        return summary
 
     def get_summary(self):
         """Generate session summary statistics"""
@@ -406,7 +1608,12 @@ class SessionTracker:
             "duration_seconds": int(duration_seconds),
             "restaurants_attempted": sum(len(v) for v in self.results.values()),
             "results": self.results,
-            "summary": self.get_summary()
+            "summary": self.get_summary(),
+            "retries": self.retries,
+            "worker_failures": self.worker_failures,
+            "wait_timings": self.get_wait_summary(),
+            "stage_timings": self.get_stage_summary(),
+            "restaurant_timings": self.restaurant_timings
         }
 
         filename = f"{SESSION_RESULTS_DIR}scraper_session_{self.session_id}.json"
@@ -419,388 +1626,382 @@ class SessionTracker:
             return None
 
 
-class BaltimoreZipScraper:
-    def __init__(self, output_file=None):
-        self.restaurants = []
-        self.playwright = None
-        self.browser = None
-        self.page = None
-        self.download_dir = Path("../logs/downloads")
-        self.download_dir.mkdir(exist_ok=True, parents=True)
-
-        # Set output file (can be overridden for test mode)
-        self.output_file = output_file if output_file else OUTPUT_FILE_JSON
-
-        # Initialize analytics and session tracking
-        self.analytics_tracker = AnalyticsTracker()
-        self.session_tracker = SessionTracker(session_id=datetime.now().strftime("%Y%m%d_%H%M%S"))
-
-    def start(self):
-        print("Starting browser...")
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=False,
-            downloads_path=str(self.download_dir)
-        )
-        context = self.browser.new_context(accept_downloads=True)
-        self.page = context.new_page()
-        self.page.set_default_timeout(30000)
-        print("✓ Browser ready!\n")
+def classify_failure(error):
+    """Failure class of an exception (see RETRY_LIMITS); 'other' is never retried"""
+    message = str(error).lower()
+    if isinstance(error, PlaywrightTimeoutError) or 'timeout' in message or 'net::' in message:
+        return 'timeout'
+    if 'pdf' in message:
+        return 'pdf_error'
+    return 'other'
+
+
+class RetryScheduler:
+    """
+    Re-queues restaurants whose scrape failed for a transient reason.
+    Attempt n waits RETRY_BASE_DELAY * 2^(n-1) seconds (capped at
+    RETRY_MAX_DELAY, with jitter so workers don't retry in lockstep).
+    Only the session's target restaurants are retried, each failure class
+    at most RETRY_LIMITS times, and no more than budget retries overall.
+    """
+
+    def __init__(self, budget=DEFAULT_RETRY_BUDGET, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        self.budget = budget
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.targets = set()
+        self.attempts = {}  # (restaurant name, failure class) -> retries scheduled so far
+        self.pending = {}   # restaurant name -> (due, failure class, reason)
+        self.closed = True
+        self._lock = threading.Lock()
+
+    def open(self, restaurants):
+        """Start accepting retries for these restaurant names"""
+        with self._lock:
+            self.targets = set(restaurants or [])
+            self.closed = False
+
+    def schedule(self, restaurant_name, failure_class, reason):
+        """Queue a retry; False when the failure should be recorded instead"""
+        with self._lock:
+            if restaurant_name in self.pending:
+                return True  # Already coming back (e.g. a second failing result row)
+            attempt = self.attempts.get((restaurant_name, failure_class), 0) + 1
+            if (self.closed or restaurant_name not in self.targets or self.budget <= 0
+                    or attempt > RETRY_LIMITS.get(failure_class, 0)):
+                return False
+            self.budget -= 1
+            self.attempts[(restaurant_name, failure_class)] = attempt
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+            due = time.monotonic() + random.uniform(delay / 2, delay)
+            self.pending[restaurant_name] = (due, failure_class, reason)
+            return True
+
+    def next_round(self):
+        """Sleep until the earliest retry is due, then take every due retry ([] when none are pending)"""
+        with self._lock:
+            if not self.pending:
+                return []
+            first_due = min(due for due, _, _ in self.pending.values())
+        time.sleep(max(0.0, first_due - time.monotonic()))
+        with self._lock:
+            now = time.monotonic()
+            names = [name for name, (due, _, _) in self.pending.items() if due <= now]
+            for name in names:
+                del self.pending[name]
+        return names
 
     def close(self):
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
-
-    def restaurant_exists_in_db(self, restaurant_name):
-        """Check if restaurant already exists in baltimore_restaurants.json
-        (checks both display name and portal name)"""
-        if not os.path.exists(OUTPUT_FILE_JSON):
+        """Stop accepting retries; returns (name, failure class, reason) for any left pending"""
+        with self._lock:
+            self.closed = True
+            leftovers = [(name, failure_class, reason)
+                         for name, (_, failure_class, reason) in self.pending.items()]
+            self.pending.clear()
+        return leftovers
+
+
+class PortalGovernor:
+    """
+    Paces every request to the portal, shared by all workers.
+
+    A token bucket caps the request rate (rate per second, bursts of up to
+    burst requests; rate 0 means no cap). On top of that an AIMD limit caps how many requests are
+    in flight: a slow (over slow_seconds) or failed response halves it, and
+    each run of `limit` healthy responses raises it by one again, up to
+    max_concurrency.
+    """
+
+    def __init__(self, rate=PORTAL_RATE_PER_WORKER, burst=PORTAL_BURST, max_concurrency=1,
+                 slow_seconds=PORTAL_SLOW_SECONDS):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max(1, max_concurrency)
+        self.slow_seconds = slow_seconds
+        self.limit = self.max_concurrency
+        self.tokens = float(burst)
+        self.refilled = time.monotonic()
+        self.in_flight = 0
+        self.healthy_streak = 0
+        self.last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def _try_acquire(self):
+        """Take a slot and a token: 0 on success, else seconds to wait (None = until a release)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        if self.in_flight >= self.limit:
+            return None
+        if self.rate:
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+            self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def acquire(self):
+        """Block until a request may go out"""
+        with self._condition:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    return
+                self._condition.wait(wait)
+
+    async def acquire_async(self):
+        """acquire() for the async scraper, sleeping on the event loop instead of blocking it"""
+        while True:
+            with self._condition:
+                wait = self._try_acquire()
+            if wait == 0:
+                return
+            await asyncio.sleep(wait if wait is not None else 0.05)
+
+    def release(self, seconds, ok=True):
+        """Give the slot back and adapt the concurrency limit to how the request went"""
+        with self._condition:
+            self.in_flight -= 1
+            previous = self.limit
+            if not ok or seconds > self.slow_seconds:
+                self.healthy_streak = 0
+                # One decrease per slow window, so a burst of bad responses doesn't floor the limit
+                now = time.monotonic()
+                if now - self.last_decrease > self.slow_seconds:
+                    self.limit = max(1, self.limit // 2)
+                    self.last_decrease = now
+            else:
+                self.healthy_streak += 1
+                if self.healthy_streak >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self.healthy_streak = 0
+            self._condition.notify_all()
+        if self.limit < previous:
+            print(f"  🐢 Portal slowing down: {previous} → {self.limit} requests in flight")
+        elif self.limit > previous:
+            print(f"  ⚡ Portal recovered: {previous} → {self.limit} requests in flight")
+
+    @contextmanager
+    def request(self):
+        """Hold a request slot for the block; an exception counts as a failed request"""
+        self.acquire()
+        started = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.release(time.monotonic() - started, ok)
+
+    @asynccontextmanager
+    async def request_async(self):
+        """request() for the async scraper"""
+        await self.acquire_async()
+        started = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.release(time.monotonic() - started, ok)
+
+
+class PortalWaiter:
+    """
+    Event-driven waits for the portal. Each wait blocks only until the element,
+    navigation or download actually shows up (bounded by WAIT_TIMEOUTS), and
+    reports the real duration to the session tracker. Waits that send a request
+    (navigations, downloads) go through the governor first.
+    """
+
+    def __init__(self, session_tracker, timeouts=None, governor=None):
+        self.session_tracker = session_tracker
+        self.timeouts = {**WAIT_TIMEOUTS, **(timeouts or {})}
+        self.governor = governor or PortalGovernor()
+
+    def _record(self, step, started, timed_out=False):
+        self.session_tracker.record_wait(step, time.monotonic() - started, timed_out)
+
+    @contextmanager
+    def _request(self, step):
+        """Send one governed portal request and record how long it took"""
+        with self.governor.request():
+            started = time.monotonic()
+            try:
+                yield
+            except PlaywrightTimeoutError:
+                self._record(step, started, timed_out=True)
+                raise
+            self._record(step, started)
+
+    def timeout_error(self, step):
+        """The error callers raise when a wait returned False, instead of reading a page that never loaded"""
+        return PlaywrightTimeoutError(f"Timed out waiting for {step} ({self.timeouts[step] // 1000}s)")
+
+    def for_selector(self, page, step, selector, state='attached'):
+        """Wait for a selector; returns False on timeout instead of raising"""
+        started = time.monotonic()
+        try:
+            page.wait_for_selector(selector, state=state, timeout=self.timeouts[step])
+        except PlaywrightTimeoutError:
+            self._record(step, started, timed_out=True)
             return False
+        self._record(step, started)
+        return True
 
+    def for_navigation(self, page, step, action):
+        """Run an action that navigates and wait for the new document; returns False on timeout"""
         try:
-            with open(OUTPUT_FILE_JSON, 'r') as f:
-                existing_restaurants = json.load(f)
-
-            # Normalize for case-insensitive comparison
-            norm_name = restaurant_name.strip().lower()
-            portal_name = self.get_portal_name(restaurant_name).strip().lower()
-
-            for restaurant in existing_restaurants:
-                db_name = restaurant.get('name', '').strip().lower()
-                # Check both display name and portal name
-                if db_name == norm_name or db_name == portal_name:
-                    return True
+            with self._request(step):
+                with page.expect_navigation(wait_until='domcontentloaded', timeout=self.timeouts[step]):
+                    action()
+        except PlaywrightTimeoutError:
             return False
-        except (json.JSONDecodeError, IOError):
+        return True
+
+    def for_goto(self, page, step, url):
+        """Open a URL directly and wait for the document; returns False on timeout"""
+        try:
+            with self._request(step):
+                page.goto(url, wait_until='domcontentloaded', timeout=self.timeouts[step])
+        except PlaywrightTimeoutError:
             return False
+        return True
 
-    def get_restaurant_from_db(self, restaurant_name):
-        """Retrieve existing restaurant data from baltimore_restaurants.json"""
-        if not os.path.exists(OUTPUT_FILE_JSON):
-            return None
+    def for_download(self, page, action):
+        """Run an action that triggers a download and return the Download"""
+        with self._request('download'):
+            with page.expect_download(timeout=self.timeouts['download']) as download_info:
+                action()
+            return download_info.value
 
+    def for_request(self, page, url):
+        """GET a URL through the page's browser context (same cookies); returns the body, or None if not OK"""
         try:
-            with open(OUTPUT_FILE_JSON, 'r') as f:
-                existing_restaurants = json.load(f)
-
-            # Normalize for case-insensitive comparison
-            norm_name = restaurant_name.strip().lower()
-            for restaurant in existing_restaurants:
-                if restaurant.get('name', '').strip().lower() == norm_name:
-                    return restaurant
-            return None
-        except (json.JSONDecodeError, IOError):
+            with self._request('download'):
+                response = page.context.request.get(url, timeout=self.timeouts['download'])
+        except PlaywrightTimeoutError:
             return None
+        return response.body() if response.ok else None
 
-    def print_analytics_summary(self):
-        """Print user-friendly analytics summary at end of session"""
-        print("\n" + "=" * 60)
-        print("📊 SCRAPING SESSION SUMMARY")
-        print("=" * 60)
+    def go_back(self, page):
+        """Navigate back and wait for the previous document; returns False on timeout"""
+        try:
+            with self._request('back'):
+                page.go_back(wait_until='domcontentloaded', timeout=self.timeouts['back'])
+        except PlaywrightTimeoutError:
+            return False
+        return True
 
-        # Session summary
-        summary = self.session_tracker.get_summary()
-        duration = (datetime.now() - self.session_tracker.start_time).total_seconds()
-        minutes = int(duration // 60)
-        seconds = int(duration % 60)
 
-        print(f"Session ID: {self.session_tracker.session_id}")
-        print(f"Duration: {minutes}m {seconds}s\n")
+# Landmarks in inspection report text
+INSPECTION_DATE_PATTERN = re.compile(r'(\d{1,2}/\d{1,2}/\d{4})')
+ZIPCODE_PATTERN = re.compile(r'\b(\d{5})(?:-\d{4})?\b')
+OBSERVATIONS_PATTERN = re.compile(r'OBSERVATIONS AND CORRECTIVE ACTIONS', re.IGNORECASE)
+SIGNATURE_PATTERN = re.compile(r'Person-in-charge\s*\(Signature\)', re.IGNORECASE)
 
-        print("Results:")
-        print(f"  ✓ Successfully scraped: {summary['success_count']}")
-        print(f"  ⏭️  Already in database: {summary['already_exists_count']}")
-        print(f"  ❌ Not found in portal: {summary['not_found_count']}")
-        print(f"  ⚠️  Scraping failed: {summary['failed_count']}")
-        print(f"\nSuccess Rate: {summary['success_rate']}")
 
-        # Analytics insights
-        print("\n" + "=" * 60)
-        print("📈 ANALYTICS INSIGHTS")
-        print("=" * 60)
+def iter_pdf_pages(pdf):
+    """
+    Yield the text of each non-empty PDF page, reading pages only as they're consumed.
+    pdf is a file path or the PDF's bytes (direct fetch, parsed in memory).
+    """
+    with (io.BytesIO(pdf) if isinstance(pdf, bytes) else open(pdf, 'rb')) as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            text = page.extract_text()
+            if text:
+                yield text
 
-        demand = self.analytics_tracker.get_demand_analysis()
 
-        # Top searched restaurants
-        if demand['top_searched']:
-            print("Top Searched Restaurants (All Time):")
-            for i, restaurant in enumerate(demand['top_searched'][:5], 1):
-                print(f"  {i}. {restaurant['name']} - {restaurant['search_count']} searches")
+class PdfTextBackend(ABC):
+    """Interface for turning an inspection PDF into text"""
 
-        # High demand restaurants not in database
-        if demand['not_found']:
-            print("\nHigh-Demand Restaurants NOT in Database:")
-            for i, restaurant in enumerate(demand['not_found'][:5], 1):
-                print(f"  {i}. {restaurant['name']} - {restaurant['search_count']} searches")
-            print("\n💡 Consider adding these restaurants to your scraping list!")
+    name = None
 
-        print("=" * 60)
+    @abstractmethod
+    def extract_text(self, pdf):
+        """Return the report text (raise on unreadable PDFs)"""
 
-    def get_portal_name(self, restaurant_name):
-        """Get the portal search name from the map"""
-        return RESTAURANT_NAME_MAP.get(restaurant_name, restaurant_name)
 
-    def get_display_name(self, restaurant_name):
-        """Get the display name from a portal name (reverse lookup)"""
-        # Check if this is a portal name (value in the map)
-        for display_name, portal_name in RESTAURANT_NAME_MAP.items():
-            if portal_name.lower() == restaurant_name.lower():
-                return display_name
-        # If not found in map, return the original name
-        return restaurant_name
-
-    def search_by_restaurant_name(self, restaurant_name):
-        print(f"🍽️  Searching restaurant: {restaurant_name}")
+class PyPDF2Backend(PdfTextBackend):
+    """Every page through PyPDF2 (the reference extraction)"""
 
-        # Record search attempt in analytics (using display name)
-        self.analytics_tracker.record_search(restaurant_name)
+    name = 'pypdf2'
 
-        # Get the portal name for searching
-        portal_name = self.get_portal_name(restaurant_name)
+    def extract_text(self, pdf):
+        return "".join(iter_pdf_pages(pdf))
 
-        if portal_name != restaurant_name:
-            print(f"  🔄 Using portal alias: '{portal_name}'")
 
-        try:
-            self.page.goto(BASE_URL, wait_until='domcontentloaded', timeout=60000)
-            time.sleep(3)  # Increased wait
+class AnchoredPyPDF2Backend(PdfTextBackend):
+    """
+    PyPDF2, but stops reading pages once the 'Person-in-charge (Signature)'
+    anchor has been seen. Everything parse_violations uses comes before it.
+    """
 
-            # Try to find the restaurant name input field
-            # Similar to zip code, the field name might vary
-            name_input = self.page.query_selector('input[name="ctl00$FeaturedContent$txtEstablishment"]')
-            if not name_input:
-                name_input = self.page.query_selector('input[type="text"][name*="Establishment"]')
-            if not name_input:
-                name_input = self.page.query_selector('input[type="text"][name*="name"]')
-            if not name_input:
-                print("  ❌ Cannot find restaurant name input")
-                # Record as failure
-                self.analytics_tracker.record_failure(restaurant_name, "Cannot find restaurant name input field")
-                self.session_tracker.add_result(restaurant_name, "failed", {"error": "Cannot find restaurant name input field"})
-                return
-
-            # Use portal name for the search
-            name_input.fill(portal_name)
-            time.sleep(0.5)
-            search_button = self.page.query_selector('input[name="ctl00$FeaturedContent$Button1"]')
-            if search_button:
-                search_button.click()
-            else:
-                name_input.press('Enter')
-
-            print("  ⏳ Waiting for results...")
-            time.sleep(5)  # Increased wait for results
-            # Parse using the DISPLAY name (this is what goes in JSON)
-            self.parse_restaurant_list_by_name(restaurant_name)
-        except Exception as e:
-            print(f"  ❌ ERROR: {e}")
-            # Record as failure
-            self.analytics_tracker.record_failure(restaurant_name, str(e))
-            self.session_tracker.add_result(restaurant_name, "failed", {"error": str(e)})
-
-    def search_by_zipcode(self, zipcode):
-        print(f"📍 Searching zip code: {zipcode}")
-        try:
-            self.page.goto(BASE_URL, wait_until='domcontentloaded', timeout=60000)
-            time.sleep(3)  # Increased wait
-
-            zip_input = self.page.query_selector('input[name="ctl00$FeaturedContent$txtcode"]')
-            if not zip_input:
-                zip_input = self.page.query_selector('input[type="text"][name*="zip"]')
-            if not zip_input:
-                print("  ❌ Cannot find zip code input")
-                return
-
-            zip_input.fill(zipcode)
-            time.sleep(0.5)
-            search_button = self.page.query_selector('input[name="ctl00$FeaturedContent$Button1"]')
-            if search_button:
-                search_button.click()
-            else:
-                zip_input.press('Enter')
-
-            print("  ⏳ Waiting for results...")
-            time.sleep(5)  # Increased wait for slow zip codes
-            self.parse_restaurant_list(zipcode)
-        except Exception as e:
-            print(f"  ❌ ERROR: {e}")
-
-    def parse_restaurant_list_by_name(self, restaurant_name):
-        print("  📋 Parsing restaurant results...")
-        try:
-            rows = self.page.query_selector_all('table tr')
-            if len(rows) <= 1:
-                print("  ℹ️ No restaurant found")
-                # Record as not found
-                self.analytics_tracker.record_not_found(restaurant_name)
-                self.session_tracker.add_result(restaurant_name, "not_found", {"error": "No restaurant found in portal"})
-                return
-
-            # For name search, usually get exact match, so process first result
-            for i, row in enumerate(rows[1:]):
-                try:
-                    cells = row.query_selector_all('td')
-                    if len(cells) < 2:
-                        continue
-                    name = cells[0].inner_text().strip()
-                    address = cells[1].inner_text().strip() if len(cells) > 1 else ''
-
-                    # Try to extract zipcode from address field
-                    zipcode_match = re.search(r'\b(\d{5})\b', address)
-                    zipcode = zipcode_match.group(1) if zipcode_match else None
+    name = 'anchored'
 
-                    # If not in address, check if there's a separate zipcode column
-                    if not zipcode and len(cells) > 2:
-                        for cell in cells[2:]:
-                            cell_text = cell.inner_text().strip()
-                            zipcode_match = re.search(r'\b(\d{5})\b', cell_text)
-                            if zipcode_match:
-                                zipcode = zipcode_match.group(1)
-                                break
+    def extract_text(self, pdf):
+        page_texts = []
+        for text in iter_pdf_pages(pdf):
+            page_texts.append(text)
+            # Include the previous page in case the anchor straddles a page break
+            if SIGNATURE_PATTERN.search("".join(page_texts[-2:])):
+                break
+        return "".join(page_texts)
+
+
+class StreamingPyPDF2Backend(PdfTextBackend):
+    """
+    Reads pages lazily and stops as soon as everything extract_from_text
+    looks at has been captured: the inspection date, the ZIP code and the
+    OBSERVATIONS AND CORRECTIVE ACTIONS ... Person-in-charge (Signature)
+    window. Gives the same extracted data as 'pypdf2'; reports without
+    those landmarks are simply read to the end.
+    """
+
+    name = 'streaming'
+
+    def extract_text(self, pdf):
+        text = ""
+        have_date = have_zipcode = False
+        for page_text in iter_pdf_pages(pdf):
+            text += page_text
+            have_date = have_date or bool(INSPECTION_DATE_PATTERN.search(text))
+            if not have_zipcode:
+                # A ZIP at the very end of the text could still run into the next page's digits
+                match = ZIPCODE_PATTERN.search(text)
+                have_zipcode = bool(match) and match.end() < len(text)
+            if have_date and have_zipcode and self.observations_complete(text):
+                break
+        return text
 
-                    inspection_link = cells[-1].query_selector('a') if len(cells) > 2 else None
-                    if not inspection_link:
-                        inspection_link = row.query_selector('a')
+    @staticmethod
+    def observations_complete(text):
+        """True once the OBSERVATIONS header and the signature line after it are both in text"""
+        header = OBSERVATIONS_PATTERN.search(text)
+        return bool(header) and bool(SIGNATURE_PATTERN.search(text, header.end() + 1))
 
-                    if inspection_link:
-                        print(f"    ✓ Found: {name}")
-                        inspection_link.click()
-                        time.sleep(2)
-                        inspection_data = self.get_latest_inspection()
 
-                        # Try to get ZIP code from inspection data (PDF/detail page)
-                        if not zipcode and inspection_data:
-                            zipcode = inspection_data.get('zipcode')
+PDF_TEXT_BACKENDS = {backend.name: backend for backend in
+                     (PyPDF2Backend, AnchoredPyPDF2Backend, StreamingPyPDF2Backend)}
 
-                        # Last resort: try current page text
-                        if not zipcode:
-                            page_text = self.page.inner_text('body')
-                            zipcode_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', page_text)
-                            if zipcode_match:
-                                zipcode = zipcode_match.group(1)
 
-                        if inspection_data:
-                            # Remove zipcode from inspection_data to avoid duplication
-                            inspection_data.pop('zipcode', None)
-                            restaurant = {
-                                'id': len(self.restaurants) + 1,
-                                'name': name,
-                                'address': address,
-                                'zipcode': zipcode if zipcode else 'Unknown',
-                                'city': 'Baltimore',
-                                'state': 'MD',
-                                **inspection_data
-                            }
-                            self.restaurants.append(restaurant)
-                            violations_count = len(inspection_data.get('violations', []))
-                            star_rating = inspection_data.get('star_rating', 0)
-                            print(f"        ✓ Star Rating: {star_rating} stars")
-                            print(f"        ✓ Violations: {violations_count}")
-                            if zipcode:
-                                print(f"        ✓ ZIP: {zipcode}")
-
-                            # Record success with violation details
-                            self.analytics_tracker.record_success(
-                                restaurant_name,
-                                violations_count,
-                                star_rating=star_rating,
-                                violations=inspection_data.get('violations', [])
-                            )
-                            self.session_tracker.add_result(restaurant_name, "success", {"violations_found": violations_count})
-                        else:
-                            # Inspection data extraction failed
-                            self.analytics_tracker.record_failure(restaurant_name, "Inspection data extraction failed")
-                            self.session_tracker.add_result(restaurant_name, "failed", {"error": "Inspection data extraction failed"})
-
-                        self.page.go_back()
-                        time.sleep(1)
-                        break  # Only process first match for name search
-                except Exception as e:
-                    print(f"    ⚠️ Error on row {i}: {e}")
-                    # Record row processing failure
-                    self.analytics_tracker.record_failure(restaurant_name, f"Row processing error: {str(e)}")
-                    self.session_tracker.add_result(restaurant_name, "failed", {"error": f"Row processing error: {str(e)}"})
-                    continue
-        except Exception as e:
-            print(f"  ❌ ERROR parsing list: {e}")
-            # Record parsing failure
-            self.analytics_tracker.record_failure(restaurant_name, f"Parse list error: {str(e)}")
-            self.session_tracker.add_result(restaurant_name, "failed", {"error": f"Parse list error: {str(e)}"})
+def get_pdf_backend(name):
+    """Instantiate a PDF text backend by name"""
+    if name not in PDF_TEXT_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}' (choose from {', '.join(PDF_TEXT_BACKENDS)})")
+    return PDF_TEXT_BACKENDS[name]()
 
-    def parse_restaurant_list(self, zipcode):
-        print("  📋 Parsing restaurant list...")
-        try:
-            rows = self.page.query_selector_all('table tr')
-            if len(rows) <= 1:
-                print("  ℹ️ No restaurants found")
-                return
 
-            count = 0
-            for i, row in enumerate(rows[1:]):
-                try:
-                    cells = row.query_selector_all('td')
-                    if len(cells) < 2:
-                        continue
-                    name = cells[0].inner_text().strip()
-                    address = cells[1].inner_text().strip() if len(cells) > 1 else ''
-                    inspection_link = cells[-1].query_selector('a') if len(cells) > 2 else None
-                    if not inspection_link:
-                        inspection_link = row.query_selector('a')
-                    if inspection_link:
-                        count += 1
-                        print(f"    [{count}] {name}")
-                        inspection_link.click()
-                        time.sleep(2)
-                        inspection_data = self.get_latest_inspection()
-                        if inspection_data:
-                            restaurant = {
-                                'id':len(self.restaurants) + 1,
-                                'name': name,
-                                'address': address,
-                                'zipcode': zipcode,
-                                'city': 'Baltimore',
-                                'state': 'MD',
-                                **inspection_data
-                            }
-                            self.restaurants.append(restaurant)
-                            print(f"        ✓ Violations: {len(inspection_data.get('violations', []))}")
-                        self.page.go_back()
-                        time.sleep(1)
-                    if count >= 10:
-                        break
-                except Exception as e:
-                    print(f"    ⚠️ Error on row {i}: {e}")
-                    continue
-            print(f"  ✓ Found {count} restaurants in {zipcode}\n")
-        except Exception as e:
-            print(f"  ❌ ERROR parsing list: {e}")
+class InspectionParser:
+    """
+    Turns inspection report text into violations and a star rating.
+    Holds no browser or file state, so it can run in worker processes.
+    """
 
-    def get_latest_inspection(self):
-        try:
-            time.sleep(1)
-            date_links = self.page.query_selector_all('table tr a')
-            if not date_links:
-                print("        ⚠️ No inspection dates found")
-                return None
-            with self.page.expect_download() as download_info:
-                date_links[0].click()
-                time.sleep(2)
-            try:
-                download = download_info.value
-                pdf_path = download.path()
-                inspection_data = self.extract_from_pdf(pdf_path)
-                os.remove(pdf_path)  # Clean up
-            except Exception as e:
-                print(f"        ⚠️ PDF error: {e}")
-                inspection_data = self.extract_inspection_data()
-            self.page.go_back()
-            time.sleep(0.5)
-            return inspection_data
-        except Exception as e:
-            print(f"        ⚠️ Error: {e}")
-            return None
+    # How PDFs are turned into text (override per instance)
+    pdf_backend = PyPDF2Backend()
 
     # Violation severity categories (based on real Baltimore inspection data)
     SEVERE_VIOLATIONS = {
@@ -907,7 +2108,19 @@ class BaltimoreZipScraper:
         else:
             return 1  # 6+ violations = serious problems
 
-    def extract_from_pdf(self, pdf_path):
+    def read_pdf_text(self, pdf):
+        """Extract the text of an inspection PDF, given its path or bytes ('' if it can't be read)"""
+        try:
+            return self.pdf_backend.extract_text(pdf)
+        except Exception as e:
+            print(f"        ⚠️ PDF extraction error: {e}")
+            return ""
+
+    def extract_from_pdf(self, pdf):
+        return self.extract_from_text(self.read_pdf_text(pdf))
+
+    def extract_from_text(self, text):
+        """Extract date, ZIP, violations and star rating from inspection report text"""
         data = {
             'star_rating': None,
             'last_inspection': None,
@@ -916,20 +2129,16 @@ class BaltimoreZipScraper:
         }
 
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = "".join([p.extract_text() for p in pdf_reader.pages if p.extract_text()])
-
             if not text:
                 return data
 
             # Extract date
-            date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', text)
+            date_match = INSPECTION_DATE_PATTERN.search(text)
             if date_match:
                 data['last_inspection'] = date_match.group(1)
 
             # Extract ZIP code
-            zipcode_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', text)
+            zipcode_match = ZIPCODE_PATTERN.search(text)
             if zipcode_match:
                 data['zipcode'] = zipcode_match.group(1)
 
@@ -944,298 +2153,1225 @@ class BaltimoreZipScraper:
 
         return data
 
-    def extract_inspection_data(self):
-        data = {
-            'star_rating': None,
-            'last_inspection': None,
-            'violations': [],
-            'zipcode': None
-        }
-        try:
-            page_text = self.page.inner_text('body')
-            date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', page_text)
-            if date_match:
-                data['last_inspection'] = date_match.group(1)
-
-            # Extract ZIP code
-            zipcode_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', page_text)
-            if zipcode_match:
-                data['zipcode'] = zipcode_match.group(1)
-
-            data['violations'] = self.parse_violations(page_text)
-
-            # Calculate star rating based on violation severity
-            data['star_rating'] = self.calculate_star_rating(data['violations'])
-        except Exception as e:
-            print(f"        ⚠️ Error: {e}")
-        return data
+    # Precompiled patterns used by parse_violations
+    OBSERVATIONS_HEADER = OBSERVATIONS_PATTERN
+    OBSERVATIONS_SHORT_HEADER = re.compile(r'OBSERVATIONS', re.IGNORECASE)
+    SIGNATURE_LINE = SIGNATURE_PATTERN
+    INSPECTOR_LINE = re.compile(r'Inspector \(Print\)', re.IGNORECASE)
+    JUNK_LINE = re.compile('|'.join(re.escape(keyword) for keyword in [
+        'Item', 'Number', 'Corrected', 'Violations cited', 'Repeat',
+        'must be corrected', 'frame.Repeat', 'within the specified'
+    ]))
+    VIOLATION_START = re.compile(r'(\d+)\s*(.+)')
+    CORRECTED_MARKER = re.compile(r'Corrected On Site:\s*\[.*?\]', re.IGNORECASE)
+
+    def find_observations_section(self, text):
+        """
+        Return the text of the OBSERVATIONS section, or None.
+        Tries, in order: the full header up to the signature line, the full
+        header up to 'Inspector (Print)', then a bare OBSERVATIONS header up to
+        the signature line.
+        """
+        header = self.OBSERVATIONS_HEADER.search(text)
+        if header:
+            for end_pattern in (self.SIGNATURE_LINE, self.INSPECTOR_LINE):
+                end = end_pattern.search(text, header.end() + 1)
+                if end:
+                    return text[header.end():end.start()]
+
+        header = self.OBSERVATIONS_SHORT_HEADER.search(text)
+        if header:
+            end = self.SIGNATURE_LINE.search(text, header.end() + 1)
+            if end:
+                return text[header.end():end.start()]
+        return None
 
     def parse_violations(self, text):
         """
         BULLETPROOF violation parser.
         Handles: long violations, short violations, multiple violations, no violations.
+
+        Single pass over the OBSERVATIONS section: each line either starts a
+        violation ("19 The ..." / "19The ..."), continues the current one, or is
+        skipped as junk. Violations are grouped by code as they are closed.
         """
-        violations = []
-        
         # Step 1: Find the OBSERVATIONS section
-        # Use lookahead to capture everything until the signature line
-        patterns = [
-            r'OBSERVATIONS AND CORRECTIVE ACTIONS(.+?)(?=Person-in-charge\s*\(Signature\))',
-            r'OBSERVATIONS AND CORRECTIVE ACTIONS(.+?)(?=Inspector \(Print\))',
-            r'OBSERVATIONS(.+?)(?=Person-in-charge\s*\(Signature\))',
-        ]
-        
-        obs_section = None
-        for pattern in patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                obs_section = match.group(1)
-                break
-        
+        obs_section = self.find_observations_section(text)
         if not obs_section:
             return []  # No observations section found
-        
-        # Step 2: Split into lines and parse
-        lines = obs_section.split('\n')
-        current_violation = None
-        
-        for line in lines:
+
+        # Step 2: Walk the lines, grouping violations by code as we go
+        # code -> {'descriptions': [...], 'corrected_on_site': bool} (first occurrence wins the flag)
+        violations_by_code = {}
+        current_code = None
+        current_parts = None
+        current_corrected = False
+
+        def close_current():
+            group = violations_by_code.get(current_code)
+            if group is None:
+                violations_by_code[current_code] = {
+                    'descriptions': [' '.join(current_parts)],
+                    'corrected_on_site': current_corrected
+                }
+            else:
+                group['descriptions'].append(' '.join(current_parts))
+
+        for line in obs_section.split('\n'):
             line = line.strip()
-            
-            # Skip very short or empty lines
-            if len(line) < 5:
-                continue
-            
-            # Skip known junk headers
-            junk_keywords = ['Item', 'Number', 'Corrected', 'Violations cited', 
-                           'Repeat', 'must be corrected', 'frame.Repeat', 
-                           'within the specified']
-            if any(junk in line for junk in junk_keywords):
+
+            # Skip very short lines and known junk headers
+            if len(line) < 5 or self.JUNK_LINE.search(line):
                 continue
-            
-            # Check if this line starts a NEW violation (number at start)
-            # Handles both "19 The" and "19The" (with or without space)
-            violation_start = re.match(r'^(\d+)\s*(.+)', line)
-            
+
+            violation_start = self.VIOLATION_START.match(line)
             if violation_start:
-                # Save the previous violation if it exists
-                if current_violation:
-                    violations.append(current_violation)
-                
-                # Start new violation
-                code = int(violation_start.group(1))
+                if current_parts is not None:
+                    close_current()
+
+                # Only start a violation if the description looks real
+                # (not just "Violations" or "Item")
                 description = violation_start.group(2).strip()
-                
-                # Only create a violation if the description looks real
-                # Real violations have meaningful text, not just "Violations" or "Item"
                 if len(description) > 10:
-                    current_violation = {
-                        'code': code,
-                        'description': description,
-                        'severity': self.get_violation_severity(code),
-                        'corrected_on_site': False
-                    }
+                    current_code = int(violation_start.group(1))
+                    current_parts = [description]
+                    current_corrected = False
                 else:
-                    current_violation = None
-            
-            elif current_violation:
-                # This line continues the current violation
-                
-                # Check for "Corrected On Site" marker
+                    current_parts = None
+
+            elif current_parts is not None:
+                # "Corrected On Site" marker line: record the flag, don't keep the text
                 if 'Corrected On Site:' in line:
-                    if '[X]' in line or '[x]' in line.lower():
-                        current_violation['corrected_on_site'] = True
-                    continue  # Don't add this line to description
-                
-                # Append continuation text
-                current_violation['description'] += ' ' + line
-        
-        # Don't forget the last violation
-        if current_violation:
-            violations.append(current_violation)
-        
-        # Step 3: Combine violations with the same code
-        # Group by code and merge descriptions with numbering
-        violations_by_code = {}
-        for v in violations:
-            code = v['code']
-            if code not in violations_by_code:
-                violations_by_code[code] = {
-                    'code': code,
-                    'descriptions': [v['description']],
-                    'severity': v['severity'],
-                    'corrected_on_site': v['corrected_on_site']
-                }
-            else:
-                # Append to existing violation with same code
-                violations_by_code[code]['descriptions'].append(v['description'])
+                    if '[x]' in line.lower():
+                        current_corrected = True
+                    continue
+                current_parts.append(line)
 
-        # Convert back to list with numbered descriptions
+        if current_parts is not None:
+            close_current()
+
+        # Step 3: Build output, numbering repeated codes and cleaning descriptions
         violations = []
-        for code, data in violations_by_code.items():
-            if len(data['descriptions']) == 1:
-                # Single violation - no numbering needed
-                description = data['descriptions'][0]
+        for code, group in violations_by_code.items():
+            descriptions = group['descriptions']
+            if len(descriptions) == 1:
+                description = descriptions[0]
             else:
-                # Multiple violations - number them
-                description = ' '.join([
-                    f"({i+1}) {desc}"
-                    for i, desc in enumerate(data['descriptions'])
-                ])
+                description = ' '.join(f"({i+1}) {desc}" for i, desc in enumerate(descriptions))
+
+            # Remove "Corrected On Site: []" markers and extra whitespace
+            description = ' '.join(self.CORRECTED_MARKER.sub('', description).split())
+
+            # "No violations observed" is not an actual violation
+            if 'no violations observed' in description.lower():
+                continue
 
-            violation_dict = {
+            # Truncate if absurdly long (keep 1500 chars for LLM)
+            if len(description) > 1500:
+                description = description[:1500] + '...'
+
+            violation = {
                 'code': code,
                 'description': description,
-                'corrected_on_site': data['corrected_on_site']
+                'corrected_on_site': group['corrected_on_site']
             }
 
             # Only add severity if it's defined (not None)
-            if data['severity'] is not None:
-                violation_dict['severity'] = data['severity']
-
-            violations.append(violation_dict)
-        
-        # Step 4: Clean up all violations
-        for violation in violations:
-            # Remove "Corrected On Site: []" markers
-            violation['description'] = re.sub(
-                r'Corrected On Site:\s*\[.*?\]', 
-                '', 
-                violation['description'], 
-                flags=re.IGNORECASE
-            )
-            
-            # Remove extra whitespace
-            violation['description'] = ' '.join(violation['description'].split())
-            
-            # Check if this is a "no violations" entry
-            if 'no violations observed' in violation['description'].lower():
-                # Don't include "no violations" as actual violations
-                violations.remove(violation)
-                continue
-            
-            # Truncate if absurdly long (keep 1500 chars for LLM)
-            if len(violation['description']) > 1500:
-                violation['description'] = violation['description'][:1500] + '...'
-        
-        return violations
+            severity = self.get_violation_severity(code)
+            if severity is not None:
+                violation['severity'] = severity
 
-    def save_to_json(self):
-        if not self.restaurants:
-            print("\n⚠️ No restaurants found!")
-            return
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.restaurants, f, indent=2)
-        print(f"\n✅ Saved {len(self.restaurants)} restaurants to {self.output_file}")
+            violations.append(violation)
 
-        total_violations = sum(len(r.get('violations', [])) for r in self.restaurants)
-        print(f"📊 Total violations found: {total_violations}")
+        return violations
 
-    def get_scraping_mode(self):
-        """Prompt user to select scraping mode"""
-        print("\n" + "="*50)
-        print("Baltimore Restaurant Scraper")
-        print("="*50)
-        print("\nSelect scraping mode:")
-        print("  1. Run full scraper (all restaurants)")
-        print("  2. Re-scrape only 'not_found' restaurants")
-        print("  3. Exit")
 
-        while True:
-            choice = input("\nEnter your choice (1-3): ").strip()
-            if choice in ['1', '2', '3']:
-                return choice
-            print("Invalid choice. Please enter 1, 2, or 3.")
+def parse_inspection_pdf(pdf, pdf_backend=DEFAULT_PDF_BACKEND):
+    """
+    Process-pool job: extract text, parse violations and rate one inspection PDF.
+    Returns (text, inspection_data).
+    """
+    parser = InspectionParser()
+    parser.pdf_backend = get_pdf_backend(pdf_backend)
+    text = parser.read_pdf_text(pdf)
+    return text, parser.extract_from_text(text)
+
+
+def reparse_inspection_file(path, pdf_backend=DEFAULT_PDF_BACKEND):
+    """
+    Process-pool job for offline re-parsing: re-run extraction, violation
+    parsing and star rating for one archived PDF or extracted-text file.
+    Returns (path, text, inspection_data).
+    """
+    parser = InspectionParser()
+    parser.pdf_backend = get_pdf_backend(pdf_backend)
+    if path.endswith('.txt'):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    else:
+        text = parser.read_pdf_text(path)
+    return path, text, parser.extract_from_text(text)
+
+
+class PdfParsePipeline:
+    """
+    Parses downloaded inspection PDFs in a process pool.
+
+    The browser side only queues PDF paths and keeps navigating; text
+    extraction, violation parsing and star rating run in parallel across
+    cores. When a PDF is done, its text goes into the PDF cache, the file is
+    removed, and on_parsed(inspection_data) feeds the result back into the
+    restaurant list and analytics (inspection_data is None if parsing failed).
+    """
+
+    def __init__(self, pdf_cache, workers, pdf_backend=DEFAULT_PDF_BACKEND):
+        self.pdf_cache = pdf_cache
+        self.pdf_backend = pdf_backend
+        # Spawned, not forked: by now the browser driver's threads are running in this process
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.closed = False
+
+    def submit(self, pdf, establishment, inspection_date, on_parsed):
+        """Queue a PDF (downloaded file path or fetched bytes) for parsing"""
+        metrics.PDF_BYTES.observe(len(pdf) if isinstance(pdf, bytes) else os.path.getsize(pdf))
+        future = self.executor.submit(parse_inspection_pdf, pdf, self.pdf_backend)
+        future.add_done_callback(
+            lambda f: self._finish(f, pdf, establishment, inspection_date, on_parsed)
+        )
 
-    def get_not_found_restaurants(self):
-        """
-        Returns list of restaurant names with 'not_found' status from analytics.
-        """
-        not_found_restaurants = []
+    def _finish(self, future, pdf, establishment, inspection_date, on_parsed):
+        inspection_data = None
+        try:
+            text, inspection_data = future.result()
+            self.pdf_cache.put(establishment, inspection_date, pdf, text)
+        except Exception as e:
+            print(f"        ⚠️ PDF parse error ({establishment}): {e}")
+        finally:
+            if isinstance(pdf, str) and os.path.exists(pdf):
+                os.remove(pdf)  # Clean up
 
-        # Read analytics data
-        analytics_data = self.analytics_tracker.analytics.get('restaurant_searches', {})
+        try:
+            on_parsed(inspection_data)
+        except Exception as e:
+            print(f"        ⚠️ Error recording parsed PDF ({establishment}): {e}")
 
-        # Filter restaurants with 'not_found' status
-        for restaurant_name, data in analytics_data.items():
-            if data.get('status') == 'not_found':
-                # Verify restaurant still exists in RESTAURANT_NAME_MAP
-                if restaurant_name in RESTAURANT_NAME_MAP:
-                    not_found_restaurants.append(restaurant_name)
+    def shutdown(self):
+        """Wait for every queued PDF to be parsed and recorded"""
+        self.executor.shutdown(wait=True)
+        self.closed = True
 
-        return sorted(not_found_restaurants)  # Sort for consistent display
 
-    def run(self, restaurants=None, zip_codes=None, mode='1'):
-        """
-        Run scraper by restaurant names OR zip codes.
-        Priority: restaurants > zip_codes
-        mode: '1' for full scraper, '2' for selective re-scraping
-        """
-        if restaurants is None and zip_codes is None:
-            restaurants = list(RESTAURANT_NAME_MAP.keys())[:5]  # Default to first 5 restaurants
+class BaltimoreZipScraper(InspectionParser):
+    def __init__(self, output_file=None, workers=DEFAULT_WORKERS, session_id=None, refresh=False,
+                 parse_workers=DEFAULT_PARSE_WORKERS, pdf_backend=DEFAULT_PDF_BACKEND,
+                 analytics_storage='json', store='json', history=False, two_phase=False,
+                 direct_pdf=False, retry_budget=DEFAULT_RETRY_BUDGET, portal_rate=None,
+                 base_url=BASE_URL, headless=False):
+        self.label = "Scraper"  # how error messages name this scraper (pool workers: "Worker N")
+        self.restaurants = []
+        self._restaurants_lock = threading.Lock()
+        self.playwright = None
+        self.browser = None
+        self.page = None
+        # Worker pool: where the workers reach this browser over CDP, and the page that identifies it
+        self.cdp_port = None
+        self.cdp_target_id = None
+        self.download_dir = Path("../logs/downloads")
+        self.download_dir.mkdir(exist_ok=True, parents=True)
 
-        # Store mode and original restaurant list for summary
-        self.scraping_mode = mode
-        self.target_restaurants = restaurants.copy() if restaurants else []
+        # Set output file (can be overridden for test mode)
+        self.output_file = output_file if output_file else OUTPUT_FILE_JSON
 
-        print("="*60)
-        print("🦀 Baltimore Restaurant Health Scraper")
-        print("="*60)
+        # Number of concurrent browser pages (capped at MAX_WORKERS)
+        self.workers = max(1, min(int(workers), MAX_WORKERS))
 
-        # Sync analytics with current restaurant map (removes old restaurants from analytics)
-        self.analytics_tracker.sync_with_restaurant_map(RESTAURANT_NAME_MAP)
+        # Freshness mode: revisit restaurants already in the database and only
+        # download a PDF when the portal lists a newer inspection
+        self.refresh = refresh
 
-        # Increment session count
-        self.analytics_tracker.increment_session_count()
+        # Existing restaurants of output_file, indexed for O(1) lookups (scraped ones are upserted as they come in)
+        self.restaurant_store = (SqliteRestaurantStore(self.output_file) if store == 'sqlite'
+                                 else RestaurantStore(self.output_file))
 
-        self.start()
-        try:
-            if restaurants:
-                print(f"📋 Searching {len(restaurants)} restaurants by name...\n")
-                for restaurant_name in restaurants:
-                    # Check if restaurant already exists in database
-                    if self.restaurant_exists_in_db(restaurant_name):
-                        print(f"🍽️  Restaurant: {restaurant_name}")
-                        print("  ⏭️  Already in database, skipping...\n")
-                        self.session_tracker.add_result(restaurant_name, "already_exists", {"reason": "Already in database with data"})
-                        # Still record the search attempt
-                        self.analytics_tracker.record_search(restaurant_name)
-                    else:
-                        # Proceed with scraping
-                        self.search_by_restaurant_name(restaurant_name)
-                    time.sleep(1)
-            elif zip_codes:
-                print(f"📍 Searching {len(zip_codes)} ZIP codes...\n")
-                for zipcode in zip_codes:
-                    self.search_by_zipcode(zipcode)
-                    time.sleep(1)
+        # Inspection PDFs already downloaded (served without a new download)
+        self.pdf_cache = PdfCache()
 
-            # Save scraped data
-            self.save_to_json()
+        # How inspection PDFs are turned into text
+        self.pdf_backend = get_pdf_backend(pdf_backend)
 
-            # Save session report
-            session_file = self.session_tracker.save_session_report()
-            if session_file:
-                print(f"\n📄 Session report saved: {session_file}")
+        # Optional process pool that parses PDFs while the browser moves on
+        self.parse_pipeline = (PdfParsePipeline(self.pdf_cache, parse_workers, pdf_backend)
+                               if parse_workers > 0 else None)
 
-            # Save analytics
-            self.analytics_tracker.save_analytics()
-            print(f"📊 Analytics updated: {ANALYTICS_FILE}")
+        # History mode: keep every listed inspection, not only the latest (in the
+        # SQLite store's inspections table when there is one)
+        self.inspection_history = None
+        if history:
+            self.inspection_history = (SqliteInspectionHistory(self.restaurant_store) if store == 'sqlite'
+                                       else InspectionHistory())
 
-        except KeyboardInterrupt:
-            print("\n⏸️ Interrupted")
-            self.save_to_json()
-            # Still save session and analytics on interrupt
-            self.session_tracker.save_session_report()
-            self.analytics_tracker.save_analytics()
-        except Exception as e:
+        # Initialize analytics and session tracking
+        self.analytics_tracker = AnalyticsTracker(storage=analytics_storage)
+        # Passing an existing session_id continues that session's checkpoint journal
+        session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.journal = CheckpointJournal(session_id)
+        self.session_tracker = SessionTracker(session_id=session_id, journal=self.journal)
+        self.completed_restaurants = set()
+        self.completed_zipcodes = set()
+        # ZIP sweep: establishments (normalized name + address) already claimed this session
+        self.swept_listings = set()
+        # Two-phase crawl: harvest inspection page URLs first, fetch them afterwards
+        self.two_phase = two_phase
+        self.crawl_targets = []
+        # Fetch inspection PDFs over HTTP with the browser's cookies instead of downloading them
+        self.direct_pdf = direct_pdf
+        # Portal to scrape (a local replay_portal.py stand-in for offline benchmarks)
+        self.base_url = base_url
+        self.headless = headless
+        self.retry_scheduler = RetryScheduler(retry_budget)
+        if portal_rate is None:
+            portal_rate = PORTAL_RATE_PER_WORKER * self.workers
+        self.waiter = PortalWaiter(self.session_tracker,
+                                   governor=PortalGovernor(portal_rate, max_concurrency=self.workers))
+
+    def start(self):
+        print("Starting browser...")
+        self.playwright = sync_playwright().start()
+        launch_args = []
+        if self.workers > 1:
+            # Expose the browser over CDP so worker threads can attach to it
+            self.cdp_port = free_local_port()
+            launch_args.append(f"--remote-debugging-port={self.cdp_port}")
+        self.browser = self.playwright.chromium.launch(
+            headless=self.headless,
+            downloads_path=str(self.download_dir),
+            args=launch_args
+        )
+        context = self.browser.new_context(accept_downloads=True)
+        self.page = context.new_page()
+        self.page.set_default_timeout(30000)
+        if self.workers > 1:
+            # Workers check for this page to know they attached to this browser, not another one on the port
+            target_info = context.new_cdp_session(self.page).send("Target.getTargetInfo")
+            self.cdp_target_id = target_info["targetInfo"]["targetId"]
+        print("✓ Browser ready!\n")
+
+    def close(self):
+        if self.browser:
+            self.browser.close()
+        if self.playwright:
+            self.playwright.stop()
+
+    def restaurant_exists_in_db(self, restaurant_name):
+        """Check if restaurant already exists in baltimore_restaurants.json
+        (checks both display name and portal name)"""
+        return self.restaurant_store.exists(restaurant_name)
+
+    def get_restaurant_from_db(self, restaurant_name):
+        """Retrieve existing restaurant data from baltimore_restaurants.json"""
+        return self.restaurant_store.get(restaurant_name)
+
+    def add_restaurant(self, restaurant, display_name=None):
+        """Upsert a scraped restaurant into the store and the session results (thread-safe)"""
+        restaurant, created = self.restaurant_store.upsert(restaurant, display_name)
+        self._track_restaurant(restaurant)
+        self.journal.append("restaurant", name=display_name or restaurant['name'], restaurant=restaurant)
+        return restaurant
+
+    def _track_restaurant(self, restaurant):
+        """Add a stored record to this session's results, replacing an older copy of it"""
+        with self._restaurants_lock:
+            for i, r in enumerate(self.restaurants):
+                if r is restaurant or r.get('id') == restaurant.get('id'):
+                    self.restaurants[i] = restaurant
+                    return
+            self.restaurants.append(restaurant)
+
+    def resume(self):
+        """
+        Restore a previous session from its checkpoint journal.
+        Returns the session header (restaurants, zip_codes, mode) or None.
+        """
+        if not self.journal.exists():
+            return None
+
+        state = self.journal.load()
+        for (display_name, _), restaurant in state["restaurants"].items():
+            restaurant, created = self.restaurant_store.upsert(restaurant, display_name)
+            self._track_restaurant(restaurant)
+        self.session_tracker.restore_results(state["results"].values())
+        self.completed_restaurants = set(state["results"])
+        # Stored listings are claimed up front, so a resumed ZIP sweep skips them
+        self.swept_listings.update(state["listings"])
+        self.completed_zipcodes = state["zipcodes"]
+
+        print(f"♻️  Restored session {self.session_tracker.session_id}: "
+              f"{len(self.completed_restaurants)} restaurants done, {len(self.completed_zipcodes)} ZIP codes done, "
+              f"{len(self.restaurants)} scraped")
+        return state["session"]
+
+    def print_analytics_summary(self):
+        """Print user-friendly analytics summary at end of session"""
+        print("\n" + "=" * 60)
+        print("📊 SCRAPING SESSION SUMMARY")
+        print("=" * 60)
+
+        # Session summary
+        summary = self.session_tracker.get_summary()
+        duration = (datetime.now() - self.session_tracker.start_time).total_seconds()
+        minutes = int(duration // 60)
+        seconds = int(duration % 60)
+
+        print(f"Session ID: {self.session_tracker.session_id}")
+        print(f"Duration: {minutes}m {seconds}s\n")
+
+        print("Results:")
+        print(f"  ✓ Successfully scraped: {summary['success_count']}")
+        print(f"  ⏭️  Already in database: {summary['already_exists_count']}")
+        print(f"  ❌ Not found in portal: {summary['not_found_count']}")
+        print(f"  ⚠️  Scraping failed: {summary['failed_count']}")
+        print(f"\nSuccess Rate: {summary['success_rate']}")
+        for failure in self.session_tracker.worker_failures:
+            print(f"  ❌ Worker {failure['worker']} never attached to the browser: {failure['error']}")
+
+        # How long portal waits really took, against their worst-case timeout
+        wait_summary = self.session_tracker.get_wait_summary()
+        if wait_summary:
+            print("\nPortal waits (avg / max / timeout):")
+            for step, stats in wait_summary.items():
+                print(f"  {step}: {stats['avg_seconds']}s / {stats['max_seconds']}s / "
+                      f"{stats['timeout_seconds']:.0f}s ({stats['timeouts']} timed out)")
+
+        # Where the time went, slowest stage (by total) first
+        stage_summary = self.session_tracker.get_stage_summary()
+        if stage_summary:
+            print("\nTime per stage (p50 / p95 / max, total):")
+            for stage, stats in stage_summary.items():
+                print(f"  {stage}: {stats['p50_seconds']}s / {stats['p95_seconds']}s / "
+                      f"{stats['max_seconds']}s, {stats['total_seconds']}s over {stats['count']}")
+
+        # Analytics insights
+        print("\n" + "=" * 60)
+        print("📈 ANALYTICS INSIGHTS")
+        print("=" * 60)
+
+        demand = self.analytics_tracker.get_demand_analysis()
+
+        # Top searched restaurants
+        if demand['top_searched']:
+            print("Top Searched Restaurants (All Time):")
+            for i, restaurant in enumerate(demand['top_searched'][:5], 1):
+                print(f"  {i}. {restaurant['name']} - {restaurant['search_count']} searches")
+
+        # High demand restaurants not in database
+        if demand['not_found']:
+            print("\nHigh-Demand Restaurants NOT in Database:")
+            for i, restaurant in enumerate(demand['not_found'][:5], 1):
+                print(f"  {i}. {restaurant['name']} - {restaurant['search_count']} searches")
+            print("\n💡 Consider adding these restaurants to your scraping list!")
+
+        print("=" * 60)
+
+    def get_portal_name(self, restaurant_name):
+        """Get the portal search name from the map"""
+        return RESTAURANT_NAME_MAP.get(restaurant_name, restaurant_name)
+
+    def get_display_name(self, restaurant_name):
+        """Get the display name from a portal name (reverse lookup)"""
+        # If it isn't a portal name (value in the map), return the original name
+        return DISPLAY_NAME_BY_PORTAL_NAME.get(restaurant_name.lower(), restaurant_name)
+
+    def search_by_restaurant_name(self, restaurant_name, known_inspection=None, harvest=False, count_search=True):
+        print(f"🍽️  Searching restaurant: {restaurant_name}")
+
+        # Record search attempt in analytics (using display name); retries don't count again
+        if count_search:
+            self.analytics_tracker.record_search(restaurant_name)
+
+        # Get the portal name for searching
+        portal_name = self.get_portal_name(restaurant_name)
+
+        if portal_name != restaurant_name:
+            print(f"  🔄 Using portal alias: '{portal_name}'")
+
+        try:
+            if not self.waiter.for_goto(self.page, 'portal_load', self.base_url):
+                raise self.waiter.timeout_error('portal_load')
+            if not self.waiter.for_selector(self.page, 'search_form', 'input[type="text"]'):
+                raise self.waiter.timeout_error('search_form')
+
+            # Try to find the restaurant name input field
+            # Similar to zip code, the field name might vary
+            name_input = self.page.query_selector('input[name="ctl00$FeaturedContent$txtEstablishment"]')
+            if not name_input:
+                name_input = self.page.query_selector('input[type="text"][name*="Establishment"]')
+            if not name_input:
+                name_input = self.page.query_selector('input[type="text"][name*="name"]')
+            if not name_input:
+                print("  ❌ Cannot find restaurant name input")
+                self._record_failure(restaurant_name, "Cannot find restaurant name input field", 'missing_input')
+                return
+
+            # Use portal name for the search
+            name_input.fill(portal_name)
+            search_button = self.page.query_selector('input[name="ctl00$FeaturedContent$Button1"]')
+
+            print("  ⏳ Waiting for results...")
+            submit = search_button.click if search_button else lambda: name_input.press('Enter')
+            if not self.waiter.for_navigation(self.page, 'results', submit):
+                raise self.waiter.timeout_error('results')
+            # Parse using the DISPLAY name (this is what goes in JSON)
+            self.parse_restaurant_list_by_name(restaurant_name, known_inspection, harvest)
+        except Exception as e:
+            print(f"  ❌ ERROR: {e}")
+            self._record_failure(restaurant_name, str(e), classify_failure(e))
+
+    def _record_failure(self, restaurant_name, reason, failure_class=None):
+        """
+        Record a failed (or not found) search under the display name, unless the
+        retry scheduler re-queues it for another attempt later in the session
+        """
+        failure_class = failure_class or classify_failure(reason)
+        if self.retry_scheduler.schedule(restaurant_name, failure_class, reason):
+            print(f"  🔁 Will retry {restaurant_name} ({failure_class})")
+            self.session_tracker.record_retry(failure_class)
+            return
+        if failure_class == 'empty_results':
+            self.analytics_tracker.record_not_found(restaurant_name)
+            self.session_tracker.add_result(restaurant_name, "not_found", {"error": reason})
+        else:
+            self.analytics_tracker.record_failure(restaurant_name, reason)
+            self.session_tracker.add_result(restaurant_name, "failed",
+                                            {"error": reason, "failure_class": failure_class})
+
+    def search_by_zipcode(self, zipcode, harvest=False):
+        """
+        ZIP sweep: walk every establishment listed for a ZIP code, page by page.
+        With harvest, establishments with a plain link are queued for the second
+        phase of a two-phase crawl instead of being clicked into.
+        """
+        print(f"📍 Searching zip code: {zipcode}")
+        try:
+            if not self.open_zipcode_results(zipcode):
+                return
+            page_number = 1
+            listings = []
+            while True:
+                # Read the pager before walking the rows, which navigates away and back
+                more_pages = self.has_results_page(page_number + 1)
+                listings += self.parse_restaurant_list(zipcode, page_number, harvest)
+                if not more_pages:
+                    self.journal.append("zipcode", zipcode=zipcode, listings=listings)
+                    break
+                page_number += 1
+                # Usually still on the results page; otherwise search again and page forward
+                if not (self.go_to_results_page(page_number) or self.open_zipcode_results(zipcode, page_number)):
+                    break
+            print(f"  ✓ Walked {len(listings)} listings on {page_number} page(s) in {zipcode}\n")
+        except Exception as e:
+            print(f"  ❌ ERROR: {e}")
+
+    def submit_zipcode_search(self, zipcode):
+        """Load the portal and search a ZIP code; True once the results page is showing"""
+        if not self.waiter.for_goto(self.page, 'portal_load', self.base_url):
+            raise self.waiter.timeout_error('portal_load')
+        if not self.waiter.for_selector(self.page, 'search_form', 'input[type="text"]'):
+            raise self.waiter.timeout_error('search_form')
+
+        zip_input = self.page.query_selector('input[name="ctl00$FeaturedContent$txtcode"]')
+        if not zip_input:
+            zip_input = self.page.query_selector('input[type="text"][name*="zip"]')
+        if not zip_input:
+            print("  ❌ Cannot find zip code input")
+            return False
+
+        zip_input.fill(zipcode)
+        search_button = self.page.query_selector('input[name="ctl00$FeaturedContent$Button1"]')
+
+        print("  ⏳ Waiting for results...")
+        submit = search_button.click if search_button else lambda: zip_input.press('Enter')
+        if not self.waiter.for_navigation(self.page, 'results', submit):
+            raise self.waiter.timeout_error('results')
+        return True
+
+    def open_zipcode_results(self, zipcode, page_number=1):
+        """Search a ZIP code and page forward to page_number; False if that page doesn't exist"""
+        if not self.submit_zipcode_search(zipcode):
+            return False
+        return page_number == 1 or self.go_to_results_page(page_number)
+
+    def pager_links(self):
+        """(text, link) for each link in the results pager"""
+        return [(link.inner_text().strip(), link) for link in self.page.query_selector_all(PAGER_LINK_SELECTOR)]
+
+    def has_results_page(self, page_number):
+        """True if the pager can reach page_number (directly or via its '...' link)"""
+        links = self.pager_links()
+        numbers = [int(text) for text, _ in links if text.isdigit()]
+        return str(page_number) in (text for text, _ in links) or bool(
+            any(text == '...' for text, _ in links) and numbers and page_number > max(numbers)
+        )
+
+    def go_to_results_page(self, page_number):
+        """Follow pager links to page_number, jumping ahead through '...' blocks as needed"""
+        for _ in range(page_number):
+            links = self.pager_links()
+            target = next((link for text, link in links if text == str(page_number)), None)
+            if target:
+                return self.waiter.for_navigation(self.page, 'results', target.click)
+            # Pagers show a window of page numbers; the last '...' opens the next window
+            numbers = [int(text) for text, _ in links if text.isdigit()]
+            more = [link for text, link in links if text == '...']
+            if not more or not numbers or page_number < max(numbers):
+                return False
+            if not self.waiter.for_navigation(self.page, 'results', more[-1].click):
+                return False
+        return False
+
+    def result_rows(self):
+        """Establishment rows on the current results page (pager rows excluded)"""
+        rows = []
+        for row in self.page.query_selector_all('table tr'):
+            cells = row.query_selector_all('td')
+            if len(cells) < 2 or row.query_selector(PAGER_LINK_SELECTOR) or not row.query_selector('a'):
+                continue
+            rows.append((row, cells))
+        return rows
+
+    def claim_listing(self, name, address):
+        """Reserve an establishment for this session; False if a ZIP scraped earlier already listed it"""
+        key = RestaurantStore.record_key({'name': name, 'address': address})
+        with self._restaurants_lock:
+            if key in self.swept_listings:
+                return False
+            self.swept_listings.add(key)
+            return True
+
+    def parse_restaurant_list_by_name(self, restaurant_name, known_inspection=None, harvest=False):
+        print("  📋 Parsing restaurant results...")
+        try:
+            rows = self.page.query_selector_all('table tr')
+            if len(rows) <= 1:
+                print("  ℹ️ No restaurant found")
+                self._record_failure(restaurant_name, "No restaurant found in portal", 'empty_results')
+                return
+
+            # For name search, usually get exact match, so process first result
+            for i, row in enumerate(rows[1:]):
+                try:
+                    cells = row.query_selector_all('td')
+                    if len(cells) < 2:
+                        continue
+                    name = cells[0].inner_text().strip()
+                    address = cells[1].inner_text().strip() if len(cells) > 1 else ''
+
+                    # Try to extract zipcode from address field
+                    zipcode_match = re.search(r'\b(\d{5})\b', address)
+                    zipcode = zipcode_match.group(1) if zipcode_match else None
+
+                    # If not in address, check if there's a separate zipcode column
+                    if not zipcode and len(cells) > 2:
+                        for cell in cells[2:]:
+                            cell_text = cell.inner_text().strip()
+                            zipcode_match = re.search(r'\b(\d{5})\b', cell_text)
+                            if zipcode_match:
+                                zipcode = zipcode_match.group(1)
+                                break
+
+                    inspection_link = cells[-1].query_selector('a') if len(cells) > 2 else None
+                    if not inspection_link:
+                        inspection_link = row.query_selector('a')
+
+                    if inspection_link:
+                        print(f"    ✓ Found: {name}")
+                        url = self.direct_url(inspection_link) if harvest else None
+                        if url:
+                            # Two-phase crawl: fetch the inspection page later, in bulk
+                            self.queue_target(url=url, name=name, address=address, zipcode=zipcode,
+                                              restaurant_name=restaurant_name, known_inspection=known_inspection)
+                            break
+                        if not self.waiter.for_navigation(self.page, 'inspection_page', inspection_link.click):
+                            raise self.waiter.timeout_error('inspection_page')
+
+                        on_parsed = None
+                        if self.parse_pipeline:
+                            # Read the fallback ZIP now; the page will have moved on by
+                            # the time the parse pool hands the inspection back
+                            page_zipcode = None if zipcode else self.find_page_zipcode()
+                            on_parsed = lambda data, zipcode=zipcode, page_zipcode=page_zipcode: self.record_inspection(
+                                restaurant_name, name, address,
+                                zipcode or (data or {}).get('zipcode') or page_zipcode, data
+                            )
+
+                        inspection_data = self.get_latest_inspection(name, known_inspection, on_parsed)
+                        if inspection_data in (INSPECTION_UNCHANGED, PARSE_QUEUED):
+                            if inspection_data == INSPECTION_UNCHANGED:
+                                self.record_unchanged(restaurant_name, known_inspection)
+                            self.waiter.go_back(self.page)
+                            break
+
+                        # Try to get ZIP code from inspection data (PDF/detail page)
+                        if not zipcode and inspection_data:
+                            zipcode = inspection_data.get('zipcode')
+
+                        # Last resort: try current page text
+                        if not zipcode:
+                            zipcode = self.find_page_zipcode()
+
+                        self.record_inspection(restaurant_name, name, address, zipcode, inspection_data)
+
+                        self.waiter.go_back(self.page)
+                        break  # Only process first match for name search
+                except Exception as e:
+                    print(f"    ⚠️ Error on row {i}: {e}")
+                    self._record_failure(restaurant_name, f"Row processing error: {str(e)}", classify_failure(e))
+                    continue
+        except Exception as e:
+            print(f"  ❌ ERROR parsing list: {e}")
+            self._record_failure(restaurant_name, f"Parse list error: {str(e)}", classify_failure(e))
+
+    def find_page_zipcode(self):
+        """First ZIP code in the current page text, or None"""
+        page_text = self.page.inner_text('body')
+        zipcode_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', page_text)
+        return zipcode_match.group(1) if zipcode_match else None
+
+    def record_unchanged(self, restaurant_name, known_inspection):
+        """Record a freshness check that found no newer inspection"""
+        print(f"        ✓ No new inspection since {known_inspection}, keeping stored data")
+        self.session_tracker.add_result(restaurant_name, "already_exists",
+                                        {"reason": f"Inspection unchanged since {known_inspection}"})
+
+    def record_inspection(self, restaurant_name, name, address, zipcode, inspection_data):
+        """Store a scraped inspection and record the outcome under the display name"""
+        if inspection_data:
+            # Remove zipcode from inspection_data to avoid duplication
+            inspection_data.pop('zipcode', None)
+            if self.inspection_history:
+                self.inspection_history.add(name, inspection_data.get('last_inspection'), inspection_data)
+            restaurant = {
+                'name': name,
+                'address': address,
+                'zipcode': zipcode if zipcode else 'Unknown',
+                'city': 'Baltimore',
+                'state': 'MD',
+                **inspection_data
+            }
+            self.add_restaurant(restaurant, display_name=restaurant_name)
+            violations_count = len(inspection_data.get('violations', []))
+            star_rating = inspection_data.get('star_rating', 0)
+            print(f"        ✓ Star Rating: {star_rating} stars")
+            print(f"        ✓ Violations: {violations_count}")
+            if zipcode:
+                print(f"        ✓ ZIP: {zipcode}")
+
+            # Record success with violation details
+            self.analytics_tracker.record_success(
+                restaurant_name,
+                violations_count,
+                star_rating=star_rating,
+                violations=inspection_data.get('violations', [])
+            )
+            self.session_tracker.add_result(restaurant_name, "success", {"violations_found": violations_count})
+        else:
+            # Inspection data extraction failed
+            self._record_failure(restaurant_name, "Inspection data extraction failed", 'pdf_error')
+
+    def parse_restaurant_list(self, zipcode, page_number=1, harvest=False):
+        """Scrape every establishment on the current results page; returns the (name, address) listings"""
+        print(f"  📋 Parsing restaurant list (page {page_number})...")
+        try:
+            listings = [(cells[0].inner_text().strip(), cells[1].inner_text().strip())
+                        for row, cells in self.result_rows()]
+            if not listings:
+                print("  ℹ️ No restaurants found")
+                return []
+
+            for i, (name, address) in enumerate(listings):
+                if not self.claim_listing(name, address):
+                    print(f"    ⏭️  {name} (already listed under another ZIP or stored before resuming)")
+                    continue
+                try:
+                    # Detail pages don't always navigate back cleanly; reload the results if needed
+                    rows = self.result_rows()
+                    if len(rows) != len(listings) or rows[0][1][0].inner_text().strip() != listings[0][0]:
+                        if not self.open_zipcode_results(zipcode, page_number):
+                            print("  ⚠️ Could not return to the results page")
+                            break
+                        rows = self.result_rows()
+
+                    row, cells = rows[i]
+                    inspection_link = cells[-1].query_selector('a') if len(cells) > 2 else None
+                    if not inspection_link:
+                        inspection_link = row.query_selector('a')
+                    url = self.direct_url(inspection_link) if harvest else None
+                    if url:
+                        self.queue_target(url=url, name=name, address=address, zipcode=zipcode)
+                        continue
+                    with self.session_tracker.span('restaurant', name):
+                        print(f"    [{page_number}.{i + 1}] {name}")
+                        if not self.waiter.for_navigation(self.page, 'inspection_page', inspection_link.click):
+                            raise self.waiter.timeout_error('inspection_page')
+                        # Returns to the results page itself once the inspection is read
+                        on_parsed = partial(self.record_listing, name, address, zipcode)
+                        inspection_data = self.get_latest_inspection(name, on_parsed=on_parsed)
+                        if inspection_data != PARSE_QUEUED:
+                            self.record_listing(name, address, zipcode, inspection_data)
+                except Exception as e:
+                    print(f"    ⚠️ Error on row {i}: {e}")
+                    continue
+            return listings
+        except Exception as e:
+            print(f"  ❌ ERROR parsing list: {e}")
+            return []
+
+    def record_listing(self, name, address, zipcode, inspection_data):
+        """Store the latest inspection of an establishment found by a ZIP sweep"""
+        if not inspection_data:
+            self.session_tracker.add_result(name, "failed",
+                                            {"error": "Inspection data extraction failed", "zipcode": zipcode})
+            return
+        # The swept ZIP, not whatever 5-digit number the report text matched
+        inspection_data.pop('zipcode', None)
+        if self.inspection_history:
+            self.inspection_history.add(name, inspection_data.get('last_inspection'), inspection_data)
+        restaurant = {
+            'name': name,
+            'address': address,
+            'zipcode': zipcode,
+            'city': 'Baltimore',
+            'state': 'MD',
+            **inspection_data
+        }
+        self.add_restaurant(restaurant)
+        self.journal.append("listing", name=name, address=address)
+        violations_count = len(inspection_data.get('violations', []))
+        self.session_tracker.add_result(name, "success", {"violations_found": violations_count, "zipcode": zipcode})
+        print(f"        ✓ Violations: {violations_count}")
+
+    def direct_url(self, link):
+        """Absolute URL a result link points at, or None for postback/script links that need a click"""
+        href = (link.get_attribute('href') or '').strip()
+        if not href or href.startswith(('javascript:', '#')):
+            return None
+        return urljoin(self.page.url, href)
+
+    def queue_target(self, **target):
+        """Two-phase crawl: remember an inspection page to fetch in phase 2"""
+        with self._restaurants_lock:
+            self.crawl_targets.append(target)
+
+    def harvest_restaurant(self, restaurant_name):
+        """Phase 1 for a name: search it and queue its inspection page (same skip rules as scrape_restaurant)"""
+        stored = self.get_restaurant_from_db(restaurant_name)
+        if stored and not self.refresh:
+            self.scrape_restaurant(restaurant_name)
+            return
+        known_inspection = stored.get('last_inspection') if stored else None
+        with self.session_tracker.span('harvest', restaurant_name):
+            self.search_by_restaurant_name(restaurant_name, known_inspection, harvest=True)
+
+    def harvest_zipcode(self, zipcode):
+        """Phase 1 for a ZIP code: queue every listed establishment's inspection page"""
+        self.search_by_zipcode(zipcode, harvest=True)
+
+    def scrape_target(self, target):
+        """Phase 2: open a harvested inspection page directly and record the latest inspection"""
+        with self.session_tracker.span('restaurant', target.get('restaurant_name') or target['name']):
+            name, address, zipcode = target['name'], target['address'], target['zipcode']
+            restaurant_name = target.get('restaurant_name')
+            print(f"    🔗 {restaurant_name or name}")
+            if not self.waiter.for_goto(self.page, 'inspection_page', target['url']):
+                raise self.waiter.timeout_error('inspection_page')
+
+            if not restaurant_name:
+                # ZIP sweep listing
+                on_parsed = partial(self.record_listing, name, address, zipcode)
+                inspection_data = self.get_latest_inspection(name, on_parsed=on_parsed, return_to_results=False)
+                if inspection_data != PARSE_QUEUED:
+                    self.record_listing(name, address, zipcode, inspection_data)
+                return
+
+            known_inspection = target.get('known_inspection')
+            on_parsed = None
+            if self.parse_pipeline:
+                page_zipcode = None if zipcode else self.find_page_zipcode()
+                on_parsed = lambda data: self.record_inspection(
+                    restaurant_name, name, address, zipcode or (data or {}).get('zipcode') or page_zipcode, data
+                )
+            inspection_data = self.get_latest_inspection(name, known_inspection, on_parsed, return_to_results=False)
+            if inspection_data == INSPECTION_UNCHANGED:
+                self.record_unchanged(restaurant_name, known_inspection)
+                return
+            if inspection_data == PARSE_QUEUED:
+                return
+            if not zipcode and inspection_data:
+                zipcode = inspection_data.get('zipcode')
+            if not zipcode:
+                zipcode = self.find_page_zipcode()
+            self.record_inspection(restaurant_name, name, address, zipcode, inspection_data)
+
+    def run_two_phase(self, restaurants=None, zip_codes=None):
+        """
+        Two-phase crawl. Phase 1 runs the searches and collects each establishment's
+        inspection page URL from the result tables; phase 2 opens those pages
+        directly, spread over the workers, with no back-navigation between them.
+        Results whose links are postbacks (no URL) are clicked into during phase 1.
+        """
+        items, harvest = (restaurants, 'harvest_restaurant') if restaurants else (zip_codes, 'harvest_zipcode')
+        print(f"🔎 Phase 1: collecting inspection links from {len(items)} searches...\n")
+        self.run_tasks(items, harvest)
+        targets = list(self.crawl_targets)
+        self.crawl_targets.clear()
+        print(f"\n⚡ Phase 2: fetching {len(targets)} inspection pages directly...\n")
+        self.run_tasks(targets, 'scrape_target')
+
+    def run_tasks(self, items, task):
+        """Run a scraper method over items, on the worker pool when there is one"""
+        if not items:
+            return
+        if self.workers > 1:
+            self.run_worker_pool(items, task)
+        else:
+            for item in items:
+                self.run_task(task, item)
+
+    def run_task(self, task, item):
+        """Run one task on this scraper's page; an error on a restaurant is recorded as its failure"""
+        try:
+            getattr(self, task)(item)
+        except Exception as e:
+            print(f"  ❌ {self.label} error on {item}: {e}")
+            restaurant_name = item.get('restaurant_name') if isinstance(item, dict) else item
+            if (task in ('scrape_restaurant', 'harvest_restaurant', 'scrape_target', 'retry_restaurant')
+                    and restaurant_name):
+                self._record_failure(restaurant_name, str(e), classify_failure(e))
+
+    def get_latest_inspection(self, establishment=None, known_inspection=None, on_parsed=None,
+                              return_to_results=True):
+        """
+        Download and parse the most recent inspection.
+        With known_inspection (freshness mode), returns INSPECTION_UNCHANGED
+        without downloading when the listed date is not newer.
+        With on_parsed and a parse pipeline, the PDF is queued for parsing and
+        PARSE_QUEUED is returned; on_parsed receives the inspection data later.
+        Navigates back to the results page afterwards unless return_to_results
+        is False (two-phase crawl, where the page was opened directly).
+        """
+        try:
+            # The establishment page has loaded; no date links there means no inspections
+            found = self.waiter.for_selector(self.page, 'inspection_dates', 'table tr a')
+            date_links = self.page.query_selector_all('table tr a') if found else []
+            if not date_links:
+                print("        ⚠️ No inspection dates found")
+                return None
+
+            inspection_date = date_links[0].inner_text().strip()
+            if self.inspection_history:
+                self.record_older_inspections(establishment, date_links[1:])
+            if known_inspection and not is_newer_inspection(inspection_date, known_inspection):
+                if return_to_results:
+                    self.waiter.go_back(self.page)
+                return INSPECTION_UNCHANGED
+
+            # Unchanged inspection: reuse the cached PDF text instead of downloading
+            cached_text = self.pdf_cache.get_text(establishment, inspection_date)
+            if cached_text:
+                print(f"        ♻️  Using cached inspection PDF ({inspection_date})")
+                with self.session_tracker.span('parse_violations'):
+                    inspection_data = self.extract_from_text(cached_text)
+                if return_to_results:
+                    self.waiter.go_back(self.page)
+                return inspection_data
+
+            pdf_bytes = self.fetch_pdf(date_links[0]) if self.direct_pdf else None
+            download = None if pdf_bytes else self.waiter.for_download(self.page, date_links[0].click)
+            if self.parse_pipeline and on_parsed:
+                self.queue_parse(pdf_bytes or download, establishment, inspection_date, on_parsed)
+                if return_to_results:
+                    self.waiter.go_back(self.page)
+                return PARSE_QUEUED
+
+            try:
+                inspection_data = self.process_downloaded_pdf(pdf_bytes or download.path(), establishment,
+                                                              inspection_date)
+            except Exception as e:
+                print(f"        ⚠️ PDF error: {e}")
+                inspection_data = self.extract_inspection_data()
+            if return_to_results:
+                self.waiter.go_back(self.page)
+            return inspection_data
+        except PlaywrightTimeoutError:
+            raise  # The caller records a 'timeout' failure (retried) rather than missing data
+        except Exception as e:
+            print(f"        ⚠️ Error: {e}")
+            return None
+
+    def record_older_inspections(self, establishment, date_links):
+        """History mode: store listed inspections (other than the latest) not seen before"""
+        # Compare parsed dates: the latest inspection is stored under its report's date, which may be
+        # formatted differently from the link text (1/5/2024 vs 01/05/2024)
+        seen = {parse_inspection_date(d) or d for d in self.inspection_history.dates(establishment)}
+        for link in date_links:
+            inspection_date = link.inner_text().strip()
+            if not inspection_date or (parse_inspection_date(inspection_date) or inspection_date) in seen:
+                continue
+            cached_text = self.pdf_cache.get_text(establishment, inspection_date)
+            if cached_text:
+                inspection_data = self.extract_from_text(cached_text)
+            else:
+                try:
+                    pdf = self.fetch_pdf(link) if self.direct_pdf else None
+                    download = None if pdf else self.waiter.for_download(self.page, link.click)
+                    if self.parse_pipeline:
+                        self.queue_parse(pdf or download, establishment, inspection_date,
+                                         partial(self.record_history, establishment, inspection_date))
+                        continue
+                    inspection_data = self.process_downloaded_pdf(pdf or download.path(), establishment,
+                                                                  inspection_date)
+                except Exception as e:
+                    print(f"        ⚠️ Could not fetch {inspection_date} inspection: {e}")
+                    continue
+            self.record_history(establishment, inspection_date, inspection_data)
+
+    def record_history(self, establishment, inspection_date, inspection_data):
+        """History mode: store an older inspection (None if its PDF could not be parsed)"""
+        if not inspection_data:
+            return
+        print(f"        🗂️  History: {inspection_date} ({inspection_data['star_rating']} stars)")
+        self.inspection_history.add(establishment, inspection_date, inspection_data)
+
+    def queue_parse(self, pdf, establishment, inspection_date, on_parsed):
+        """Hand fetched PDF bytes or a browser Download to the parse pipeline"""
+        if not isinstance(pdf, bytes):
+            # Keep our own copy: Playwright deletes downloads with their context
+            path = str(self.download_dir / f"{uuid.uuid4().hex}.pdf")
+            pdf.save_as(path)
+            pdf.delete()
+            pdf = path
+        self.parse_pipeline.submit(pdf, establishment, inspection_date, on_parsed)
+
+    def fetch_pdf(self, link):
+        """
+        Direct PDF mode: GET the PDF behind a date link with the browser context's
+        HTTP client (the session's cookies, pooled connections) instead of clicking
+        it and waiting for a browser download. Returns the PDF bytes, or None when
+        the link is a postback or the response isn't a PDF; callers then download.
+        """
+        url = self.direct_url(link)
+        if not url:
+            return None
+        try:
+            pdf_bytes = self.waiter.for_request(self.page, url)
+        except Exception as e:
+            print(f"        ⚠️ Direct PDF fetch failed, downloading instead: {e}")
+            return None
+        if not pdf_bytes or not pdf_bytes.startswith(b'%PDF'):
+            return None
+        return pdf_bytes
+
+    def process_downloaded_pdf(self, pdf, establishment=None, inspection_date=None):
+        """Extract an inspection PDF (download path or fetched bytes), cache it, and delete the download"""
+        metrics.PDF_BYTES.observe(len(pdf) if isinstance(pdf, bytes) else os.path.getsize(pdf))
+        with self.session_tracker.span('pdf_text'):
+            text = self.read_pdf_text(pdf)
+        self.pdf_cache.put(establishment, inspection_date, pdf, text)
+        if isinstance(pdf, str):
+            os.remove(pdf)  # Clean up
+        with self.session_tracker.span('parse_violations'):
+            return self.extract_from_text(text)
+
+    def extract_inspection_data(self):
+        data = {
+            'star_rating': None,
+            'last_inspection': None,
+            'violations': [],
+            'zipcode': None
+        }
+        try:
+            page_text = self.page.inner_text('body')
+            date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', page_text)
+            if date_match:
+                data['last_inspection'] = date_match.group(1)
+
+            # Extract ZIP code
+            zipcode_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', page_text)
+            if zipcode_match:
+                data['zipcode'] = zipcode_match.group(1)
+
+            data['violations'] = self.parse_violations(page_text)
+
+            # Calculate star rating based on violation severity
+            data['star_rating'] = self.calculate_star_rating(data['violations'])
+        except Exception as e:
+            print(f"        ⚠️ Error: {e}")
+        return data
+
+    def save_to_json(self):
+        """Merge this session's restaurants into output_file (upsert, atomic write)"""
+        if self.inspection_history:
+            self.inspection_history.save()
+
+        if not self.restaurants:
+            print("\n⚠️ No restaurants found!")
+            return
+
+        # Session restaurants were upserted into the store as they were scraped
+        store = self.restaurant_store
+        store.save()
+        print(f"\n✅ Saved {len(self.restaurants)} restaurants to {self.output_file} "
+              f"({len(store.restaurants)} total)")
+
+        total_violations = sum(len(r.get('violations', [])) for r in self.restaurants)
+        print(f"📊 Total violations found: {total_violations}")
+
+    def get_scraping_mode(self):
+        """Prompt user to select scraping mode"""
+        print("\n" + "="*50)
+        print("Baltimore Restaurant Scraper")
+        print("="*50)
+        print("\nSelect scraping mode:")
+        print("  1. Run full scraper (all restaurants)")
+        print("  2. Re-scrape only 'not_found' restaurants")
+        print("  3. Exit")
+
+        while True:
+            choice = input("\nEnter your choice (1-3): ").strip()
+            if choice in ['1', '2', '3']:
+                return choice
+            print("Invalid choice. Please enter 1, 2, or 3.")
+
+    def get_not_found_restaurants(self):
+        """
+        Returns list of restaurant names with 'not_found' status from analytics.
+        """
+        not_found_restaurants = []
+
+        # Read analytics data
+        analytics_data = self.analytics_tracker.analytics.get('restaurant_searches', {})
+
+        # Filter restaurants with 'not_found' status
+        for restaurant_name, data in analytics_data.items():
+            if data.get('status') == 'not_found':
+                # Verify restaurant still exists in RESTAURANT_NAME_MAP
+                if restaurant_name in RESTAURANT_NAME_MAP:
+                    not_found_restaurants.append(restaurant_name)
+
+        return sorted(not_found_restaurants)  # Sort for consistent display
+
+    def run(self, restaurants=None, zip_codes=None, mode='1'):
+        """
+        Run scraper by restaurant names OR zip codes.
+        Priority: restaurants > zip_codes
+        mode: '1' for full scraper, '2' for selective re-scraping
+        """
+        restaurants, zip_codes = self.begin_session(restaurants, zip_codes, mode)
+        self.retry_scheduler.open(restaurants)
+
+        self.start()
+        try:
+            if self.two_phase and (restaurants or zip_codes):
+                self.run_two_phase(restaurants, zip_codes)
+            elif restaurants and self.workers > 1:
+                print(f"📋 Searching {len(restaurants)} restaurants by name with {self.workers} workers...\n")
+                self.run_worker_pool(restaurants)
+            elif restaurants:
+                print(f"📋 Searching {len(restaurants)} restaurants by name...\n")
+                for restaurant_name in restaurants:
+                    self.scrape_restaurant(restaurant_name)
+            elif zip_codes and self.workers > 1:
+                print(f"📍 Sweeping {len(zip_codes)} ZIP codes with {self.workers} workers...\n")
+                self.run_worker_pool(zip_codes, task='search_by_zipcode')
+            elif zip_codes:
+                print(f"📍 Sweeping {len(zip_codes)} ZIP codes...\n")
+                for zipcode in zip_codes:
+                    self.search_by_zipcode(zipcode)
+
+            self.run_retries()
+            self.save_results()
+
+        except KeyboardInterrupt:
+            print("\n⏸️ Interrupted")
+            self.finish_parsing()
+            self.save_to_json()
+            # Still save session and analytics on interrupt
+            self.session_tracker.save_session_report()
+            self.analytics_tracker.save_analytics()
+        except Exception as e:
             print(f"\n❌ Fatal error: {e}")
+            self.finish_parsing()
             # Save session and analytics even on error
             self.session_tracker.save_session_report()
             self.analytics_tracker.save_analytics()
         finally:
             self.close()
 
+        self.finish_session()
+
+    def run_retries(self):
+        """Re-run the restaurants the retry scheduler queued, as they come due, until none are left"""
+        while True:
+            restaurant_names = self.retry_scheduler.next_round()
+            if not restaurant_names:
+                break
+            print(f"\n🔁 Retrying {len(restaurant_names)} restaurants after transient failures...\n")
+            self.run_tasks(restaurant_names, 'retry_restaurant')
+        # Failures queued while the last round finished (e.g. from the parse pool) are final
+        for restaurant_name, failure_class, reason in self.retry_scheduler.close():
+            self._record_failure(restaurant_name, reason, failure_class)
+
+    def begin_session(self, restaurants=None, zip_codes=None, mode='1'):
+        """Prepare analytics for a new run and return the restaurants and ZIP codes left to scrape"""
+        if restaurants is None and zip_codes is None:
+            restaurants = list(RESTAURANT_NAME_MAP.keys())[:5]  # Default to first 5 restaurants
+
+        # Store mode and original restaurant list for summary
+        self.scraping_mode = mode
+        self.target_restaurants = restaurants.copy() if restaurants else []
+        self.journal.append("session", restaurants=restaurants, zip_codes=zip_codes, mode=mode)
+
+        # Skip restaurants a resumed session already finished
+        if restaurants and self.completed_restaurants:
+            restaurants = [r for r in restaurants if r not in self.completed_restaurants]
+        if zip_codes and self.completed_zipcodes:
+            zip_codes = [z for z in zip_codes if z not in self.completed_zipcodes]
+
+        print("="*60)
+        print("🦀 Baltimore Restaurant Health Scraper")
+        print("="*60)
+
+        # Sync analytics with current restaurant map (removes old restaurants from analytics)
+        self.analytics_tracker.sync_with_restaurant_map(RESTAURANT_NAME_MAP)
+
+        # Increment session count
+        self.analytics_tracker.increment_session_count()
+
+        return restaurants, zip_codes
+
+    def finish_parsing(self):
+        """Wait until PDFs queued in the parse pipeline are parsed and recorded (once)"""
+        if self.parse_pipeline and not self.parse_pipeline.closed:
+            print("\n⏳ Waiting for queued PDFs to finish parsing...")
+            self.parse_pipeline.shutdown()
+
+    def save_results(self):
+        """Save scraped data, the session report and analytics"""
+        self.finish_parsing()
+
+        # Save scraped data
+        self.save_to_json()
+
+        # Save session report
+        session_file = self.session_tracker.save_session_report()
+        if session_file:
+            print(f"\n📄 Session report saved: {session_file}")
+
+        # Save analytics
+        self.analytics_tracker.save_analytics()
+        print(f"📊 Analytics updated: {ANALYTICS_FILE}")
+
+    def finish_session(self):
+        """Print the end-of-run summaries"""
         print("\n" + "="*60)
         print(f"✅ DONE! {len(self.restaurants)} restaurants")
         print("="*60)
@@ -1247,6 +3383,85 @@ class BaltimoreZipScraper:
         if hasattr(self, 'scraping_mode') and self.scraping_mode == '2':
             self.print_selective_rescrape_summary()
 
+    def scrape_restaurant(self, restaurant_name):
+        """
+        Scrape a single restaurant by name, skipping ones already in the database
+        (in freshness mode, re-checking them for a newer inspection instead)
+        """
+        stored = self.get_restaurant_from_db(restaurant_name)
+        if stored and not self.refresh:
+            print(f"🍽️  Restaurant: {restaurant_name}")
+            print("  ⏭️  Already in database, skipping...\n")
+            self.session_tracker.add_result(restaurant_name, "already_exists", {"reason": "Already in database with data"})
+            # Still record the search attempt
+            self.analytics_tracker.record_search(restaurant_name)
+        else:
+            # Proceed with scraping
+            known_inspection = stored.get('last_inspection') if stored else None
+            with self.session_tracker.span('restaurant', restaurant_name):
+                self.search_by_restaurant_name(restaurant_name, known_inspection)
+
+    def retry_restaurant(self, restaurant_name):
+        """Retry-scheduler task: search a restaurant again without counting another search"""
+        stored = self.get_restaurant_from_db(restaurant_name)
+        if stored and not self.refresh:
+            return  # Another result row got it after all
+        known_inspection = stored.get('last_inspection') if stored else None
+        with self.session_tracker.span('restaurant', restaurant_name):
+            self.search_by_restaurant_name(restaurant_name, known_inspection, count_search=False)
+
+    def run_worker_pool(self, items, task='scrape_restaurant'):
+        """
+        Scrape restaurant names (or ZIP codes / crawl targets, with another task
+        method such as 'search_by_zipcode') with a pool of workers pulling items
+        off a shared queue. Each worker owns a browser
+        context/page attached to this scraper's Chromium instance; results merge into
+        the shared restaurant list and trackers.
+        """
+        work_queue = queue.Queue()
+        for item in items:
+            work_queue.put(item)
+
+        worker_count = min(self.workers, len(items))
+        threads = [
+            threading.Thread(target=self._worker_loop, args=(work_queue, worker_id, task), daemon=True)
+            for worker_id in range(1, worker_count + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Items left when no worker could attach run on this scraper's own page
+        leftovers = []
+        while not work_queue.empty():
+            leftovers.append(work_queue.get_nowait())
+        if leftovers:
+            print(f"  ⚠️ {len(leftovers)} items left by workers that never attached; running them here")
+            for item in leftovers:
+                self.run_task(task, item)
+
+    def _worker_loop(self, work_queue, worker_id, task='scrape_restaurant'):
+        """Drain the shared queue with a dedicated browser page"""
+        worker = ScraperWorker(self, worker_id)
+        try:
+            worker.start()
+        except Exception as e:
+            print(f"  ❌ Worker {worker_id} could not attach to browser: {e}")
+            self.session_tracker.record_worker_failure(worker_id, e)
+            worker.close()
+            return
+
+        try:
+            while True:
+                try:
+                    item = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                worker.run_task(task, item)
+        finally:
+            worker.close()
+
     def print_selective_rescrape_summary(self):
         """Print summary specific to selective re-scraping (mode 2)"""
         if not hasattr(self, 'target_restaurants') or not self.target_restaurants:
@@ -1281,10 +3496,203 @@ class BaltimoreZipScraper:
 
         print("\n" + "="*60)
 
-def quick_test():
+class ScraperWorker(BaltimoreZipScraper):
+    """
+    One page of a worker pool. Shares the parent scraper's results and trackers,
+    but drives its own browser context in the parent's Chromium instance.
+    """
+
+    # Browser handles each worker opens for itself; every other attribute is the parent's
+    OWN_ATTRIBUTES = ('playwright', 'browser', 'context', 'page')
+
+    def __init__(self, parent, worker_id):
+        self.__dict__.update({name: value for name, value in vars(parent).items()
+                              if name not in self.OWN_ATTRIBUTES})
+        self.worker_id = worker_id
+        self.label = f"Worker {worker_id}"
+        for name in self.OWN_ATTRIBUTES:
+            setattr(self, name, None)
+
+    def start(self):
+        # Playwright's sync API is bound to the thread that started it, so each
+        # worker runs its own driver and attaches to the shared browser over CDP
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{self.cdp_port}")
+        targets = self.browser.new_browser_cdp_session().send("Target.getTargets")["targetInfos"]
+        if not any(target["targetId"] == self.cdp_target_id for target in targets):
+            raise RuntimeError(f"port {self.cdp_port} is not the scraper's browser")
+        self.context = self.browser.new_context(accept_downloads=True)
+        self.page = self.context.new_page()
+        self.page.set_default_timeout(30000)
+        print(f"✓ Worker {self.worker_id} ready")
+
+    def close(self):
+        # Only tear down this worker's context; the browser belongs to the parent
+        if self.context:
+            self.context.close()
+        if self.playwright:
+            self.playwright.stop()
+
+
+def free_local_port():
+    """A TCP port on localhost that nothing is listening on right now"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def get_cli_option(flag, default=None):
+    """Return the value following a command-line flag (e.g. --workers 4)"""
+    if flag in sys.argv:
+        index = sys.argv.index(flag)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+
+def reparse_archive(archive_dir=PDF_CACHE_DIR, output_file=OUTPUT_FILE_JSON, workers=None,
+                    pdf_backend=DEFAULT_PDF_BACKEND, store='json'):
+    """
+    Re-rate restaurants from archived inspection reports without a browser.
+
+    Walks archive_dir for .pdf / .txt files (the PDF cache layout, or any folder
+    of reports), re-runs extraction, parse_violations and calculate_star_rating
+    in a process pool, and writes the new violations and ratings back into
+    output_file. When both a PDF and its extracted .txt exist, the text is used.
+
+    Each report is matched to a stored restaurant through the PDF cache index
+    (establishment + inspection date) when available, otherwise by a line of
+    the report text that is exactly one stored restaurant's name; reports
+    matching no restaurant or several are skipped. Only reports for a
+    restaurant's stored last_inspection (or newer) are applied.
+    """
+    print("="*60)
+    print("🔁 Offline re-parse of archived inspection reports")
+    print("="*60)
+
+    # Collect report files, preferring extracted text over the PDF
+    reports = {}
+    for root, _, files in os.walk(archive_dir):
+        for filename in files:
+            stem, extension = os.path.splitext(filename)
+            if extension not in ('.pdf', '.txt'):
+                continue
+            key = os.path.join(root, stem)
+            if extension == '.txt' or key not in reports:
+                reports[key] = os.path.join(root, filename)
+
+    if not reports:
+        print(f"⚠️ No inspection reports found in {archive_dir}")
+        return
+
+    # Establishment + date from the cache index, keyed by blob hash
+    index_metadata = {}
+    index_file = os.path.join(archive_dir, "index.json")
+    if os.path.exists(index_file):
+        with open(index_file, 'r') as f:
+            for entry in json.load(f).values():
+                index_metadata[entry["sha256"]] = entry
+
+    store = SqliteRestaurantStore(output_file) if store == 'sqlite' else RestaurantStore(output_file)
+    # Reports outside the cache index are matched on their establishment line
+    restaurants_by_name = {}
+    for r in store.restaurants:
+        if r.get('name'):
+            restaurants_by_name.setdefault(normalize_name(r['name']), []).append(r)
+
+    print(f"📄 Re-parsing {len(reports)} reports...\n")
+    latest = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, text, inspection_data in executor.map(partial(reparse_inspection_file, pdf_backend=pdf_backend),
+                                                            reports.values(), chunksize=8):
+            if not text or not inspection_data['last_inspection']:
+                print(f"  ⚠️ No dated inspection text in {path}")
+                continue
+
+            metadata = index_metadata.get(os.path.splitext(os.path.basename(path))[0])
+            if metadata:
+                restaurant = store.get(metadata["establishment"])
+            else:
+                names = {normalize_name(line) for line in text.splitlines()} & restaurants_by_name.keys()
+                candidates = [r for name in names for r in restaurants_by_name[name]]
+                if len(candidates) > 1:
+                    print(f"  ⚠️ {len(candidates)} stored restaurants match {path}, skipping")
+                    continue
+                restaurant = candidates[0] if candidates else None
+            if restaurant is None:
+                print(f"  ⚠️ No stored restaurant matches {path}")
+                continue
+
+            # Ignore reports older than what is stored (or already picked)
+            current = latest.get(restaurant['id'])
+            baseline = current['last_inspection'] if current else restaurant.get('last_inspection')
+            if baseline and inspection_data['last_inspection'] != baseline and \
+                    not is_newer_inspection(inspection_data['last_inspection'], baseline):
+                continue
+            latest[restaurant['id']] = inspection_data
+
+    changed = 0
+    for restaurant in store.restaurants:
+        inspection_data = latest.get(restaurant['id'])
+        if not inspection_data:
+            continue
+        zipcode = inspection_data.pop('zipcode', None)
+        if restaurant.get('zipcode') in (None, 'Unknown') and zipcode:
+            inspection_data['zipcode'] = zipcode
+        if (restaurant.get('violations') != inspection_data['violations']
+                or restaurant.get('star_rating') != inspection_data['star_rating']):
+            changed += 1
+            print(f"  ✓ {restaurant['name']}: {restaurant.get('star_rating')} → {inspection_data['star_rating']} stars")
+        store.upsert({**restaurant, **inspection_data})
+
+    store.save()
+    print(f"\n✅ Re-parsed {len(latest)} restaurants ({changed} changed) → {output_file}")
+
+
+def prompt_restaurants(scraper):
+    """Interactive mode selection and confirmation; returns (restaurants, mode) or exits"""
+    mode = scraper.get_scraping_mode()
+
+    if mode == '3':
+        print("Exiting scraper.")
+        exit(0)
+
+    # Get restaurant list based on mode
+    if mode == '2':
+        restaurants_to_scrape = scraper.get_not_found_restaurants()
+        if not restaurants_to_scrape:
+            print("\n" + "="*50)
+            print("✅ No 'not_found' restaurants to re-scrape!")
+            print("="*50)
+            print("All restaurants have been successfully scraped or are still being attempted.")
+            exit(0)
+        print(f"\n📋 {len(restaurants_to_scrape)} 'not_found' restaurants will be re-scraped:")
+        for name in restaurants_to_scrape:
+            print(f"  - {name}")
+    else:
+        restaurants_to_scrape = list(RESTAURANT_NAME_MAP.keys())
+        print(f"\n📋 Scraping all {len(restaurants_to_scrape)} restaurants...")
+
+    # Confirm before proceeding
+    print()
+    confirm = input("Proceed? (y/n): ").strip().lower()
+    if confirm != 'y':
+        print("\n❌ Scraping cancelled.")
+        exit(0)
+    return restaurants_to_scrape, mode
+
+
+def quick_test(workers=DEFAULT_WORKERS, refresh=False, parse_workers=DEFAULT_PARSE_WORKERS,
+               pdf_backend=DEFAULT_PDF_BACKEND, analytics_storage='json', store='json', history=False,
+               two_phase=False, direct_pdf=False, retry_budget=DEFAULT_RETRY_BUDGET,
+               portal_rate=None):
     print("🧪 Quick test with a few restaurants...\n")
     # Use separate test output file
-    scraper = BaltimoreZipScraper(output_file="../data/test_baltimore_restaurants.json")
+    scraper = BaltimoreZipScraper(output_file="../data/test_baltimore_restaurants.json",
+                                  workers=workers, refresh=refresh, parse_workers=parse_workers,
+                                  pdf_backend=pdf_backend, analytics_storage=analytics_storage, store=store,
+                                  history=history, two_phase=two_phase, direct_pdf=direct_pdf,
+                                  retry_budget=retry_budget, portal_rate=portal_rate)
     test_restaurants = ["Faidley's Seafood", "The Food Market", "Ekiben",
     "Golden West Cafe",
     "The Corner Pantry"]
@@ -1301,43 +3709,76 @@ def quick_test():
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) > 1 and sys.argv[1] == '--test':
-        quick_test()
+    if '--help' in sys.argv or '-h' in sys.argv:
+        print(__doc__)
+        exit(0)
+    workers = int(get_cli_option('--workers', DEFAULT_WORKERS))
+    resume_session_id = get_cli_option('--resume')
+    refresh = '--refresh' in sys.argv
+    parse_workers = int(get_cli_option('--parse-workers', DEFAULT_PARSE_WORKERS))
+    pdf_backend = get_cli_option('--pdf-backend', DEFAULT_PDF_BACKEND)
+    store = 'sqlite' if '--sqlite' in sys.argv else 'json'
+    history = '--history' in sys.argv
+    two_phase = '--two-phase' in sys.argv
+    direct_pdf = '--direct-pdf' in sys.argv
+    retry_budget = int(get_cli_option('--retry-budget', DEFAULT_RETRY_BUDGET))
+    portal_rate = float(get_cli_option('--rate')) if get_cli_option('--rate') else None
+    if get_cli_option('--metrics-port'):
+        metrics.serve_metrics(int(get_cli_option('--metrics-port')),
+                              host=get_cli_option('--metrics-host', metrics.DEFAULT_HOST))
+    if get_cli_option('--metrics-file'):
+        metrics.start_textfile_writer(get_cli_option('--metrics-file'))
+    analytics_storage = 'events' if '--analytics-events' in sys.argv else 'json'
+    if store == 'sqlite':
+        analytics_storage = 'sqlite'
+    if resume_session_id and ('--zip-sweep' in sys.argv or '--test' in sys.argv):
+        # The checkpoint already records what the session scrapes (restaurants or ZIP codes)
+        print("❌ --resume continues a session with its own restaurants or ZIP codes; "
+              "drop --zip-sweep / --test")
+        exit(1)
+    if '--export-json' in sys.argv:
+        SqliteRestaurantStore().save()
+        AnalyticsTracker(storage='sqlite').compact()
+        print(f"✅ Exported {DATABASE_FILE} → {OUTPUT_FILE_JSON}, {ANALYTICS_FILE}")
+    elif '--compact-analytics' in sys.argv:
+        AnalyticsTracker(storage='events').compact()
+        print(f"📊 Analytics compacted: {ANALYTICS_FILE}")
+    elif '--reparse' in sys.argv:
+        archive_dir = get_cli_option('--reparse')
+        if not archive_dir or archive_dir.startswith('--'):
+            archive_dir = PDF_CACHE_DIR
+        reparse_archive(archive_dir, workers=parse_workers or None, pdf_backend=pdf_backend, store=store)
+    elif '--zip-sweep' in sys.argv:
+        zip_codes = get_cli_option('--zip-sweep')
+        zip_codes = zip_codes.split(',') if zip_codes and not zip_codes.startswith('--') else BALTIMORE_ZIP_CODES
+        scraper = BaltimoreZipScraper(workers=workers, refresh=refresh, parse_workers=parse_workers,
+                                      pdf_backend=pdf_backend, analytics_storage=analytics_storage, store=store,
+                                      history=history, two_phase=two_phase, direct_pdf=direct_pdf,
+                                      retry_budget=retry_budget, portal_rate=portal_rate)
+        scraper.run(zip_codes=zip_codes)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--test':
+        quick_test(workers=workers, refresh=refresh, parse_workers=parse_workers, pdf_backend=pdf_backend,
+                   analytics_storage=analytics_storage, store=store, history=history, two_phase=two_phase,
+                   direct_pdf=direct_pdf, retry_budget=retry_budget, portal_rate=portal_rate)
+    elif resume_session_id:
+        scraper = BaltimoreZipScraper(workers=workers, session_id=resume_session_id, refresh=refresh,
+                                      parse_workers=parse_workers, pdf_backend=pdf_backend,
+                                      analytics_storage=analytics_storage, store=store, history=history,
+                                      two_phase=two_phase, direct_pdf=direct_pdf, retry_budget=retry_budget,
+                                      portal_rate=portal_rate)
+        session = scraper.resume()
+        if not session:
+            print(f"❌ No checkpoint found for session {resume_session_id}")
+            exit(1)
+        scraper.run(restaurants=session["restaurants"], zip_codes=session["zip_codes"], mode=session["mode"])
     else:
-        scraper = BaltimoreZipScraper()
+        scraper = BaltimoreZipScraper(workers=workers, refresh=refresh, parse_workers=parse_workers,
+                                      pdf_backend=pdf_backend, analytics_storage=analytics_storage, store=store,
+                                      history=history, two_phase=two_phase, direct_pdf=direct_pdf,
+                                      retry_budget=retry_budget, portal_rate=portal_rate)
 
-        # Interactive mode selection
-        mode = scraper.get_scraping_mode()
-
-        if mode == '3':
-            print("Exiting scraper.")
-            exit(0)
-
-        # Get restaurant list based on mode
-        if mode == '2':
-            restaurants_to_scrape = scraper.get_not_found_restaurants()
-            if not restaurants_to_scrape:
-                print("\n" + "="*50)
-                print("✅ No 'not_found' restaurants to re-scrape!")
-                print("="*50)
-                print("All restaurants have been successfully scraped or are still being attempted.")
-                exit(0)
-            print(f"\n📋 {len(restaurants_to_scrape)} 'not_found' restaurants will be re-scraped:")
-            for name in restaurants_to_scrape:
-                print(f"  - {name}")
-        else:
-            restaurants_to_scrape = list(RESTAURANT_NAME_MAP.keys())
-            print(f"\n📋 Scraping all {len(restaurants_to_scrape)} restaurants...")
-
-        # Confirm before proceeding
-        print()
-        confirm = input("Proceed? (y/n): ").strip().lower()
-        if confirm != 'y':
-            print("\n❌ Scraping cancelled.")
-            exit(0)
+        # Interactive mode selection and confirmation
+        restaurants_to_scrape, mode = prompt_restaurants(scraper)
 
         # Run scraper with selected restaurants and mode
         scraper.run(restaurants=restaurants_to_scrape, mode=mode)
-
-        # To use ZIP codes instead, uncomment this:
-        # scraper.run(zip_codes=BALTIMORE_ZIP_CODES)
@@ -0,0 +1,78 @@
+"""
+Violation parser tests and benchmarks (run: python3 -m pytest backend)
+
+parse_violations must return exactly what the original parser returned. Its
+output is pinned in test_data/parse_violations_legacy.json: report texts
+rebuilt from the bundled restaurant data plus a few layouts the stored
+restaurants don't cover, each with the original parser's violations.
+
+The benchmarks (pytest-benchmark) time parse_violations on the same corpus
+bench_parser.py uses, so parser throughput can be tracked:
+
+python3 -m pytest test_bench_parser.py --benchmark-only
+python3 -m pytest test_bench_parser.py --benchmark-autosave --benchmark-compare
+"""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+# scraper.py needs the browser and PDF libraries at import time
+pytest.importorskip("playwright")
+pytest.importorskip("PyPDF2")
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+LEGACY_CASES_FILE = os.path.join(BACKEND_DIR, "test_data", "parse_violations_legacy.json")
+
+needs_benchmark = pytest.mark.skipif(importlib.util.find_spec("pytest_benchmark") is None,
+                                     reason="pytest-benchmark is not installed")
+
+
+@pytest.fixture(scope="module")
+def legacy_cases():
+    with open(LEGACY_CASES_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    # The corpus paths are relative to the backend directory, as when the scripts run
+    cwd = os.getcwd()
+    os.chdir(BACKEND_DIR)
+    try:
+        from bench_parser import load_corpus
+        from scraper import PDF_CACHE_DIR
+        return load_corpus(PDF_CACHE_DIR)
+    finally:
+        os.chdir(cwd)
+
+
+def test_parse_violations_matches_legacy_parser(legacy_cases):
+    from scraper import InspectionParser
+
+    parser = InspectionParser()
+    mismatches = [case["text"] for case in legacy_cases if parser.parse_violations(case["text"]) != case["violations"]]
+    assert not mismatches, f"{len(mismatches)}/{len(legacy_cases)} texts parse differently, first:\n{mismatches[0]}"
+
+
+@needs_benchmark
+def test_bench_parse_stored_restaurants(benchmark, corpus):
+    from scraper import InspectionParser
+
+    if not corpus:
+        pytest.skip("no stored restaurants or cached report texts")
+    parser = InspectionParser()
+    results = benchmark(lambda: [parser.parse_violations(text) for text in corpus])
+    assert len(results) == len(corpus)
+
+
+@needs_benchmark
+def test_bench_parse_legacy_cases(benchmark, legacy_cases):
+    from scraper import InspectionParser
+
+    parser = InspectionParser()
+    texts = [case["text"] for case in legacy_cases]
+    results = benchmark(lambda: [parser.parse_violations(text) for text in texts])
+    assert results == [case["violations"] for case in legacy_cases]